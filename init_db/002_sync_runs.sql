@@ -0,0 +1,54 @@
+-- ============================================================================
+-- Historique des runs de sync Pennylane par table et par phase
+-- Executee automatiquement au demarrage de incremental_sync.py
+-- ============================================================================
+
+CREATE SCHEMA IF NOT EXISTS pennylane;
+
+CREATE TABLE IF NOT EXISTS pennylane.sync_runs (
+    id BIGSERIAL PRIMARY KEY,
+    run_id VARCHAR(32) NOT NULL,
+    run_mode VARCHAR(20) NOT NULL,
+    table_name VARCHAR(100) NOT NULL,
+    sync_type VARCHAR(20),
+    started_at TIMESTAMP NOT NULL,
+    duration_seconds DOUBLE PRECISION NOT NULL,
+    fetch_seconds DOUBLE PRECISION DEFAULT 0,
+    rate_limit_sleep_seconds DOUBLE PRECISION DEFAULT 0,
+    flatten_seconds DOUBLE PRECISION DEFAULT 0,
+    serialize_seconds DOUBLE PRECISION DEFAULT 0,
+    load_seconds DOUBLE PRECISION DEFAULT 0,
+    api_calls INTEGER DEFAULT 0,
+    rows_synced INTEGER DEFAULT 0,
+    rows_unchanged INTEGER DEFAULT 0,
+    peak_rss_mb DOUBLE PRECISION,
+    rss_growth_mb DOUBLE PRECISION,
+    success BOOLEAN NOT NULL,
+    error TEXT
+);
+
+-- Historique cree avant le suivi des lignes inchangees
+ALTER TABLE pennylane.sync_runs
+    ADD COLUMN IF NOT EXISTS rows_unchanged INTEGER DEFAULT 0;
+
+-- Historique cree avant la mesure du RSS par table
+ALTER TABLE pennylane.sync_runs
+    ADD COLUMN IF NOT EXISTS rss_growth_mb DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS sync_runs_table_started_idx
+    ON pennylane.sync_runs (table_name, started_at DESC);
+
+COMMENT ON TABLE pennylane.sync_runs IS 'Historique des syncs par table et par run (durees par phase)';
+COMMENT ON COLUMN pennylane.sync_runs.run_id IS 'Identifiant du run (commun a toutes les tables du run)';
+COMMENT ON COLUMN pennylane.sync_runs.run_mode IS 'Mode du run: full ou incremental';
+COMMENT ON COLUMN pennylane.sync_runs.sync_type IS 'Type de sync effectue pour la table: full, incremental ou export';
+COMMENT ON COLUMN pennylane.sync_runs.duration_seconds IS 'Duree murale de la table (extraction, polling, chargement)';
+COMMENT ON COLUMN pennylane.sync_runs.fetch_seconds IS 'Temps des appels API (attente rate limit comprise)';
+COMMENT ON COLUMN pennylane.sync_runs.rate_limit_sleep_seconds IS 'Attente rate limit client, cumulee sur les threads';
+COMMENT ON COLUMN pennylane.sync_runs.flatten_seconds IS 'Temps passe dans flatten_dataframe';
+COMMENT ON COLUMN pennylane.sync_runs.serialize_seconds IS 'Conversions JSON / Arrow / pandas vers lignes SQL';
+COMMENT ON COLUMN pennylane.sync_runs.load_seconds IS 'Ecritures PostgreSQL (staging, insert, upsert, delete)';
+COMMENT ON COLUMN pennylane.sync_runs.api_calls IS 'Requetes HTTP envoyees (retries compris)';
+COMMENT ON COLUMN pennylane.sync_runs.rows_unchanged IS 'Lignes recues du changelog identiques a la version stockee (non reecrites)';
+COMMENT ON COLUMN pennylane.sync_runs.peak_rss_mb IS 'Pic de memoire residente du process pendant la table (Mo)';
+COMMENT ON COLUMN pennylane.sync_runs.rss_growth_mb IS 'Hausse de la memoire residente entre le debut de la table et son pic (Mo)';
@@ -0,0 +1,304 @@
+"""
+Decodage des pages API directement en RecordBatches Arrow
+
+Le corps JSON de chaque page est lu par pyarrow.json (ArrowPageDecoder) :
+les enregistrements de `items` vont directement dans des colonnes Arrow, sans
+dicts Python intermediaires. Les chaines restent des chaines (pyarrow
+infererait des timestamps pour les dates ISO) et le schema d'une page sert
+d'indication pour la suivante. Une page que pyarrow.json ne sait pas lire
+fidelement (types melanges dans une colonne, entier hors int64) repasse par json_loads
+puis page_to_record_batch. Le resultat final est une table Arrow colonnaire,
+convertible en DataFrame pandas sans passer par une grande liste de dicts.
+
+Usage:
+    pages = client.fetch_arrow('/ledger_entry_lines',
+                               extra_headers={'X-Use-2026-API-Changes': 'true'})
+    table = pages.to_arrow()
+    df = pages.to_pandas()
+"""
+
+import io
+import json
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+
+# promote_options remplace promote=True a partir de pyarrow 14
+_PYARROW_MAJOR = int(pa.__version__.split(".")[0])
+
+
+def _to_json_text(value):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def page_to_record_batch(records: List[Dict]) -> pa.RecordBatch:
+    """
+    Convertit une page d'enregistrements en RecordBatch.
+
+    Chemin rapide : inference Arrow sur toute la page. Si une colonne a des
+    types incompatibles (ex: nombre puis texte) ou un entier hors int64,
+    seule cette colonne est stockee en texte (JSON pour les objets). Les
+    cles absentes du premier enregistrement sont conservees.
+    """
+    try:
+        batch = pa.RecordBatch.from_pylist(records)
+        # from_pylist ne garde que les cles du premier enregistrement
+        if batch.num_columns == len(set().union(*records)):
+            return batch
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+
+    names = list(dict.fromkeys(key for record in records for key in record))
+    arrays = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            arrays.append(pa.array([_to_json_text(v) for v in values], pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+# pyarrow.json lit en double un entier JSON hors int64 (precision perdue)
+_INT64_LIMIT = 2.0**63
+
+
+def _has_int64_overflow(array: pa.Array) -> bool:
+    """True si une colonne double contient une valeur hors de la plage int64"""
+    if pa.types.is_floating(array.type):
+        largest = pc.max(pc.abs(array)).as_py()
+        return largest is not None and largest >= _INT64_LIMIT
+    if pa.types.is_struct(array.type):
+        return any(
+            _has_int64_overflow(array.field(i)) for i in range(array.type.num_fields)
+        )
+    if pa.types.is_list(array.type):
+        return _has_int64_overflow(array.flatten())
+    return False
+
+
+def _strings_for_timestamps(arrow_type: pa.DataType) -> pa.DataType:
+    """Type ou les timestamps inferes par pyarrow.json redeviennent du texte"""
+    if pa.types.is_timestamp(arrow_type):
+        return pa.string()
+    if pa.types.is_struct(arrow_type):
+        return pa.struct(
+            [f.with_type(_strings_for_timestamps(f.type)) for f in arrow_type]
+        )
+    if pa.types.is_list(arrow_type):
+        return pa.list_(_strings_for_timestamps(arrow_type.value_type))
+    return arrow_type
+
+
+def _schema_hint(arrow_type: pa.DataType) -> Optional[pa.DataType]:
+    """Type connu d'une page, reutilisable pour la suivante (colonnes nulles
+    ou objets vides retires : leur type reste a inferer)"""
+    if pa.types.is_null(arrow_type):
+        return None
+    if pa.types.is_struct(arrow_type):
+        fields = []
+        for field in arrow_type:
+            hint = _schema_hint(field.type)
+            if hint is not None:
+                fields.append(field.with_type(hint))
+        return pa.struct(fields) if fields else None
+    if pa.types.is_list(arrow_type):
+        hint = _schema_hint(arrow_type.value_type)
+        return pa.list_(hint) if hint is not None else None
+    return arrow_type
+
+
+class ArrowPageDecoder:
+    """
+    Decode les corps JSON des pages d'un endpoint en RecordBatches.
+
+    Une instance par parcours d'endpoint : le type des enregistrements d'une
+    page est passe a pyarrow.json pour la suivante (une seule lecture par page
+    au lieu d'une inference puis d'une relecture sans timestamps).
+
+    decode() renvoie la reponse comme json_loads, `items` etant un
+    RecordBatch : {"items": RecordBatch, "has_more": ..., "next_cursor": ...}
+    """
+
+    def __init__(self, loads: Callable = json.loads):
+        self.loads = loads
+        self.items_hint: Optional[pa.DataType] = None
+        self.fallbacks = 0
+
+    def _read(self, raw: bytes, schema: Optional[pa.Schema]) -> pa.Table:
+        parse_options = pa_json.ParseOptions(
+            explicit_schema=schema,
+            unexpected_field_behavior="infer",
+            newlines_in_values=True,
+        )
+        read_options = pa_json.ReadOptions(use_threads=False, block_size=len(raw) + 1)
+        return pa_json.read_json(io.BytesIO(raw), read_options, parse_options)
+
+    def _read_body(self, raw: bytes) -> Optional[pa.Table]:
+        """Table d'une ligne (items, has_more, next_cursor), None si illisible"""
+        hints = [None]
+        if self.items_hint is not None:
+            hints.insert(0, pa.schema([("items", self.items_hint)]))
+        for hint in hints:
+            try:
+                table = self._read(raw, hint)
+                schema = pa.schema(
+                    [f.with_type(_strings_for_timestamps(f.type)) for f in table.schema]
+                )
+                if schema != table.schema:
+                    table = self._read(raw, schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                continue
+            if "items" not in table.column_names or table.num_rows != 1:
+                return None
+            if _has_int64_overflow(table.column("items").combine_chunks()):
+                return None
+            return table
+        return None
+
+    def decode(self, raw: bytes):
+        table = self._read_body(raw)
+        if table is None:
+            self.fallbacks += 1
+            body = self.loads(raw)
+            if isinstance(body, list):
+                return {"items": page_to_record_batch(body), "has_more": False}
+            if isinstance(body, dict) and isinstance(body.get("items"), list):
+                return {**body, "items": page_to_record_batch(body["items"])}
+            return body
+
+        items = table.column("items").combine_chunks()
+        response = {
+            name: table.column(name)[0].as_py()
+            for name in table.column_names
+            if name != "items"
+        }
+        if not pa.types.is_list(items.type) or not pa.types.is_struct(
+            items.type.value_type
+        ):
+            # Page vide (list<null>) ou items qui ne sont pas des objets
+            response["items"] = page_to_record_batch(items.to_pylist()[0] or [])
+            return response
+
+        self.items_hint = _schema_hint(items.type) or self.items_hint
+        response["items"] = pa.RecordBatch.from_struct_array(items.flatten())
+        return response
+
+
+def _concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """Concatene des tables aux schemas proches (colonnes ajoutees, nulls...)"""
+    if _PYARROW_MAJOR >= 14:
+        return pa.concat_tables(tables, promote_options="permissive")
+    return pa.concat_tables(tables, promote=True)
+
+
+def _unify_conflicting_columns(tables: List[pa.Table]) -> List[pa.Table]:
+    """Passe en texte les colonnes dont les types d'une page a l'autre ne
+    peuvent pas etre promus vers un type commun"""
+    types = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                types.setdefault(field.name, set()).add(field.type)
+
+    conflicting = set()
+    for name, found in types.items():
+        if len(found) < 2:
+            continue
+        try:
+            _concat_tables(
+                [
+                    pa.table({name: table.column(name)})
+                    for table in tables
+                    if name in table.column_names
+                ]
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            conflicting.add(name)
+
+    unified = []
+    for table in tables:
+        for name in conflicting & set(table.column_names):
+            index = table.column_names.index(name)
+            column = table.column(name)
+            text = pa.array([_to_json_text(v) for v in column.to_pylist()], pa.string())
+            table = table.set_column(index, name, text)
+        unified.append(table)
+    return unified
+
+
+def batch_to_ipc(batch: pa.RecordBatch) -> bytes:
+    """RecordBatch serialise au format Arrow IPC (stream)"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def batches_from_ipc(data: bytes) -> List[pa.RecordBatch]:
+    """RecordBatches d'un flux Arrow IPC ecrit par batch_to_ipc"""
+    return list(pa.ipc.open_stream(pa.py_buffer(data)))
+
+
+class ArrowPages:
+    """Pages d'un endpoint accumulees en RecordBatches Arrow"""
+
+    def __init__(self):
+        self.batches: List[pa.RecordBatch] = []
+        self.num_rows = 0
+
+    def append(self, batch: pa.RecordBatch):
+        self.batches.append(batch)
+        self.num_rows += batch.num_rows
+
+    def __len__(self):
+        return self.num_rows
+
+    def to_arrow(self) -> pa.Table:
+        """Table Arrow unique (schemas des pages unifies)"""
+        if not self.batches:
+            return pa.table({})
+
+        tables = [pa.Table.from_batches([batch]) for batch in self.batches]
+        try:
+            return _concat_tables(tables)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return _concat_tables(_unify_conflicting_columns(tables))
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        DataFrame pandas proche de pd.DataFrame(records).
+
+        Les structs deviennent des dicts et les listes des listes Python
+        (entiers restes entiers, None pour les nulls), pour rester compatible
+        avec flatten_dataframe et la serialisation JSON.
+
+        Difference avec le chemin dicts : le schema d'un struct est l'union
+        des cles vues dans la colonne, une cle absente d'un objet revient
+        donc avec la valeur None (`{}` -> `{"x": None}`).
+        """
+        table = self.to_arrow()
+        if table.num_columns == 0:
+            return pd.DataFrame()
+
+        # to_pandas passerait en float les entiers d'un struct contenant des nulls
+        object_columns = [
+            field.name
+            for field in table.schema
+            if pa.types.is_list(field.type)
+            or pa.types.is_large_list(field.type)
+            or pa.types.is_struct(field.type)
+        ]
+        df = table.select(
+            [name for name in table.column_names if name not in object_columns]
+        ).to_pandas()
+        for name in object_columns:
+            df[name] = pd.Series(table.column(name).to_pylist(), dtype=object)
+        return df[table.column_names]
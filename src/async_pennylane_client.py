@@ -0,0 +1,474 @@
+"""
+Client API REST Pennylane v2 - version asyncio
+
+Facade asyncio au-dessus du client bloquant PennylaneClient, pas de l'I/O
+asynchrone native : chaque appel HTTP est execute par la session keep-alive
+du client synchrone dans un pool de threads dedie. Plusieurs requetes restent
+en vol en parallele, au plus `max_concurrency` (taille du pool de threads),
+tout en respectant PENNYLANE_RATE_LIMIT. La boucle asyncio n'est pas bloquee,
+mais chaque requete en vol occupe un thread.
+
+Usage dans notebook:
+    from src.async_pennylane_client import AsyncPennylaneClient
+
+    async with AsyncPennylaneClient() as client:
+        df_customers, df_suppliers = await asyncio.gather(
+            client.get_customers(), client.get_suppliers()
+        )
+
+Usage pour sync incrementale:
+    async with AsyncPennylaneClient(env_path='.env', max_concurrency=4) as client:
+        changes = await client.get_changelog('customer_invoices', '2026-02-01T00:00:00Z')
+        records = await client.get_by_ids('/customer_invoices', [1, 2, 3])
+"""
+
+import os
+import time
+import asyncio
+import functools
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List
+from datetime import datetime
+
+from src.export_manager import PollBackoff, export_state
+from src.pennylane_api_client import (
+    PennylaneClient,
+    build_id_filter_params,
+    order_by_ids,
+)
+from src.rate_limiter import TokenBucketRateLimiter
+
+
+class AsyncPennylaneClient:
+    """Client API REST Pennylane v2 asynchrone (concurrence bornee)"""
+
+    def __init__(
+        self,
+        env_path: str = None,
+        max_concurrency: Optional[int] = None,
+        client: Optional[PennylaneClient] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ):
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("PENNYLANE_MAX_CONCURRENCY", "4")
+        )
+        # Le pool HTTP doit pouvoir garder une connexion par requete en vol
+        self._client = client or PennylaneClient(
+            env_path=env_path,
+            pool_size=max(self.max_concurrency, 10),
+            rate_limiter=rate_limiter,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="pennylane"
+        )
+        self._semaphore = None
+        self.last_missing_ids = []
+
+        print(f"  Concurrence max: {self.max_concurrency} requetes en vol")
+
+    # ========================================================================
+    # CYCLE DE VIE
+    # ========================================================================
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Ferme le pool de threads et la session HTTP"""
+        # Attend les requetes en vol sans bloquer la boucle d'evenements
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
+        self._client.close()
+
+    def get_connection_stats(self) -> Dict:
+        """Connexions ouvertes vs reutilisees depuis la creation du client"""
+        return self._client.get_connection_stats()
+
+    # ========================================================================
+    # METHODES HTTP DE BASE
+    # ========================================================================
+
+    async def _run(self, func, *args, **kwargs):
+        """Execute un appel bloquant du client synchrone sous le plafond"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> Dict:
+        """Requete GET avec rate limiting et retry 429"""
+        # Copie des params : le thread ne doit pas voir les mutations du cursor
+        return await self._run(
+            self._client._make_request, endpoint, dict(params or {}), extra_headers
+        )
+
+    async def _make_post_request(
+        self,
+        endpoint: str,
+        json_body: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> Dict:
+        """Requete POST avec rate limiting et retry 429"""
+        return await self._run(
+            self._client._make_post_request, endpoint, json_body, extra_headers
+        )
+
+    async def _fetch_all_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """Recupere toutes les pages d'un endpoint (pagination cursor-based API v2)
+
+        La pagination par cursor est sequentielle pour un endpoint donne ; le
+        parallelisme vient des endpoints et des batchs traites simultanement.
+        Les pages viennent de l'iterateur du client synchrone
+        (iter_cursor_pages : memes parametres et metriques), chaque page etant
+        recuperee dans le pool de threads.
+        """
+        pages = self._client.iter_cursor_pages(endpoint, params, extra_headers)
+        all_data = []
+        while True:
+            page = await self._run(next, pages, None)
+            if page is None:
+                break
+            all_data.extend(page[0])
+        return all_data
+
+    # ========================================================================
+    # CHANGELOG & BATCH FETCH (sync incrementale)
+    # ========================================================================
+
+    async def get_changelog(self, resource: str, start_date: str) -> List[Dict]:
+        """
+        Recupere le changelog d'une ressource depuis une date donnee.
+
+        Args:
+            resource: Nom de la ressource (customer_invoices, suppliers, etc.)
+            start_date: Date ISO 8601 (ex: '2026-02-01T00:00:00Z')
+
+        Returns:
+            Liste des changements [{id, operation, timestamp}, ...]
+        """
+        print(f"[CHANGELOG] Lecture changelog {resource} depuis {start_date}...")
+        all_changes = await self._fetch_all_pages(
+            f"/changelogs/{resource}", {"start_date": start_date, "per_page": 100}
+        )
+        print(f"[CHANGELOG] {len(all_changes)} changements trouves pour {resource}")
+        return all_changes
+
+    async def get_by_ids(
+        self,
+        endpoint: str,
+        ids: List[int],
+        batch_size: int = 100,
+        extra_headers: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """
+        Recupere des enregistrements par batch via filtre ID, batchs en parallele.
+
+        Args:
+            endpoint: Endpoint API (ex: '/customers')
+            ids: Liste d'IDs a recuperer
+            batch_size: Taille des batchs (max 100)
+            extra_headers: Headers supplementaires
+
+        Returns:
+            Liste des enregistrements complets, dans l'ordre des IDs demandes
+            (IDs absents de la reponse dans `self.last_missing_ids`)
+        """
+        self.last_missing_ids = []
+        if not ids:
+            return []
+
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        print(
+            f"[BATCH] Recuperation {len(ids)} enregistrements en {len(batches)} batch(s)..."
+        )
+
+        async def fetch_batch(batch_ids):
+            params = build_id_filter_params(batch_ids, batch_size)
+            return await self._fetch_all_pages(endpoint, params, extra_headers)
+
+        results = await asyncio.gather(*(fetch_batch(b) for b in batches))
+        all_records, missing = order_by_ids(
+            [record for records in results for record in records], ids
+        )
+        self.last_missing_ids = missing
+
+        print(f"[BATCH] Total: {len(all_records)} enregistrements recuperes")
+        if missing:
+            print(f"[WARNING] {len(missing)} ID(s) demandes mais non retournes")
+        return all_records
+
+    # ========================================================================
+    # ENDPOINTS (API REST)
+    # ========================================================================
+
+    async def _get_dataframe(
+        self,
+        endpoint: str,
+        empty_message: str,
+        updated_since: Optional[datetime] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> pd.DataFrame:
+        """Recupere un endpoint complet et le convertit en DataFrame"""
+        memo = self._client.memo_cache
+        if updated_since is None and memo and memo.ttl_for(endpoint):
+            # Memoisation et single-flight partages avec le client synchrone
+            return await self._run(
+                self._client._get_dataframe,
+                endpoint,
+                empty_message,
+                None,
+                extra_headers,
+            )
+
+        params = {}
+        if updated_since:
+            params["filter[updated_at]"] = (
+                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
+            )
+
+        data = await self._fetch_all_pages(endpoint, params, extra_headers)
+
+        if not data:
+            print(f"[INFO] {empty_message}")
+            return pd.DataFrame()
+
+        df = pd.DataFrame(data)
+        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
+        return df
+
+    async def get_customers(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des clients"""
+        return await self._get_dataframe(
+            "/customers", "Aucun client trouve", updated_since
+        )
+
+    async def get_customer_invoices(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des factures clients"""
+        return await self._get_dataframe(
+            "/customer_invoices", "Aucune facture client trouvee", updated_since
+        )
+
+    async def get_suppliers(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des fournisseurs"""
+        return await self._get_dataframe(
+            "/suppliers", "Aucun fournisseur trouve", updated_since
+        )
+
+    async def get_supplier_invoices(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des factures fournisseurs"""
+        return await self._get_dataframe(
+            "/supplier_invoices", "Aucune facture fournisseur trouvee", updated_since
+        )
+
+    async def get_transactions(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des transactions bancaires"""
+        return await self._get_dataframe(
+            "/transactions", "Aucune transaction trouvee", updated_since
+        )
+
+    async def get_products(
+        self, updated_since: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Recupere la liste des produits/services"""
+        return await self._get_dataframe(
+            "/products", "Aucun produit trouve", updated_since
+        )
+
+    async def get_ledger_entries(self) -> pd.DataFrame:
+        """Recupere les ecritures comptables (grand livre general) via API v2"""
+        return await self._get_dataframe(
+            "/ledger_entries",
+            "Aucune ecriture comptable trouvee",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
+        )
+
+    async def get_ledger_accounts(self) -> pd.DataFrame:
+        """Recupere le plan comptable via API v2"""
+        return await self._get_dataframe(
+            "/ledger_accounts",
+            "Aucun compte comptable trouve",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
+        )
+
+    async def get_bank_accounts(self) -> pd.DataFrame:
+        """Recupere les comptes bancaires via API v2"""
+        return await self._get_dataframe(
+            "/bank_accounts", "Aucun compte bancaire trouve"
+        )
+
+    async def get_fiscal_years(self) -> pd.DataFrame:
+        """Recupere les exercices fiscaux via API v2"""
+        return await self._get_dataframe(
+            "/fiscal_years",
+            "Aucun exercice fiscal trouve",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
+        )
+
+    # ========================================================================
+    # EXPORTS (FEC, Grand Livre Analytique)
+    # ========================================================================
+
+    async def start_export_fec(self, fiscal_year_id: Optional[int] = None) -> Dict:
+        """Lance un export FEC (POST seul, sans attendre)"""
+        return await self._run(self._client.start_export_fec, fiscal_year_id)
+
+    async def start_export_analytical_ledger(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Dict:
+        """Lance un export Grand Livre Analytique (POST seul, sans attendre)"""
+        return await self._run(
+            self._client.start_export_analytical_ledger, start_date, end_date
+        )
+
+    async def export_fec(self, fiscal_year_id: Optional[int] = None) -> Dict:
+        """
+        Lance un export FEC. Retourne l'URL de telechargement.
+
+        Workflow : POST pour lancer → polling statut → URL de telechargement
+        """
+        return await self._poll_export(await self.start_export_fec(fiscal_year_id))
+
+    async def export_analytical_ledger(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Dict:
+        """
+        Lance un export Grand Livre Analytique. Retourne l'URL de telechargement.
+
+        Workflow : POST pour lancer → polling statut → URL de telechargement
+        """
+        return await self._poll_export(
+            await self.start_export_analytical_ledger(start_date, end_date)
+        )
+
+    async def _poll_export(self, initial_response: Dict, max_wait: int = 300) -> Dict:
+        """
+        Polling sur un export asynchrone jusqu'a completion (sans bloquer la boucle).
+
+        Intervalle croissant entre deux controles (PollBackoff) : plusieurs
+        exports attendus via asyncio.gather se terminent au rythme du plus lent.
+
+        Args:
+            initial_response: Reponse du POST initial (contient id/status/url)
+            max_wait: Temps max d'attente en secondes
+
+        Returns:
+            Reponse finale avec URL de telechargement
+        """
+        export_id = initial_response.get("id")
+        state, _ = export_state(initial_response)
+
+        if state == "ready":
+            print("[EXPORT] Export pret immediatement")
+            return initial_response
+
+        if not export_id:
+            print("[EXPORT] Reponse directe (pas de polling)")
+            return initial_response
+
+        print(f"[EXPORT] Export {export_id} en cours, polling...")
+        start = time.time()
+        backoff = PollBackoff()
+
+        while time.time() - start < max_wait:
+            await asyncio.sleep(
+                min(backoff.next_delay(), max(max_wait - (time.time() - start), 0))
+            )
+            try:
+                response = await self._make_request(f"/exports/{export_id}")
+            except Exception as e:
+                print(f"  Polling erreur (retry): {e}")
+                continue
+
+            state, _ = export_state(response)
+            if state == "ready":
+                print(
+                    f"[EXPORT] Export {export_id} termine en {time.time() - start:.1f}s"
+                )
+                return response
+            if state == "failed":
+                raise Exception(f"Export {export_id} echoue: {response}")
+            print(f"  Status: {response.get('status', '')}...")
+
+        raise Exception(f"Export {export_id} timeout apres {max_wait}s")
+
+    async def download_export(self, url: str) -> pd.DataFrame:
+        """Telecharge un fichier d'export et le charge en DataFrame"""
+        return await self._run(self._client.download_export, url)
+
+    # ========================================================================
+    # UTILITAIRES
+    # ========================================================================
+
+    async def test_connection(self) -> bool:
+        """Teste la connexion API et affiche les informations utilisateur"""
+        return await self._run(self._client.test_connection)
+
+    async def fetch_all_raw(
+        self, endpoint: str, extra_headers: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Acces direct a _fetch_all_pages pour usage dans incremental_sync"""
+        return await self._fetch_all_pages(endpoint, extra_headers=extra_headers)
+
+    async def fetch_many(
+        self,
+        endpoints: Dict[str, Optional[Dict]],
+        as_dataframe: bool = False,
+        return_exceptions: bool = False,
+    ) -> Dict:
+        """
+        Recupere plusieurs endpoints en parallele sous le meme rate limit.
+
+        Args:
+            endpoints: {endpoint: extra_headers ou None}
+            as_dataframe: Retourne des DataFrames plutot que des listes de dicts
+            return_exceptions: Place l'exception dans le resultat au lieu de
+                la lever (les autres endpoints sont conserves)
+
+        Returns:
+            {endpoint: liste d'enregistrements ou DataFrame}
+        """
+        results = await asyncio.gather(
+            *(
+                self._fetch_all_pages(endpoint, extra_headers=extra_headers)
+                for endpoint, extra_headers in endpoints.items()
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+        output = {}
+        for endpoint, data in zip(endpoints, results):
+            if as_dataframe and not isinstance(data, Exception):
+                data = pd.DataFrame(data)
+            output[endpoint] = data
+        return output
@@ -0,0 +1,169 @@
+"""
+Benchmark de bout en bout de la sync contre le serveur mock
+
+Demarre src.mock_pennylane_server en local, puis enchaine une sync complete
+et une sync incrementale (apres mutation d'une partie des donnees) vers le
+PostgreSQL configure dans .env. Affiche pour chaque run : duree, appels API,
+429, lignes chargees et lignes/s. Aucun appel a la vraie API Pennylane.
+
+ATTENTION : les tables du schema pennylane de la base cible sont remplacees.
+Utiliser une base dediee (--pg-db).
+
+Usage:
+    python src/benchmark_sync.py
+    python src/benchmark_sync.py --scale 5 --latency-ms 50 --error-rate 0.02
+    python src/benchmark_sync.py --pg-db pennylane_bench --client-rate 10 --quota 0
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ajouter le repertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.mock_pennylane_server import FaultInjector, MockDataset, MockPennylaneServer
+
+
+def _db_now(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT NOW()")
+        return cur.fetchone()[0]
+
+
+def _rows_synced_since(conn, since) -> int:
+    """Lignes chargees (sync_state) par les tables mises a jour depuis `since`"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT COALESCE(SUM(records_synced), 0) FROM pennylane.sync_state
+            WHERE updated_at >= %s AND sync_type <> 'partial'
+            """,
+            (since,),
+        )
+        return int(cur.fetchone()[0])
+
+
+def run_benchmark_step(label: str, server: MockPennylaneServer, force_full: bool):
+    """Execute run_sync et mesure duree, appels API et lignes chargees"""
+    from src.incremental_sync import get_pg_connection, run_sync
+
+    conn = get_pg_connection()
+    since = _db_now(conn)
+    before = server.get_stats()
+
+    start = time.time()
+    success = run_sync(force_full=force_full)
+    duration = time.time() - start
+
+    after = server.get_stats()
+    rows = _rows_synced_since(conn, since)
+    conn.close()
+
+    def delta(key):
+        return after.get(key, 0) - before.get(key, 0)
+
+    return {
+        "run": label,
+        "success": success,
+        "duration": duration,
+        "api_calls": delta("requests"),
+        "throttled": delta("throttled"),
+        "errors": delta("errors"),
+        "rows": rows,
+        "rows_per_sec": rows / duration if duration else 0.0,
+    }
+
+
+def print_report(results):
+    print()
+    print("=" * 78)
+    print(
+        f"{'Run':<14}{'Duree (s)':>10}{'Appels API':>12}{'429':>6}{'5xx':>6}"
+        f"{'Lignes':>10}{'Lignes/s':>11}{'OK':>6}"
+    )
+    print("-" * 78)
+    for r in results:
+        print(
+            f"{r['run']:<14}{r['duration']:>10.1f}{r['api_calls']:>12}"
+            f"{r['throttled']:>6}{r['errors']:>6}{r['rows']:>10}"
+            f"{r['rows_per_sec']:>11.0f}{'oui' if r['success'] else 'non':>6}"
+        )
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sync full + incrementale contre l'API mock"
+    )
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--quota",
+        type=int,
+        default=25,
+        help="Quota serveur par fenetre de 5s (0 = illimite)",
+    )
+    parser.add_argument(
+        "--mutate",
+        type=float,
+        default=0.05,
+        help="Part des enregistrements modifies avant la sync incrementale",
+    )
+    parser.add_argument(
+        "--client-rate", type=float, help="PENNYLANE_RATE_LIMIT du client (req/s)"
+    )
+    parser.add_argument("--pg-db", help="Base PostgreSQL cible (POSTGRES_DB)")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    server = MockPennylaneServer(
+        port=args.port,
+        dataset=MockDataset(args.scale, args.seed),
+        faults=FaultInjector(
+            args.latency_ms,
+            args.jitter_ms,
+            args.error_rate,
+            args.throttle_rate,
+            args.quota,
+        ),
+        export_delay=1.0,
+    ).start()
+
+    # Le client et la sync lisent leur configuration dans l'environnement ;
+    # les valeurs deja definies ne sont pas ecrasees par load_dotenv
+    os.environ["PENNYLANE_API_BASE_URL"] = server.base_url
+    os.environ["PENNYLANE_API_TOKEN"] = "mock-token"
+    os.environ.pop("PENNYLANE_HTTP_CACHE_DIR", None)
+    if args.client_rate:
+        os.environ["PENNYLANE_RATE_LIMIT"] = str(args.client_rate)
+    if args.pg_db:
+        os.environ["POSTGRES_DB"] = args.pg_db
+
+    print(f"[BENCH] API mock sur {server.base_url} (scale {args.scale})")
+    results = []
+    try:
+        results.append(run_benchmark_step("full", server, force_full=True))
+
+        changed = server.dataset.mutate(args.mutate)
+        print(f"[BENCH] {sum(changed.values())} changements generes")
+
+        results.append(run_benchmark_step("incrementale", server, force_full=False))
+    finally:
+        server.stop()
+
+    print_report(results)
+    sys.exit(0 if all(r["success"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
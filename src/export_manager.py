@@ -0,0 +1,253 @@
+"""
+Orchestration concurrente des exports Pennylane
+
+Plusieurs exports (un FEC par exercice, Grand Livre Analytique par periode...)
+sont lances d'un coup puis surveilles par une seule boucle de polling. Chaque
+export a son propre backoff : premier controle apres ~1s, puis intervalle
+croissant jusqu'a un plafond. Des qu'un export est pret, il part au
+telechargement (pool de threads) pendant que les autres continuent d'etre
+surveilles : la duree totale est celle de l'export le plus lent, pas la somme.
+
+Usage:
+    from src.export_manager import ExportManager
+
+    manager = ExportManager(client)
+    manager.start_fec_exports([2024, 2025])
+    manager.start("gl_2025", client.start_export_analytical_ledger,
+                  start_date="2025-01-01", end_date="2025-12-31")
+    results = manager.run()   # {nom: DataFrame ou Exception}
+"""
+
+import os
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+def export_state(response: Dict) -> Tuple[str, Optional[str]]:
+    """
+    Etat d'un export a partir d'une reponse API.
+
+    Returns:
+        ("ready" | "failed" | "pending", URL de telechargement ou None)
+    """
+    status = response.get("status", "")
+    download_url = response.get("download_url") or response.get("url")
+    if status in ("failed", "error"):
+        return "failed", None
+    if status in ("completed", "done") or download_url:
+        return "ready", download_url
+    return "pending", None
+
+
+class PollBackoff:
+    """Intervalle de polling croissant (x factor) et plafonne, avec jitter"""
+
+    def __init__(
+        self,
+        initial: Optional[float] = None,
+        factor: float = 1.6,
+        max_delay: Optional[float] = None,
+    ):
+        self.initial = (
+            initial
+            if initial is not None
+            else float(os.getenv("PENNYLANE_EXPORT_POLL_INITIAL", "1"))
+        )
+        self.max_delay = (
+            max_delay
+            if max_delay is not None
+            else float(os.getenv("PENNYLANE_EXPORT_POLL_MAX", "15"))
+        )
+        self.factor = factor
+        self._current = self.initial
+
+    def next_delay(self) -> float:
+        """Delai avant le prochain controle, puis augmente l'intervalle"""
+        delay = self._current * random.uniform(0.9, 1.1)
+        self._current = min(self.max_delay, self._current * self.factor)
+        return delay
+
+
+class ExportJob:
+    """Un export lance : identifiant, etat courant et prochain controle"""
+
+    def __init__(self, name: str, response: Dict, backoff: PollBackoff):
+        self.name = name
+        self.export_id = response.get("id")
+        self.response = response
+        self.backoff = backoff
+        self.started_at = time.time()
+        self.next_poll_at = self.started_at + backoff.next_delay()
+        self.polls = 0
+        self.state, self.download_url = export_state(response)
+        if self.state == "pending" and not self.export_id:
+            # Reponse directe sans id : rien a surveiller
+            self.state = "ready"
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+
+class ExportManager:
+    """Lance plusieurs exports et les telecharge des qu'ils sont prets"""
+
+    def __init__(
+        self,
+        client,
+        max_wait: int = 300,
+        max_downloads: Optional[int] = None,
+        backoff_factory: Callable[[], PollBackoff] = PollBackoff,
+    ):
+        """
+        Args:
+            client: PennylaneClient
+            max_wait: Temps max d'attente par export en secondes
+            max_downloads: Telechargements simultanes (defaut: max_concurrency)
+            backoff_factory: Cree le backoff de polling de chaque export
+        """
+        self.client = client
+        self.max_wait = max_wait
+        self.max_downloads = max_downloads or client.max_concurrency
+        self.backoff_factory = backoff_factory
+        self.jobs: Dict[str, ExportJob] = {}
+
+    # ========================================================================
+    # LANCEMENT
+    # ========================================================================
+
+    def start(
+        self, name: str, start_method: Callable[..., Dict], **params
+    ) -> ExportJob:
+        """Lance un export (POST) via une methode start_export_* du client"""
+        response = start_method(**params)
+        job = ExportJob(name, response, self.backoff_factory())
+        self.jobs[name] = job
+        print(f"[EXPORT] {name}: lance (id={job.export_id}, etat {job.state})")
+        return job
+
+    def start_fec_exports(self, fiscal_year_ids: Iterable[int]) -> Dict[str, ExportJob]:
+        """Un export FEC par exercice fiscal, nommes fec_<id>"""
+        return {
+            f"fec_{fiscal_year_id}": self.start(
+                f"fec_{fiscal_year_id}",
+                self.client.start_export_fec,
+                fiscal_year_id=fiscal_year_id,
+            )
+            for fiscal_year_id in fiscal_year_ids
+        }
+
+    # ========================================================================
+    # POLLING
+    # ========================================================================
+
+    def _poll(self, job: ExportJob):
+        job.polls += 1
+        try:
+            response = self.client._make_request(f"/exports/{job.export_id}")
+        except Exception as e:
+            print(f"  {job.name}: polling erreur (retry): {e}")
+        else:
+            job.response = response
+            job.state, job.download_url = export_state(response)
+            if job.state == "pending":
+                print(f"  {job.name}: status {response.get('status', '')}...")
+        job.next_poll_at = time.time() + job.backoff.next_delay()
+
+    def iter_completed(self) -> Iterator[ExportJob]:
+        """
+        Genere les exports des qu'ils sont termines (ready, failed ou timeout),
+        dans l'ordre de completion.
+        """
+        pending = []
+        for job in self.jobs.values():
+            if job.state == "pending":
+                pending.append(job)
+            else:
+                yield job
+
+        while pending:
+            job = min(pending, key=lambda j: j.next_poll_at)
+            wait = job.next_poll_at - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+            if job.elapsed >= self.max_wait:
+                job.state = "timeout"
+            else:
+                self._poll(job)
+
+            if job.state != "pending":
+                pending.remove(job)
+                print(
+                    f"[EXPORT] {job.name}: {job.state} en {job.elapsed:.1f}s "
+                    f"({job.polls} controles)"
+                )
+                yield job
+
+    # ========================================================================
+    # TELECHARGEMENT
+    # ========================================================================
+
+    def run(
+        self,
+        on_ready: Optional[Callable[[ExportJob], object]] = None,
+        return_exceptions: bool = True,
+    ) -> Dict[str, object]:
+        """
+        Surveille les exports lances et traite chacun des qu'il est pret.
+
+        Args:
+            on_ready: Traitement d'un export pret, execute dans un pool de
+                threads (defaut: client.download_export -> DataFrame)
+            return_exceptions: Place l'erreur (echec, timeout, telechargement)
+                dans le resultat au lieu de la lever
+
+        Returns:
+            {nom: resultat de on_ready ou Exception}
+        """
+        if not self.jobs:
+            return {}
+
+        if on_ready is None:
+
+            def on_ready(job):
+                return self.client.download_export(job.download_url)
+
+        start = time.time()
+        results = {}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_downloads) as executor:
+            for job in self.iter_completed():
+                if job.state == "ready" and job.download_url:
+                    futures[job.name] = executor.submit(on_ready, job)
+                elif job.state == "ready":
+                    results[job.name] = Exception(
+                        f"Export {job.name}: pas d'URL de telechargement "
+                        f"dans la reponse: {job.response}"
+                    )
+                elif job.state == "failed":
+                    results[job.name] = Exception(
+                        f"Export {job.export_id} echoue: {job.response}"
+                    )
+                else:
+                    results[job.name] = Exception(
+                        f"Export {job.export_id} timeout apres {self.max_wait}s"
+                    )
+
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+
+        errors = [name for name, r in results.items() if isinstance(r, Exception)]
+        print(
+            f"[EXPORT] {len(results) - len(errors)}/{len(results)} exports "
+            f"traites en {time.time() - start:.1f}s"
+        )
+        if errors and not return_exceptions:
+            raise results[errors[0]]
+        return {name: results[name] for name in self.jobs if name in results}
@@ -0,0 +1,312 @@
+"""
+Parsing type des exports Pennylane (FEC, Grand Livre Analytique)
+
+Les fichiers telecharges sont lus par le lecteur CSV multithread de pyarrow
+(un thread par coeur) au lieu de pd.read_csv. Pour le FEC, le schema est
+declare : montants en decimal, dates YYYYMMDD en date, libelles repetitifs
+(journaux, comptes) encodes en dictionnaire. Les colonnes non declarees sont
+inferees par pyarrow.
+
+Une valeur non conforme au type declare (ex: montant "1 234,56" avec
+separateur de milliers) ne fait pas echouer l'export : la colonne est relue
+en texte, puis normalisee (espaces retires, formats de date) et retypee si
+possible ; sinon elle reste en texte. Les valeurs en cause sont comptees
+dans un avertissement.
+
+Usage:
+    from src.export_parsing import parse_export_file
+
+    table = parse_export_file("/tmp/fec.txt")
+    df = export_table_to_pandas(table)
+"""
+
+import io
+import os
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+# Colonnes du FEC (article A47 A-1 du LPF), dans l'ordre reglementaire
+FEC_COLUMNS = [
+    "JournalCode",
+    "JournalLib",
+    "EcritureNum",
+    "EcritureDate",
+    "CompteNum",
+    "CompteLib",
+    "CompAuxNum",
+    "CompAuxLib",
+    "PieceRef",
+    "PieceDate",
+    "EcritureLib",
+    "Debit",
+    "Credit",
+    "EcritureLet",
+    "DateLet",
+    "ValidDate",
+    "Montantdevise",
+    "Idevise",
+]
+
+FEC_DATE_COLUMNS = ("EcritureDate", "PieceDate", "DateLet", "ValidDate")
+FEC_AMOUNT_COLUMNS = ("Debit", "Credit", "Montantdevise")
+# Peu de valeurs distinctes : encodage dictionnaire (memoire / Categorical)
+FEC_DICTIONARY_COLUMNS = ("JournalCode", "JournalLib", "CompteNum", "CompteLib")
+
+# Montants au centime, 18 chiffres significatifs
+AMOUNT_TYPE = pa.decimal128(18, 2)
+DATE_FORMATS = ["%Y%m%d", "%Y-%m-%d", "%d/%m/%Y"]
+
+DELIMITERS = ("\t", "|", ";", ",")
+# Espaces de separateur de milliers (espace, insecable, fine insecable)
+THOUSANDS_SEPARATORS = "[ \u00a0\u202f]"
+BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def _build_fec_schema() -> Dict[str, pa.DataType]:
+    types = {}
+    for name in FEC_COLUMNS:
+        if name in FEC_DATE_COLUMNS:
+            # timestamp_parsers ne s'applique qu'aux timestamps : cast en date
+            # apres lecture
+            types[name] = pa.timestamp("s")
+        elif name in FEC_AMOUNT_COLUMNS:
+            types[name] = AMOUNT_TYPE
+        elif name in FEC_DICTIONARY_COLUMNS:
+            types[name] = pa.dictionary(pa.int32(), pa.string())
+        else:
+            types[name] = pa.string()
+    return types
+
+
+FEC_SCHEMA = _build_fec_schema()
+
+
+def read_header(path: str, encoding: str = "utf-8") -> str:
+    """Premiere ligne du fichier (sans BOM)"""
+    with io.open(path, encoding=encoding, errors="replace") as f:
+        return f.readline().lstrip("\ufeff").rstrip("\r\n")
+
+
+def detect_delimiter(header: str) -> str:
+    """Separateur le plus frequent de la ligne d'en-tete"""
+    counts = {sep: header.count(sep) for sep in DELIMITERS}
+    best = max(counts, key=counts.get)
+    return best if counts[best] else ";"
+
+
+def detect_encoding(path: str) -> str:
+    """utf-8 si le debut du fichier se decode, sinon latin-1 (FEC historiques)"""
+    with open(path, "rb") as f:
+        sample = f.read(BLOCK_SIZE)
+    try:
+        sample.decode("utf-8")
+        return "utf8"
+    except UnicodeDecodeError as e:
+        # Caractere multi-octets coupe en fin d'echantillon
+        if e.start >= len(sample) - 3:
+            return "utf8"
+        return "latin1"
+
+
+def detect_decimal_point(path: str, delimiter: str, encoding: str) -> str:
+    """Virgule ou point decimal, d'apres les valeurs numeriques du debut du fichier"""
+    if delimiter == ",":
+        return "."
+    with io.open(path, encoding=encoding, errors="replace") as f:
+        sample = f.read(64 * 1024)
+    fields = re.split(re.escape(delimiter) + "|\n", sample)
+    commas = sum(1 for v in fields if re.fullmatch(r"-?\d+,\d+", v.strip()))
+    points = sum(1 for v in fields if re.fullmatch(r"-?\d+\.\d+", v.strip()))
+    return "," if commas >= points else "."
+
+
+def is_fec_header(columns: List[str]) -> bool:
+    """True si l'en-tete contient les colonnes obligatoires du FEC"""
+    required = {"JournalCode", "EcritureDate", "CompteNum", "Debit", "Credit"}
+    return required.issubset(columns)
+
+
+def parse_export_file(
+    path: str,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+    use_threads: bool = True,
+) -> pa.Table:
+    """
+    Parse un fichier d'export en table Arrow typee.
+
+    Args:
+        path: Fichier CSV/TXT telecharge
+        column_types: Types imposes par colonne. Par defaut, schema FEC si
+            l'en-tete est celui d'un FEC, inference sinon
+        use_threads: Lecture multithread (tous les coeurs)
+
+    Separateur, encodage et separateur decimal (virgule du format francais)
+    sont detectes ; les dates acceptent le format YYYYMMDD du FEC.
+    """
+    encoding = detect_encoding(path)
+    header = read_header(path, "utf-8" if encoding == "utf8" else "latin-1")
+    delimiter = detect_delimiter(header)
+    columns = [name.strip() for name in header.split(delimiter)]
+
+    if column_types is None:
+        column_types = FEC_SCHEMA if is_fec_header(columns) else {}
+    column_types = {
+        name: dtype for name, dtype in column_types.items() if name in columns
+    }
+
+    decimal_point = detect_decimal_point(
+        path, delimiter, "utf-8" if encoding == "utf8" else "latin-1"
+    )
+
+    # Colonnes relues en texte apres une erreur de conversion : {nom: type vise}
+    fallback = {}
+    while True:
+        try:
+            table = pv.read_csv(
+                path,
+                read_options=pv.ReadOptions(
+                    use_threads=use_threads,
+                    block_size=BLOCK_SIZE,
+                    column_names=columns,
+                    skip_rows=1,
+                    encoding=encoding,
+                ),
+                parse_options=pv.ParseOptions(
+                    delimiter=delimiter,
+                    quote_char='"',
+                    newlines_in_values=False,
+                ),
+                convert_options=pv.ConvertOptions(
+                    column_types=column_types,
+                    timestamp_parsers=DATE_FORMATS,
+                    decimal_point=decimal_point,
+                    strings_can_be_null=True,
+                    quoted_strings_can_be_null=False,
+                ),
+            )
+            break
+        except pa.ArrowInvalid as e:
+            name = _failing_column(str(e), columns)
+            if name is None or name in fallback or name not in column_types:
+                raise
+            fallback[name] = column_types[name]
+            column_types = {**column_types, name: pa.string()}
+
+    table = _timestamps_to_dates(table, FEC_DATE_COLUMNS)
+    for name, target in fallback.items():
+        table = _recover_column(table, name, target, decimal_point)
+    return table
+
+
+def _failing_column(message: str, columns: List[str]) -> Optional[str]:
+    """Colonne designee par une erreur de conversion du lecteur CSV"""
+    match = re.search(r"CSV column #(\d+)", message)
+    if match and int(match.group(1)) < len(columns):
+        return columns[int(match.group(1))]
+    return None
+
+
+def _recover_column(
+    table: pa.Table, name: str, target: pa.DataType, decimal_point: str
+) -> pa.Table:
+    """
+    Retype une colonne relue en texte apres une erreur de conversion.
+
+    Montants : separateurs de milliers retires, virgule decimale remplacee.
+    Dates : chaque valeur lue avec le premier format de DATE_FORMATS qui
+    convient. La colonne reste en texte si une valeur ne peut pas etre
+    convertie.
+    """
+    index = table.column_names.index(name)
+    raw = table.column(name)
+    text = pc.utf8_trim_whitespace(raw)
+
+    if pa.types.is_decimal(target):
+        # Valeurs au format attendu (sans separateur de milliers)
+        conform = pc.match_substring_regex(text, r"^-?\d+([.,]\d+)?$")
+        cleaned = pc.replace_substring_regex(text, THOUSANDS_SEPARATORS, "")
+        if decimal_point == ",":
+            cleaned = pc.replace_substring(cleaned, ",", ".")
+        parsed = None
+        if pc.all(pc.match_substring_regex(cleaned, r"^-?\d+(\.\d+)?$")).as_py() in (
+            True,
+            None,
+        ):
+            try:
+                parsed = cleaned.cast(target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+    elif pa.types.is_timestamp(target):
+        parsed = pc.coalesce(
+            *(
+                pc.strptime(text, format=date_format, unit="s", error_is_null=True)
+                for date_format in DATE_FORMATS
+            )
+        )
+        conform = pc.is_valid(parsed)
+        parsed = parsed.cast(pa.date32())
+        if pc.any(pc.and_(pc.is_valid(text), pc.invert(conform))).as_py():
+            parsed = None
+    else:
+        conform = pc.is_null(text)
+        parsed = None
+
+    # Valeurs a normaliser : non conformes, ou conformes une fois les espaces
+    # retires
+    invalid = pc.fill_null(
+        pc.and_(pc.is_valid(raw), pc.or_(pc.invert(conform), pc.not_equal(raw, text))),
+        False,
+    )
+    bad_values = raw.filter(invalid)
+    sample = bad_values[0].as_py() if len(bad_values) else None
+    outcome = "normalisees" if parsed is not None else "colonne conservee en texte"
+    print(
+        f"[WARNING] Export {name}: {len(bad_values)} valeur(s) non conforme(s) "
+        f"au type {target} (ex: {sample!r}), {outcome}"
+    )
+    if parsed is None:
+        return table
+    return table.set_column(index, name, parsed)
+
+
+def _timestamps_to_dates(table: pa.Table, names) -> pa.Table:
+    """Cast en date32 des colonnes de dates lues comme timestamps"""
+    for name in names:
+        if name not in table.column_names:
+            continue
+        index = table.column_names.index(name)
+        if pa.types.is_timestamp(table.schema.field(index).type):
+            table = table.set_column(index, name, table.column(name).cast(pa.date32()))
+    return table
+
+
+def _keep_arrow_type(dtype: pa.DataType):
+    if pa.types.is_decimal(dtype) or pa.types.is_date(dtype):
+        return pd.ArrowDtype(dtype)
+    return None
+
+
+def export_table_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    DataFrame pandas d'une table d'export.
+
+    Montants et dates restent types Arrow (pd.ArrowDtype) : le type est
+    conserve meme pour une colonne entierement vide, et full_replace_table
+    cree des colonnes NUMERIC / DATE au lieu de TEXT.
+    """
+    return table.to_pandas(types_mapper=_keep_arrow_type)
+
+
+def export_file_summary(path: str, table: pa.Table) -> str:
+    """Resume pour les logs : lignes, colonnes, taille disque vs memoire"""
+    disk_mb = os.path.getsize(path) / 1024 / 1024
+    memory_mb = table.nbytes / 1024 / 1024
+    return (
+        f"{table.num_rows} lignes, {table.num_columns} colonnes "
+        f"({disk_mb:.1f} Mo sur disque, {memory_mb:.1f} Mo en memoire)"
+    )
@@ -0,0 +1,250 @@
+"""
+Cache HTTP persistant pour les endpoints de reference Pennylane
+
+Les reponses GET sont stockees sur disque (SQLite) par cle URL + params +
+headers pertinents. Si le serveur fournit des validateurs (ETag /
+Last-Modified), chaque lecture est revalidee par requete conditionnelle
+(If-None-Match / If-Modified-Since, reponse 304 sans corps). Sinon l'entree
+est servie sans appel API tant que le TTL de l'endpoint n'est pas ecoule.
+
+Usage:
+    from src.http_cache import HttpResponseCache
+
+    cache = HttpResponseCache(
+        "data/.http_cache",
+        ttl_by_endpoint={"/ledger_accounts": 3600, "/fiscal_years": 3600},
+    )
+    client = PennylaneClient(http_cache=cache)
+    ...
+    print(cache.get_stats())
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+# Headers qui changent le contenu de la reponse et font partie de la cle
+KEY_HEADERS = ("Authorization", "Accept", "X-Use-2026-API-Changes")
+
+
+def parse_ttl_config(raw: str) -> Dict[str, float]:
+    """Parse 'ledger_accounts=3600,fiscal_years=3600' en {'/ledger_accounts': 3600}"""
+    ttl_by_endpoint = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        endpoint, ttl = item.split("=", 1)
+        endpoint = "/" + endpoint.strip().lstrip("/")
+        ttl_by_endpoint[endpoint] = float(ttl)
+    return ttl_by_endpoint
+
+
+class HttpResponseCache:
+    """Cache de reponses GET sur disque, borne en taille (eviction LRU)"""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_by_endpoint: Optional[Dict[str, float]] = None,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite")
+        self.ttl_by_endpoint = ttl_by_endpoint or {}
+        self.max_bytes = max_bytes
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+        }
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    # ========================================================================
+    # CLES & POLITIQUE
+    # ========================================================================
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """TTL de l'endpoint, None si l'endpoint n'est pas mis en cache"""
+        path = endpoint.split("?", 1)[0]
+        for prefix, ttl in self.ttl_by_endpoint.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return ttl
+        return None
+
+    def make_key(self, url: str, params: Optional[Dict], headers: Dict) -> str:
+        """Cle stable a partir de l'URL, des params et des headers pertinents"""
+        relevant = {
+            name: hashlib.sha256(str(headers[name]).encode()).hexdigest()
+            for name in KEY_HEADERS
+            if name in headers
+        }
+        raw = json.dumps(
+            [url, sorted((params or {}).items()), sorted(relevant.items())],
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    # ========================================================================
+    # LECTURE / ECRITURE
+    # ========================================================================
+
+    def lookup(self, key: str, endpoint: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Cherche une entree.
+
+        Returns:
+            (entree ou None, True si l'entree peut etre servie sans appel API)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        if row is None:
+            return None, False
+
+        entry = {
+            "body": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "stored_at": row[3],
+        }
+        has_validators = bool(entry["etag"] or entry["last_modified"])
+        ttl = self.ttl_for(endpoint) or 0
+        fresh = not has_validators and time.time() - entry["stored_at"] < ttl
+
+        if fresh:
+            self._touch(key)
+            self.stats["hits"] += 1
+        return entry, fresh
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Headers If-None-Match / If-Modified-Since pour revalider une entree"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_revalidated(self, key: str):
+        """Le serveur a repondu 304 : l'entree reste valide"""
+        self._touch(key, refresh=True)
+        self.stats["revalidated"] += 1
+
+    def store(self, key: str, url: str, body: bytes, headers) -> None:
+        """Enregistre une reponse 200 puis applique la borne de taille"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    body,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._conn.commit()
+        self.stats["misses"] += 1
+        self.stats["stored"] += 1
+        self._evict()
+
+    def _touch(self, key: str, refresh: bool = False):
+        with self._lock:
+            now = time.time()
+            if refresh:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ?, stored_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self._conn.commit()
+
+    def _evict(self):
+        """Supprime les entrees les moins recemment utilisees au-dela de max_bytes"""
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+            ).fetchall()
+            to_delete = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                to_delete.append((key,))
+                total -= size
+
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+            self._conn.commit()
+        self.stats["evicted"] += len(to_delete)
+
+    # ========================================================================
+    # UTILITAIRES
+    # ========================================================================
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Vide le cache (entierement ou pour un endpoint)"""
+        with self._lock:
+            if endpoint:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE url LIKE ?", (f"%{endpoint}%",)
+                )
+            else:
+                self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict:
+        """Hits (TTL), revalidations 304, misses, evictions et taille sur disque"""
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        served = self.stats["hits"] + self.stats["revalidated"]
+        lookups = served + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            "entries": count,
+            "size_bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,6 +5,8 @@ Modes:
     python src/incremental_sync.py              # sync incrementale (defaut)
     python src/incremental_sync.py --full       # force full import
     python src/incremental_sync.py --table customers  # sync une seule table
+    python src/incremental_sync.py --report     # regressions de duree par table
+    python src/incremental_sync.py --profile    # profils CPU/memoire par table
 
 Architecture:
     - Tables avec changelog : sync incrementale (upsert/delete)
@@ -12,23 +14,47 @@ Architecture:
     - Tables d'export : workflow POST + polling + download
 """
 
+import hashlib
 import json
 import os
 import sys
 import argparse
 import logging
+import tempfile
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import psycopg2
+import pyarrow as pa
+import pyarrow.compute as pc
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
 # Ajouter le repertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from src.pennylane_api_client import PennylaneClient
+from src.export_manager import ExportManager
+from src.metrics import METRICS
+from src.pennylane_api_client import ApiError, PennylaneClient
+from src.schema_registry import SchemaRegistry
+from src.sync_profiler import SyncProfiler
+from src.run_history import (
+    TableRun,
+    ensure_sync_runs_table,
+    note_rows_unchanged,
+    note_sync_state,
+    phase,
+    print_regression_report,
+    record_table_runs,
+    regression_report,
+    timed_iter,
+    track_table,
+)
 
 # ============================================================================
 # CONFIGURATION
@@ -87,6 +113,8 @@ FULL_REPLACE_TABLES = {
 }
 
 # Tables d'export (workflow POST specifique)
+# {"fec": {"export_method": "export_fec", "export_params": {"fiscal_year_id": 1}}}
+# Les exports sont lances ensemble par ExportManager (start_<export_method>)
 # Note: les endpoints /exports/fec et /exports/analytical_general_ledger
 # ne sont pas encore disponibles dans l'API v2 publique (404).
 # A reactiver quand Pennylane les rendra disponibles.
@@ -128,20 +156,38 @@ def ensure_schema_and_sync_state(conn):
             CREATE TABLE IF NOT EXISTS pennylane.sync_state (
                 table_name VARCHAR(100) PRIMARY KEY,
                 last_sync_at TIMESTAMP NOT NULL DEFAULT NOW(),
-                last_processed_at VARCHAR(255),
+                last_processed_at TEXT,
                 records_synced INTEGER DEFAULT 0,
                 sync_type VARCHAR(20) DEFAULT 'full',
                 updated_at TIMESTAMP DEFAULT NOW()
             )
         """)
+        # Les checkpoints (cursor + compteurs en JSON) depassent 255 caracteres.
+        # ALTER TYPE verrouille sync_state : seulement si la colonne est ancienne
+        cur.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'pennylane' AND table_name = 'sync_state'
+              AND column_name = 'last_processed_at'
+        """)
+        row = cur.fetchone()
+        if row and row[0] != "text":
+            cur.execute("""
+                ALTER TABLE pennylane.sync_state
+                ALTER COLUMN last_processed_at TYPE TEXT
+            """)
+        ensure_sync_runs_table(conn)
     conn.commit()
 
 
 def get_last_sync(conn, table_name: str) -> str | None:
     """Recupere la date de derniere sync pour une table"""
     with conn.cursor() as cur:
+        # sync_type 'partial' : seule une extraction interrompue a ete vue
         cur.execute(
-            "SELECT last_sync_at FROM pennylane.sync_state WHERE table_name = %s",
+            """
+            SELECT last_sync_at FROM pennylane.sync_state
+            WHERE table_name = %s AND sync_type <> 'partial'
+        """,
             (table_name,),
         )
         row = cur.fetchone()
@@ -150,24 +196,260 @@ def get_last_sync(conn, table_name: str) -> str | None:
     return None
 
 
-def update_sync_state(conn, table_name: str, records_synced: int, sync_type: str):
-    """Met a jour l'etat de sync pour une table"""
+def update_sync_state(
+    conn,
+    table_name: str,
+    records_synced: int,
+    sync_type: str,
+    synced_at: str | None = None,
+    commit: bool = True,
+):
+    """Met a jour l'etat de sync pour une table
+
+    `synced_at` (defaut NOW()) permet de reporter le debut d'une extraction
+    reprise sur plusieurs runs, pour ne pas rater les changements survenus
+    pendant l'extraction. `commit=False` laisse la mise a jour dans la
+    transaction de l'appelant (chargement et watermark ensemble).
+    """
     with conn.cursor() as cur:
         cur.execute(
             """
             INSERT INTO pennylane.sync_state (table_name, last_sync_at, records_synced, sync_type, updated_at)
-            VALUES (%s, NOW(), %s, %s, NOW())
+            VALUES (%s, COALESCE(%s::timestamp, NOW()), %s, %s, NOW())
             ON CONFLICT (table_name) DO UPDATE SET
-                last_sync_at = NOW(),
+                last_sync_at = EXCLUDED.last_sync_at,
                 records_synced = EXCLUDED.records_synced,
                 sync_type = EXCLUDED.sync_type,
                 updated_at = NOW()
         """,
-            (table_name, records_synced, sync_type),
+            (table_name, synced_at, records_synced, sync_type),
+        )
+    if commit:
+        conn.commit()
+    note_sync_state(records_synced, sync_type)
+
+
+# ============================================================================
+# CHECKPOINTS DE REPRISE (extractions completes)
+# ============================================================================
+
+# Age max d'un checkpoint avant de repartir de la page 1 (les cursors expirent)
+CHECKPOINT_MAX_AGE_HOURS = float(os.getenv("SYNC_CHECKPOINT_MAX_AGE_HOURS", "12"))
+# Extractions plus courtes gardees en memoire, sans staging ni checkpoint :
+# les tables de reference repartent simplement de la page 1 apres un echec
+CHECKPOINT_MIN_PAGES = int(os.getenv("SYNC_CHECKPOINT_MIN_PAGES", "50"))
+# Format des pages en staging (un checkpoint d'un autre format est ignore)
+CHECKPOINT_FORMAT = "arrow-ipc"
+# Codes renvoyes par l'API pour un cursor expire ou invalide
+CURSOR_REJECTED_STATUSES = {400, 404, 410, 422}
+
+
+def staging_table_name(table_name: str) -> str:
+    """Table de staging des pages deja extraites d'une table"""
+    return f"pennylane._staging_{table_name}"
+
+
+def load_checkpoint(conn, table_name: str) -> dict | None:
+    """Lit le checkpoint d'extraction (sync_state.last_processed_at)
+
+    Retourne None si absent, illisible, trop ancien ou si la table de
+    staging a disparu.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT last_processed_at FROM pennylane.sync_state WHERE table_name = %s",
+            (table_name,),
+        )
+        row = cur.fetchone()
+        cur.execute("SELECT to_regclass(%s)", (staging_table_name(table_name),))
+        staging_exists = cur.fetchone()[0] is not None
+
+    if not row or not row[0] or not staging_exists:
+        return None
+
+    try:
+        checkpoint = json.loads(row[0])
+    except ValueError:
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get("mode") != "full":
+        return None
+    if checkpoint.get("format") != CHECKPOINT_FORMAT:
+        return None
+    if not {"cursor", "rows", "complete", "started_at"} <= checkpoint.keys():
+        return None
+
+    try:
+        saved_at = datetime.fromisoformat(checkpoint["saved_at"])
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"[CHECKPOINT] {table_name}: checkpoint sans date valide ignore")
+        return None
+    if saved_at.tzinfo is None:
+        saved_at = saved_at.replace(tzinfo=timezone.utc)
+    age_hours = (datetime.now(timezone.utc) - saved_at).total_seconds() / 3600
+    if age_hours > CHECKPOINT_MAX_AGE_HOURS:
+        logger.info(
+            f"[CHECKPOINT] {table_name}: checkpoint de {age_hours:.1f}h ignore (trop ancien)"
+        )
+        return None
+    return checkpoint
+
+
+def save_checkpoint(conn, table_name: str, checkpoint: dict):
+    """Ecrit le checkpoint dans sync_state (sans valider la transaction)
+
+    Une table jamais synchronisee est inseree en sync_type 'partial' pour ne
+    pas etre prise pour une table a jour par get_last_sync.
+    """
+    checkpoint = {
+        **checkpoint,
+        "saved_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO pennylane.sync_state (table_name, last_processed_at, records_synced, sync_type, updated_at)
+            VALUES (%s, %s, 0, 'partial', NOW())
+            ON CONFLICT (table_name) DO UPDATE SET
+                last_processed_at = EXCLUDED.last_processed_at,
+                updated_at = NOW()
+        """,
+            (table_name, json.dumps(checkpoint)),
         )
+
+
+def clear_checkpoint(conn, table_name: str):
+    """Supprime checkpoint et staging une fois la table chargee"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE pennylane.sync_state SET last_processed_at = NULL WHERE table_name = %s",
+            (table_name,),
+        )
+        cur.execute(f"DROP TABLE IF EXISTS {staging_table_name(table_name)}")
     conn.commit()
 
 
+def stage_pages(conn, staging: str, batches: list):
+    """Ecrit des pages Arrow (une ligne IPC par page) dans la table de staging"""
+    from src.arrow_decoding import batch_to_ipc
+
+    with phase("serialize"):
+        payloads = [(psycopg2.Binary(batch_to_ipc(batch)),) for batch in batches]
+    with phase("load"), conn.cursor() as cur:
+        execute_values(cur, f"INSERT INTO {staging} (page) VALUES %s", payloads)
+
+
+def extract_with_checkpoint(
+    client: PennylaneClient, conn, table_name: str, config: dict
+):
+    """Extraction complete d'un endpoint, reprenable page par page.
+
+    Les pages sont decodees en Arrow et gardees en memoire. Au-dela de
+    SYNC_CHECKPOINT_MIN_PAGES pages, l'extraction passe en mode reprenable :
+    chaque page est ecrite en Arrow IPC dans la table de staging et le cursor
+    suivant est enregistre dans la meme transaction. Apres un echec (timeout,
+    401...), l'extraction suivante relit ces pages et repart du dernier cursor
+    valide au lieu de la page 1. Une extraction plus courte n'ecrit rien.
+    Un cursor de reprise refuse par l'API (expire) efface le checkpoint et
+    relance l'extraction depuis la page 1.
+
+    Returns:
+        (ArrowPages des enregistrements extraits, debut de l'extraction)
+    """
+    from src.arrow_decoding import ArrowPages, batches_from_ipc
+
+    staging = staging_table_name(table_name)
+    checkpoint = load_checkpoint(conn, table_name)
+    result = ArrowPages()
+
+    if checkpoint:
+        logger.info(
+            f"[CHECKPOINT] {table_name}: reprise apres {checkpoint['rows']} "
+            f"enregistrements deja extraits"
+        )
+        with phase("load"), conn.cursor() as cur:
+            cur.execute(f"SELECT page FROM {staging} ORDER BY seq")
+            staged = cur.fetchall()
+        with phase("serialize"):
+            for (page,) in staged:
+                for batch in batches_from_ipc(bytes(page)):
+                    result.append(batch)
+        del staged
+        staging_started = True
+        resumed = checkpoint["cursor"] is not None
+    else:
+        with conn.cursor() as cur:
+            cur.execute("SELECT NOW()::timestamp::text")
+            started_at = cur.fetchone()[0]
+        conn.commit()
+        checkpoint = {
+            "mode": "full",
+            "format": CHECKPOINT_FORMAT,
+            "cursor": None,
+            "rows": 0,
+            "complete": False,
+            "started_at": started_at,
+        }
+        staging_started = False
+        resumed = False
+
+    if not checkpoint["complete"]:
+        pages = client.iter_cursor_pages(
+            config["endpoint"],
+            extra_headers=config.get("extra_headers"),
+            cursor=checkpoint["cursor"],
+            as_arrow=True,
+        )
+        pending = []
+        fetched = 0
+        try:
+            for batch, next_cursor in timed_iter(pages, "fetch"):
+                fetched += 1
+                result.append(batch)
+                checkpoint["rows"] += batch.num_rows
+                checkpoint["cursor"] = next_cursor
+                checkpoint["complete"] = next_cursor is None
+                if staging_started:
+                    pending = [batch]
+                elif next_cursor and len(result.batches) >= CHECKPOINT_MIN_PAGES:
+                    # Extraction longue : les pages deja recues passent en staging
+                    logger.info(
+                        f"[CHECKPOINT] {table_name}: plus de {CHECKPOINT_MIN_PAGES} "
+                        f"pages, extraction reprenable (staging {staging})"
+                    )
+                    with conn.cursor() as cur:
+                        cur.execute(f"DROP TABLE IF EXISTS {staging}")
+                        cur.execute(
+                            f"CREATE TABLE {staging} "
+                            "(seq BIGSERIAL PRIMARY KEY, page BYTEA NOT NULL)"
+                        )
+                    pending = result.batches
+                    staging_started = True
+                else:
+                    continue
+                stage_pages(conn, staging, pending)
+                save_checkpoint(conn, table_name, checkpoint)
+                conn.commit()
+        except ApiError as e:
+            # Cursor sauvegarde refuse (expire) : reprise impossible
+            if not (
+                resumed and fetched == 0 and e.status_code in CURSOR_REJECTED_STATUSES
+            ):
+                raise
+            logger.warning(
+                f"[CHECKPOINT] {table_name}: cursor de reprise refuse ({e}), "
+                f"extraction relancee depuis la page 1"
+            )
+            clear_checkpoint(conn, table_name)
+            return extract_with_checkpoint(client, conn, table_name, config)
+
+        if staging_started and not checkpoint["complete"]:
+            checkpoint["complete"] = True
+            save_checkpoint(conn, table_name, checkpoint)
+            conn.commit()
+
+    return result, checkpoint["started_at"]
+
+
 # ============================================================================
 # APLATISSEMENT DES OBJETS IMBRIQUES
 # ============================================================================
@@ -217,9 +499,7 @@ def flatten_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             continue
 
         # Analyser la structure du dict
-        sample_dict = next(
-            (v for v in sample_values if isinstance(v, dict)), None
-        )
+        sample_dict = next((v for v in sample_values if isinstance(v, dict)), None)
         if sample_dict is None:
             continue
 
@@ -262,152 +542,751 @@ def flatten_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 # ============================================================================
 
 
-def full_replace_table(conn, table_name: str, df: pd.DataFrame):
-    """Remplace completement une table PostgreSQL avec un DataFrame"""
-    if df.empty:
-        logger.warning(f"[SKIP] {table_name}: DataFrame vide, table non modifiee")
-        return 0
+def pg_column_type(series: pd.Series) -> str:
+    """Type PostgreSQL d'une colonne de DataFrame.
 
-    # Aplatir les objets imbriques avant insertion
-    df = flatten_dataframe(df)
+    Les colonnes typees Arrow des exports (montants decimaux, dates) donnent
+    NUMERIC / DATE.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        arrow_type = dtype.pyarrow_dtype
+        if pa.types.is_decimal(arrow_type):
+            return f"NUMERIC({arrow_type.precision}, {arrow_type.scale})"
+        if pa.types.is_date(arrow_type):
+            return "DATE"
+    if dtype == "int64":
+        return "BIGINT"
+    if dtype == "float64":
+        return "DOUBLE PRECISION"
+    if dtype == "bool":
+        return "BOOLEAN"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def new_column_type(series: pd.Series) -> str | None:
+    """Type PostgreSQL d'un champ apparu dans l'API, None s'il est ignore.
+
+    Un lot incremental est petit : une colonne entierement nulle ou un objet
+    non aplati n'en dit pas assez sur le champ, la colonne n'est pas creee
+    (elle le sera quand une valeur arrivera). Hors types surs (booleen, entier,
+    date, float non entier), la colonne est creee en TEXT, qui accepte toutes
+    les valeurs suivantes.
+    """
+    values = series.dropna()
+    if values.empty:
+        return None
+    if series.dtype == object and any(isinstance(v, (dict, list)) for v in values):
+        return None
+    if series.dtype == "float64" and (values % 1 == 0).all():
+        return "TEXT"
+    return pg_column_type(series)
+
+
+# Chargement des full replace : "copy" (COPY FROM STDIN, CSV) ou "insert"
+# (execute_values, pour comparaison)
+LOAD_METHOD = os.getenv("SYNC_LOAD_METHOD", "copy")
+# Au-dela, le buffer CSV du COPY deborde de la memoire vers un fichier temporaire
+COPY_SPOOL_MAX_MB = int(os.getenv("SYNC_COPY_SPOOL_MAX_MB", "64"))
+
+
+def _copy_cell(value):
+    """Cellule d'une colonne objet, en texte comme l'adaptation psycopg2"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value if isinstance(value, str) else str(value)
+
+
+def dataframe_to_records(df: pd.DataFrame) -> list[list]:
+    """Lignes Python pour execute_values (NaN/NA -> None, dicts/lists -> JSON)"""
+    records = []
+    for row in df.astype(object).where(df.notna(), None).values.tolist():
+        records.append(
+            [
+                (
+                    json.dumps(v, ensure_ascii=False, default=str)
+                    if isinstance(v, (dict, list))
+                    else v
+                )
+                for v in row
+            ]
+        )
+    return records
 
-    schema = "pennylane"
-    columns = list(df.columns)
 
-    with conn.cursor() as cur:
-        # Drop + recreate pour schema propre
-        cur.execute(f"DROP TABLE IF EXISTS {schema}.{table_name} CASCADE")
-
-        # Construire CREATE TABLE dynamique a partir du DataFrame
-        col_defs = []
-        for col in columns:
-            dtype = df[col].dtype
-            if dtype == "int64":
-                pg_type = "BIGINT"
-            elif dtype == "float64":
-                pg_type = "DOUBLE PRECISION"
-            elif dtype == "bool":
-                pg_type = "BOOLEAN"
-            else:
-                pg_type = "TEXT"
-            col_defs.append(f'"{col}" {pg_type}')
-
-        create_sql = f"CREATE TABLE {schema}.{table_name} ({', '.join(col_defs)})"
-        cur.execute(create_sql)
-
-        # Ajouter PK sur id si la colonne existe
-        if "id" in columns:
-            cur.execute(f"ALTER TABLE {schema}.{table_name} ADD PRIMARY KEY (id)")
-
-        # Insert en batch
-        col_names = ", ".join(f'"{c}"' for c in columns)
-        template = f"({', '.join(['%s'] * len(columns))})"
-
-        # Convertir NaN en None et dicts/lists en JSON strings pour PostgreSQL
-        records = []
-        for row in df.where(df.notna(), None).values.tolist():
-            records.append(
-                [
-                    (
-                        json.dumps(v, ensure_ascii=False, default=str)
-                        if isinstance(v, (dict, list))
-                        else v
-                    )
-                    for v in row
-                ]
+def dataframe_to_copy_buffer(df: pd.DataFrame):
+    """CSV du DataFrame pour COPY FROM STDIN, ou None si non representable.
+
+    Les colonnes objet non textuelles (dicts, lists, valeurs mixtes) sont
+    converties en texte, puis le CSV est ecrit par Arrow : chaines quotees,
+    NULL = champ vide non quote (defaut du COPY CSV). Le buffer reste en
+    memoire jusqu'a SYNC_COPY_SPOOL_MAX_MB puis passe sur disque.
+    """
+    from pyarrow import csv as pa_csv
+
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            continue
+        values = series.dropna()
+        if not values.map(lambda v: isinstance(v, str)).all():
+            converted[col] = series.map(_copy_cell, na_action="ignore")
+    if converted:
+        df = df.assign(**converted)
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        buffer = tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_MAX_MB * 1024 * 1024)
+        pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=False))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+        logger.warning(f"[COPY] Conversion CSV impossible ({e}), repli sur INSERT")
+        return None
+    buffer.seek(0)
+    return buffer
+
+
+# Table fantome chargee UNLOGGED puis passee en LOGGED avant l'echange
+# (SET LOGGED reecrit la table : gain seulement si le WAL est le goulot)
+SHADOW_UNLOGGED = os.getenv("SYNC_SHADOW_UNLOGGED", "0") == "1"
+# Attente max du verrou de la table live pendant l'echange, puis nouvel essai
+SWAP_LOCK_TIMEOUT = os.getenv("SYNC_SWAP_LOCK_TIMEOUT", "5s")
+SWAP_ATTEMPTS = int(os.getenv("SYNC_SWAP_ATTEMPTS", "5"))
+# Vues impossibles a redefinir sur la nouvelle table (colonne supprimee, type
+# change, vue materialisee) : 1 = supprimees pour laisser passer l'echange,
+# definitions sauvegardees dans DROPPED_VIEWS_DIR ; 0 = remplacement refuse
+SWAP_DROP_VIEWS = os.getenv("SYNC_SWAP_DROP_VIEWS", "0") == "1"
+DROPPED_VIEWS_DIR = Path("logs/dropped_views")
+
+# Colonnes des tables live (cache du process) : les champs apparus dans l'API
+# sont ajoutes par ALTER TABLE sans rechargement complet
+SCHEMA_REGISTRY = SchemaRegistry(
+    "pennylane", lock_timeout=SWAP_LOCK_TIMEOUT, attempts=SWAP_ATTEMPTS
+)
+
+
+# Empreinte du contenu de chaque ligne des tables a changelog : un update
+# dont le contenu n'a pas change n'est pas reecrit
+HASH_COLUMN = "_content_hash"
+# Texte d'une valeur NULL et separateur des valeurs dans l'empreinte
+HASH_NULL = "\\N"
+HASH_SEPARATOR = "\x1f"
+
+
+def _hash_value(value):
+    """Valeur JSON sous forme canonique (objets : cles nulles retirees)"""
+    if isinstance(value, dict):
+        return {k: _hash_value(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_hash_value(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _hash_cell(value) -> str:
+    """Texte canonique d'une cellule pour l'empreinte"""
+    if value is None or (isinstance(value, float) and value != value):
+        return HASH_NULL
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(
+            _hash_value(value), ensure_ascii=False, default=str, sort_keys=True
+        )
+    if value is pd.NA or value is pd.NaT:
+        return HASH_NULL
+    return value if isinstance(value, str) else str(value)
+
+
+# Types convertis en texte par Arrow (vectorise) ; les autres colonnes
+# (objets, listes, types melanges) passent par _hash_cell
+_HASH_ARROW_TYPES = (
+    pa.types.is_integer,
+    pa.types.is_floating,
+    pa.types.is_boolean,
+    pa.types.is_string,
+    pa.types.is_large_string,
+    pa.types.is_null,
+)
+
+
+def _hash_texts(series: pd.Series) -> pa.Array:
+    """Textes canoniques d'une colonne (vectorise pour les colonnes typees)"""
+    try:
+        array = pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = None
+    if array is not None and any(check(array.type) for check in _HASH_ARROW_TYPES):
+        if pa.types.is_floating(array.type):
+            # 3.0 et 3 ont la meme empreinte (entier stocke en float)
+            integral = pc.equal(pc.trunc(array), array)
+            as_int = pc.cast(pc.if_else(integral, array, None), pa.int64(), safe=False)
+            text = pc.if_else(
+                integral, pc.cast(as_int, pa.string()), pc.cast(array, pa.string())
             )
+        else:
+            text = pc.cast(array, pa.string())
+    else:
+        text = pa.array(series.map(_hash_cell).tolist(), pa.string())
+    return pc.fill_null(text, HASH_NULL)
 
-        execute_values(
-            cur,
-            f"INSERT INTO {schema}.{table_name} ({col_names}) VALUES %s",
-            records,
-            template=template,
-            page_size=500,
+
+def row_hashes(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Empreinte md5 de chaque ligne sur `columns` (triees par nom).
+
+    Calculee sur les valeurs recues de l'API, avant leur typage PostgreSQL,
+    et identique quel que soit le chemin de chargement : full replace (pages
+    Arrow) ou upsert (dicts). Les entiers stockes en float (colonne avec des
+    nulls) et les cles nulles des objets n'en changent pas la valeur. Une
+    colonne de `columns` absente de `df` compte comme NULL.
+    """
+    texts = [
+        (
+            _hash_texts(df[column])
+            if column in df.columns
+            else pa.array([HASH_NULL] * len(df), pa.string())
         )
+        for column in sorted(c for c in columns if c != HASH_COLUMN)
+    ]
+    if not texts:
+        return pd.Series(hashlib.md5(b"").hexdigest(), index=df.index)
+    text = pc.binary_join_element_wise(*texts, HASH_SEPARATOR)
+    return pd.Series(
+        [hashlib.md5(t.encode("utf-8")).hexdigest() for t in text.to_pylist()],
+        index=df.index,
+    )
 
-    conn.commit()
-    logger.info(f"[REPLACE] {table_name}: {len(df)} enregistrements charges")
-    return len(df)
 
+def shadow_table_name(table_name: str) -> str:
+    """Table fantome chargee avant d'etre echangee avec la table live"""
+    return f"_shadow_{table_name}"
 
-def upsert_records(conn, table_name: str, records: list[dict]):
-    """UPSERT (INSERT ON CONFLICT DO UPDATE) pour des enregistrements"""
-    if not records:
-        return 0
 
-    schema = "pennylane"
-    df = pd.DataFrame(records)
+def copy_table_extras(cur, schema: str, table_name: str, shadow: str) -> dict:
+    """Recree sur la table fantome les index et droits de la table live.
 
-    # Aplatir les objets imbriques avant insertion
-    df = flatten_dataframe(df)
+    Un index dont une colonne a disparu de la nouvelle table est ignore.
 
-    columns = list(df.columns)
+    Returns:
+        {nom temporaire de l'index: nom d'origine}, a renommer apres l'echange
+    """
+    renames = {}
+    cur.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = to_regclass(%s) AND NOT x.indisprimary
+        """,
+        (f"{schema}.{table_name}",),
+    )
+    for index_name, index_def in cur.fetchall():
+        temp_name = f"_shadow_{index_name}"[:63]
+        index_def = index_def.replace(
+            f"INDEX {index_name} ON", f"INDEX {temp_name} ON", 1
+        ).replace(f" ON {schema}.{table_name} ", f" ON {schema}.{shadow} ", 1)
+        cur.execute("SAVEPOINT shadow_index")
+        try:
+            cur.execute(index_def)
+            cur.execute("RELEASE SAVEPOINT shadow_index")
+            renames[temp_name] = index_name
+        except psycopg2.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT shadow_index")
+            logger.warning(
+                f"[REPLACE] {table_name}: index {index_name} non recree: {e}"
+            )
+
+    cur.execute(
+        """
+        SELECT grantee, privilege_type
+        FROM information_schema.role_table_grants
+        WHERE table_schema = %s AND table_name = %s AND grantee <> current_user
+        """,
+        (schema, table_name),
+    )
+    for grantee, privilege in cur.fetchall():
+        target = "PUBLIC" if grantee == "PUBLIC" else f'"{grantee}"'
+        cur.execute(f"GRANT {privilege} ON {schema}.{shadow} TO {target}")
+    return renames
+
+
+def blocking_dependents(
+    cur, schema: str, table_name: str, columns: list[str]
+) -> list[str]:
+    """Vues de la table live que l'echange ne pourra pas redefinir.
+
+    Vues materialisees, et vues lisant une colonne absente de `columns`.
+    Un changement de type n'est detecte qu'a l'echange.
+    """
+    cur.execute(
+        """
+        SELECT DISTINCT v.oid::regclass::text,
+               CASE WHEN v.relkind = 'm' THEN 'vue materialisee'
+                    ELSE 'colonne ' || a.attname || ' supprimee' END
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        LEFT JOIN pg_attribute a
+               ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+        WHERE d.classid = 'pg_rewrite'::regclass
+          AND d.refobjid = to_regclass(%s) AND v.oid <> d.refobjid
+          AND (v.relkind = 'm' OR (d.refobjsubid > 0 AND a.attname <> ALL(%s)))
+        """,
+        (f"{schema}.{table_name}", list(columns)),
+    )
+    return [f"{name} ({reason})" for name, reason in cur.fetchall()]
+
+
+def swap_blocked_message(schema: str, table_name: str, blockers: list[str]) -> str:
+    return (
+        f"Remplacement de {schema}.{table_name} impossible, vue(s) liee(s) a "
+        f"l'ancienne structure : {'; '.join(blockers)}. Adapter ou supprimer ces "
+        f"vues, ou relancer avec SYNC_SWAP_DROP_VIEWS=1 (vues supprimees, "
+        f"definitions sauvegardees dans {DROPPED_VIEWS_DIR}/)"
+    )
+
+
+def save_dropped_view(view_name: str, kind: str, view_def: str) -> Path:
+    """Ecrit la definition d'une vue supprimee par l'echange"""
+    DROPPED_VIEWS_DIR.mkdir(parents=True, exist_ok=True)
+    path = DROPPED_VIEWS_DIR / f"{view_name}.sql"
+    path.write_text(f"CREATE {kind} {view_name} AS\n{view_def}\n", encoding="utf-8")
+    return path
+
+
+def swap_in_shadow_table(
+    conn, schema: str, table_name: str, shadow: str, index_renames: dict
+):
+    """Remplace la table live par la table fantome (renommages atomiques).
+
+    Transaction courte : les lecteurs voient l'ancienne ou la nouvelle table,
+    jamais une table vide. Les vues qui lisaient l'ancienne table sont
+    redefinies sur la nouvelle ; si c'est impossible (colonne supprimee, type
+    change, vue materialisee), l'echange est annule, l'ancienne table reste en
+    place et l'erreur nomme les vues en cause. Avec SYNC_SWAP_DROP_VIEWS=1,
+    ces vues sont supprimees (definition sauvegardee) et l'echange passe.
+    """
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+                cur.execute("SELECT to_regclass(%s)", (f"{schema}.{table_name}",))
+                live_exists = cur.fetchone()[0] is not None
+
+                views = []
+                if live_exists:
+                    cur.execute(
+                        """
+                        SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid),
+                               v.relkind = 'm'
+                        FROM pg_depend d
+                        JOIN pg_rewrite r ON r.oid = d.objid
+                        JOIN pg_class v ON v.oid = r.ev_class
+                        WHERE d.classid = 'pg_rewrite'::regclass
+                          AND d.refobjid = to_regclass(%s)
+                          AND v.oid <> d.refobjid AND v.relkind IN ('v', 'm')
+                        """,
+                        (f"{schema}.{table_name}",),
+                    )
+                    views = cur.fetchall()
+                    # Vues puis table, dans l'ordre des lecteurs (sinon deadlock) ;
+                    # LOCK refuse les vues materialisees (verrouillees au DROP)
+                    locked = [name for name, _, mat in views if not mat]
+                    locked.append(f"{schema}.{table_name}")
+                    cur.execute(
+                        f"LOCK TABLE {', '.join(locked)} IN ACCESS EXCLUSIVE MODE"
+                    )
+                    cur.execute(
+                        f"ALTER TABLE {schema}.{table_name} "
+                        f"RENAME TO _old_{table_name}"
+                    )
+
+                cur.execute(f"ALTER TABLE {schema}.{shadow} RENAME TO {table_name}")
+                blockers = []
+                for view_name, view_def, materialized in views:
+                    if materialized:
+                        # Lit les donnees de l'ancienne table : a recalculer
+                        blockers.append((view_name, view_def, materialized, None))
+                        continue
+                    cur.execute("SAVEPOINT swap_view")
+                    try:
+                        cur.execute(f"CREATE OR REPLACE VIEW {view_name} AS {view_def}")
+                        cur.execute("RELEASE SAVEPOINT swap_view")
+                    except psycopg2.Error as e:
+                        cur.execute("ROLLBACK TO SAVEPOINT swap_view")
+                        error = str(e).strip().splitlines()[0]
+                        blockers.append((view_name, view_def, materialized, error))
+
+                if blockers and not SWAP_DROP_VIEWS:
+                    raise Exception(
+                        swap_blocked_message(
+                            schema,
+                            table_name,
+                            [
+                                f"{name} ({error or 'vue materialisee'})"
+                                for name, _, _, error in blockers
+                            ],
+                        )
+                    )
+                for view_name, view_def, materialized, error in blockers:
+                    kind = "MATERIALIZED VIEW" if materialized else "VIEW"
+                    path = save_dropped_view(view_name, kind, view_def)
+                    # Sans CASCADE : une vue dependante annule l'echange
+                    cur.execute(f"DROP {kind} {view_name}")
+                    cur.execute("SAVEPOINT swap_view")
+                    try:
+                        cur.execute(f"CREATE {kind} {view_name} AS {view_def}")
+                        cur.execute("RELEASE SAVEPOINT swap_view")
+                        logger.warning(
+                            f"[REPLACE] {table_name}: {view_name} recreee sur la "
+                            f"nouvelle table (droits et index a reappliquer, voir {path})"
+                        )
+                    except psycopg2.Error as e:
+                        cur.execute("ROLLBACK TO SAVEPOINT swap_view")
+                        logger.warning(
+                            f"[REPLACE] {table_name}: {view_name} supprimee "
+                            f"({error or e}), definition dans {path}"
+                        )
+                if live_exists:
+                    # Sans CASCADE : un objet encore dependant annule l'echange
+                    cur.execute(f"DROP TABLE {schema}._old_{table_name}")
+                for temp_name, index_name in index_renames.items():
+                    cur.execute(
+                        f"ALTER INDEX {schema}.{temp_name} RENAME TO {index_name}"
+                    )
+            conn.commit()
+            return
+        except (psycopg2.errors.LockNotAvailable, psycopg2.errors.DeadlockDetected):
+            conn.rollback()
+            logger.warning(
+                f"[REPLACE] {table_name}: table occupee, echange reporte "
+                f"(tentative {attempt}/{SWAP_ATTEMPTS})"
+            )
+            time.sleep(min(2**attempt, 30))
+        except Exception:
+            conn.rollback()
+            raise
+
+    raise Exception(
+        f"Echange de {schema}.{table_name} impossible : verrou non obtenu "
+        f"apres {SWAP_ATTEMPTS} tentatives ({schema}.{shadow} conservee)"
+    )
 
-    if "id" not in columns:
-        logger.warning(f"[SKIP] {table_name}: pas de colonne 'id', upsert impossible")
+
+def full_replace_table(
+    conn,
+    table_name: str,
+    df: pd.DataFrame,
+    load_method: str | None = None,
+    with_hash: bool = False,
+):
+    """Remplace completement une table PostgreSQL avec un DataFrame
+
+    `load_method` (defaut SYNC_LOAD_METHOD) : "copy" envoie un CSV par
+    COPY FROM STDIN, "insert" passe par execute_values. Meme contenu final.
+
+    Les donnees sont chargees dans une table fantome (PK, index, ANALYZE)
+    puis echangees avec la table live : les requetes en cours (Power BI)
+    ne sont bloquees que le temps des renommages.
+
+    `with_hash` ajoute l'empreinte de chaque ligne (_content_hash) pour les
+    tables mises a jour ensuite par apply_changes. Elle est calculee cote
+    client (row_hashes) et chargee avec les donnees dans la table fantome.
+    """
+    if df.empty:
+        logger.warning(f"[SKIP] {table_name}: DataFrame vide, table non modifiee")
         return 0
 
+    # Aplatir les objets imbriques avant insertion
+    with phase("flatten"):
+        df = flatten_dataframe(df)
+
+    schema = "pennylane"
+    df = df.drop(columns=[HASH_COLUMN], errors="ignore")
+    if "id" in df.columns:
+        # Extraction reprise sur plusieurs runs : un enregistrement deplace
+        # entre deux pages peut etre recu deux fois, la version recente gagne
+        duplicated = df.duplicated(subset="id", keep="last")
+        if duplicated.any():
+            logger.info(
+                f"[REPLACE] {table_name}: {int(duplicated.sum())} doublon(s) "
+                f"d'id ignore(s)"
+            )
+            df = df[~duplicated]
+    if with_hash:
+        with phase("serialize"):
+            df = df.assign(**{HASH_COLUMN: row_hashes(df, list(df.columns))})
+    columns = list(df.columns)
+    load_method = load_method or LOAD_METHOD
+
+    # Convertir NaN/NA en NULL et dicts/lists en JSON strings pour PostgreSQL
+    started = time.perf_counter()
+    with phase("serialize"):
+        buffer = dataframe_to_copy_buffer(df) if load_method == "copy" else None
+        if buffer is None:
+            load_method = "insert"
+            records = dataframe_to_records(df)
+    serialize_seconds = time.perf_counter() - started
+
+    # Echange voue a l'echec (vue sur une colonne supprimee, vue
+    # materialisee) : refuse avant de reconstruire la table fantome
     with conn.cursor() as cur:
-        # S'assurer que la table existe (si premiere sync incrementale)
-        cur.execute(f"""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_schema = '{schema}' AND table_name = '{table_name}'
+        blockers = blocking_dependents(cur, schema, table_name, columns)
+    if blockers and not SWAP_DROP_VIEWS:
+        conn.rollback()
+        raise Exception(swap_blocked_message(schema, table_name, blockers))
+
+    shadow = shadow_table_name(table_name)
+    with phase("load"):
+        with conn.cursor() as cur:
+            # Table fantome recreee a partir du DataFrame (schema propre)
+            cur.execute(f"DROP TABLE IF EXISTS {schema}.{shadow}")
+            col_defs = [f'"{col}" {pg_column_type(df[col])}' for col in columns]
+            unlogged = "UNLOGGED " if SHADOW_UNLOGGED else ""
+            target = f"{schema}.{shadow}"
+            cur.execute(f"CREATE {unlogged}TABLE {target} ({', '.join(col_defs)})")
+
+            col_names = ", ".join(f'"{c}"' for c in columns)
+            if buffer is not None:
+                with buffer:
+                    cur.copy_expert(
+                        f"COPY {target} ({col_names}) FROM STDIN WITH (FORMAT csv)",
+                        buffer,
+                    )
+            else:
+                # Insert en batch
+                template = f"({', '.join(['%s'] * len(columns))})"
+                execute_values(
+                    cur,
+                    f"INSERT INTO {target} ({col_names}) VALUES %s",
+                    records,
+                    template=template,
+                    page_size=500,
+                )
+
+            # PK sur id et index de la table live, construits apres le chargement
+            index_renames = {}
+            if "id" in columns:
+                cur.execute(
+                    f"ALTER TABLE {schema}.{shadow} "
+                    f"ADD CONSTRAINT {shadow}_pkey PRIMARY KEY (id)"
+                )
+                index_renames[f"{shadow}_pkey"] = f"{table_name}_pkey"
+            index_renames.update(copy_table_extras(cur, schema, table_name, shadow))
+            if SHADOW_UNLOGGED:
+                cur.execute(f"ALTER TABLE {schema}.{shadow} SET LOGGED")
+            cur.execute(f"ANALYZE {schema}.{shadow}")
+        conn.commit()
+
+        swap_started = time.perf_counter()
+        swap_in_shadow_table(conn, schema, table_name, shadow, index_renames)
+        SCHEMA_REGISTRY.forget(table_name)
+        swap_ms = (time.perf_counter() - swap_started) * 1000
+
+    total_seconds = time.perf_counter() - started
+    logger.info(
+        f"[REPLACE] {table_name}: {len(df)} enregistrements charges "
+        f"({load_method}, serialisation {serialize_seconds:.2f}s + chargement "
+        f"{total_seconds - serialize_seconds:.2f}s dont echange {swap_ms:.0f}ms, "
+        f"{len(df) / total_seconds if total_seconds else 0:.0f} lignes/s)"
+    )
+    METRICS.observe_rows(table_name, loaded=len(df))
+    return len(df)
+
+
+def apply_changes(
+    conn,
+    table_name: str,
+    records: list[dict],
+    delete_ids: list[int],
+    sync_type: str | None = None,
+) -> tuple[int, int]:
+    """Applique un lot de changements d'une table en une seule transaction.
+
+    Les enregistrements modifies sont charges par COPY dans une table
+    temporaire, fusionnes d'un bloc (INSERT ... SELECT ... ON CONFLICT), puis
+    les suppressions sont appliquees et, si `sync_type` est fourni,
+    sync_state avance dans la meme transaction : apres un crash, la table et
+    son watermark restent tous deux a l'etat precedent.
+
+    Chaque ligne porte l'empreinte de son contenu (_content_hash) : une ligne
+    recue identique a la ligne stockee n'est pas reecrite (ni tuple mort, ni
+    WAL). Les lignes ainsi evitees sont comptees dans le log et sync_runs.
+    L'empreinte couvre toutes les colonnes de la table live, comme au full
+    replace : une colonne absente du lot est ecrite a NULL.
+
+    Les champs nouveaux renvoyes par l'API deviennent des colonnes de la
+    table live (SCHEMA_REGISTRY), sans rechargement complet.
+
+    Si la table n'existe pas encore, les enregistrements la creent par full
+    replace (transaction separee).
+
+    Returns:
+        (lignes ecrites, lignes supprimees)
+    """
+    schema = "pennylane"
+    df = None
+    if records:
+        with phase("serialize"):
+            df = pd.DataFrame(records)
+
+        # Aplatir les objets imbriques avant insertion
+        with phase("flatten"):
+            df = flatten_dataframe(df)
+
+        if "id" not in df.columns:
+            logger.warning(
+                f"[SKIP] {table_name}: pas de colonne 'id', upsert impossible"
             )
-        """)
-        table_exists = cur.fetchone()[0]
+            df = None
 
-        if not table_exists:
+    table_exists = SCHEMA_REGISTRY.columns(conn, table_name) is not None
+
+    upserted = 0
+    unchanged = 0
+    deleted = 0
+    try:
+        if df is not None and not table_exists:
+            # Premiere sync incrementale : la table est creee par full replace
             logger.info(
                 f"[CREATE] Table {schema}.{table_name} n'existe pas, full replace"
             )
             conn.commit()
-            return full_replace_table(conn, table_name, df)
-
-        # Upsert
-        col_names = ", ".join(f'"{c}"' for c in columns)
-        template = f"({', '.join(['%s'] * len(columns))})"
-        update_cols = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c != "id")
-
-        records_list = []
-        for row in df.where(df.notna(), None).values.tolist():
-            records_list.append(
-                [
-                    (
-                        json.dumps(v, ensure_ascii=False, default=str)
-                        if isinstance(v, (dict, list))
-                        else v
-                    )
-                    for v in row
-                ]
+            upserted = full_replace_table(conn, table_name, df, with_hash=True)
+            df = None
+
+        if df is not None:
+            # Un id present deux fois ne peut pas etre fusionne deux fois
+            df = df.drop_duplicates(subset="id", keep="last")
+            df = df.drop(columns=[HASH_COLUMN], errors="ignore")
+            staging = f"_changes_{table_name}"
+
+            # Champs apparus dans l'API (et empreinte des tables chargees
+            # avant son ajout) : colonnes ajoutees a la table live. Les lignes
+            # existantes y ont NULL jusqu'a leur prochaine modification.
+            with phase("load"):
+                known = SCHEMA_REGISTRY.columns(conn, table_name)
+                new_types = {
+                    c: new_column_type(df[c]) for c in df.columns if c not in known
+                }
+                added = SCHEMA_REGISTRY.add_columns(
+                    conn,
+                    table_name,
+                    {
+                        **{c: t for c, t in new_types.items() if t is not None},
+                        HASH_COLUMN: "TEXT",
+                    },
+                )
+                live_columns = list(SCHEMA_REGISTRY.columns(conn, table_name))
+            if added:
+                logger.info(
+                    f"[SCHEMA] {table_name}: colonne(s) ajoutee(s) : {', '.join(added)}"
+                )
+            skipped = [c for c, t in new_types.items() if t is None]
+            if skipped:
+                logger.info(
+                    f"[SCHEMA] {table_name}: colonne(s) ignoree(s) (nulles ou "
+                    f"objets non aplatis) : {', '.join(skipped)}"
+                )
+
+            # Empreinte sur toutes les colonnes de la table live, comme au full
+            # replace : une colonne absente du lot (objet nul jamais aplati,
+            # champ disparu) vaut NULL, dans l'empreinte comme dans la table
+            with phase("serialize"):
+                df = df[[c for c in df.columns if c in live_columns]]
+                df = df.assign(**{HASH_COLUMN: row_hashes(df, live_columns)})
+                columns = list(df.columns)
+                col_names = ", ".join(f'"{c}"' for c in columns)
+                buffer = dataframe_to_copy_buffer(df)
+                if buffer is None:
+                    rows = dataframe_to_records(df)
+            live_names = ", ".join(f'"{c}"' for c in live_columns)
+            update_cols = ", ".join(
+                f'"{c}" = EXCLUDED."{c}"' for c in live_columns if c != "id"
             )
 
-        sql = f"""
-            INSERT INTO {schema}.{table_name} ({col_names}) VALUES %s
-            ON CONFLICT (id) DO UPDATE SET {update_cols}
-        """
+            with phase("load"), conn.cursor() as cur:
+                cur.execute(
+                    f"CREATE TEMP TABLE {staging} "
+                    f"(LIKE {schema}.{table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                if buffer is not None:
+                    with buffer:
+                        cur.copy_expert(
+                            f"COPY {staging} ({col_names}) FROM STDIN "
+                            "WITH (FORMAT csv)",
+                            buffer,
+                        )
+                else:
+                    execute_values(
+                        cur,
+                        f"INSERT INTO {staging} ({col_names}) VALUES %s",
+                        rows,
+                        template=f"({', '.join(['%s'] * len(columns))})",
+                        page_size=500,
+                    )
+                # Les lignes dont l'empreinte n'a pas change sont ignorees
+                cur.execute(f"""
+                    INSERT INTO {schema}.{table_name} AS live ({live_names})
+                    SELECT {live_names} FROM {staging}
+                    ON CONFLICT (id) DO UPDATE SET {update_cols}
+                    WHERE live.{HASH_COLUMN} IS DISTINCT FROM EXCLUDED.{HASH_COLUMN}
+                """)
+                upserted = cur.rowcount
+                unchanged = len(df) - upserted
+
+        if delete_ids and table_exists:
+            with phase("load"), conn.cursor() as cur:
+                cur.execute(
+                    f"DELETE FROM {schema}.{table_name} WHERE id = ANY(%s)",
+                    (list(delete_ids),),
+                )
+                deleted = cur.rowcount
+
+        if sync_type:
+            update_sync_state(
+                conn, table_name, upserted + deleted, sync_type, commit=False
+            )
+        with phase("load"):
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        # Table modifiee ou supprimee hors de la sync : catalogue relu
+        SCHEMA_REGISTRY.forget(table_name)
+        raise
+
+    if records:
+        logger.info(
+            f"[UPSERT] {table_name}: {upserted} enregistrements upsert, "
+            f"{unchanged} inchange(s) non reecrit(s)"
+        )
+    if delete_ids:
+        logger.info(f"[DELETE] {table_name}: {deleted} enregistrements supprimes")
+    METRICS.observe_rows(
+        table_name, upserted=upserted, deleted=deleted, unchanged=unchanged
+    )
+    note_rows_unchanged(unchanged)
+    return upserted, deleted
 
-        execute_values(cur, sql, records_list, template=template, page_size=500)
 
-    conn.commit()
-    logger.info(f"[UPSERT] {table_name}: {len(records)} enregistrements upsert")
-    return len(records)
+def upsert_records(conn, table_name: str, records: list[dict]):
+    """UPSERT (INSERT ON CONFLICT DO UPDATE) pour des enregistrements"""
+    return apply_changes(conn, table_name, records, [])[0]
 
 
 def delete_records(conn, table_name: str, ids: list[int]):
     """Supprime des enregistrements par ID"""
-    if not ids:
-        return 0
-
-    schema = "pennylane"
-
-    with conn.cursor() as cur:
-        cur.execute(f"DELETE FROM {schema}.{table_name} WHERE id = ANY(%s)", (ids,))
-        deleted = cur.rowcount
-
-    conn.commit()
-    logger.info(f"[DELETE] {table_name}: {deleted} enregistrements supprimes")
-    return deleted
+    return apply_changes(conn, table_name, [], ids)[1]
 
 
 # ============================================================================
@@ -415,6 +1294,55 @@ def delete_records(conn, table_name: str, ids: list[int]):
 # ============================================================================
 
 
+def _change_time(change: dict) -> datetime:
+    """Horodatage d'un changement (datetime.min si absent ou illisible)"""
+    raw = change.get("timestamp") or change.get("processed_at")
+    try:
+        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def compact_changelog(changes: list[dict]) -> tuple[list, list]:
+    """Reduit le changelog a la derniere operation de chaque id.
+
+    Un id modifie 50 fois puis supprime n'est pas re-telecharge : il ne
+    reste qu'un delete. A horodatage egal, l'ordre de l'API est conserve.
+
+    Returns:
+        (ids a telecharger et upserter, ids a supprimer)
+    """
+    final = {}
+    for change in sorted(changes, key=_change_time):
+        final[change["id"]] = change.get("operation")
+
+    upserts = [i for i, op in final.items() if op in ("insert", "create", "update")]
+    deletes = [i for i, op in final.items() if op == "delete"]
+    return upserts, deletes
+
+
+def load_extraction(conn, table_name: str, df: pd.DataFrame, with_hash: bool = False):
+    """full_replace_table pour une extraction complete.
+
+    Si le chargement viole une contrainte (cle primaire...), les pages en
+    staging sont en cause : le checkpoint est efface pour que la prochaine
+    extraction reparte de la page 1 au lieu de rejouer le meme echec.
+    """
+    try:
+        return full_replace_table(conn, table_name, df, with_hash=with_hash)
+    except psycopg2.IntegrityError:
+        conn.rollback()
+        clear_checkpoint(conn, table_name)
+        logger.warning(
+            f"[CHECKPOINT] {table_name}: chargement refuse, checkpoint efface "
+            f"(prochaine extraction depuis la page 1)"
+        )
+        raise
+
+
 def sync_changelog_table(
     client: PennylaneClient,
     conn,
@@ -428,83 +1356,103 @@ def sync_changelog_table(
 
     last_sync = None if force_full else get_last_sync(conn, table_name)
 
-    # Full import si jamais sync ou force
-    if not last_sync:
-        logger.info(f"[FULL] {table_name}: premier import ou force full")
-        extra_headers = config.get("extra_headers")
-        data = client.fetch_all_raw(config["endpoint"], extra_headers=extra_headers)
-        df = pd.DataFrame(data) if data else pd.DataFrame()
-        count = full_replace_table(conn, table_name, df)
-        update_sync_state(conn, table_name, count, "full")
+    # Full import si jamais sync, force, ou extraction complete a reprendre
+    if not last_sync or load_checkpoint(conn, table_name):
+        logger.info(f"[FULL] {table_name}: premier import, force full ou reprise")
+        pages, started_at = extract_with_checkpoint(client, conn, table_name, config)
+        with phase("serialize"):
+            df = pages.to_pandas()
+        count = load_extraction(conn, table_name, df, with_hash=True)
+        # last_sync_at = debut de l'extraction : les changements survenus
+        # pendant l'extraction seront relus par le prochain changelog
+        update_sync_state(conn, table_name, count, "full", synced_at=started_at)
+        clear_checkpoint(conn, table_name)
         return
 
     # Sync incrementale via changelog
-    changes = client.get_changelog(config["changelog_resource"], last_sync)
+    with phase("fetch"):
+        changes = client.get_changelog(config["changelog_resource"], last_sync)
 
     if not changes:
         logger.info(f"[SKIP] {table_name}: aucun changement depuis {last_sync}")
         update_sync_state(conn, table_name, 0, "incremental")
         return
 
-    # Trier les changements par operation
-    inserts = [c["id"] for c in changes if c.get("operation") in ("insert", "create")]
-    updates = [c["id"] for c in changes if c.get("operation") == "update"]
-    deletes = [c["id"] for c in changes if c.get("operation") == "delete"]
+    # Compacter par id : seule la derniere operation compte
+    upsert_ids, deletes = compact_changelog(changes)
+    distinct = len(upsert_ids) + len(deletes)
 
     logger.info(
-        f"[CHANGELOG] {table_name}: {len(inserts)} insert, {len(updates)} update, {len(deletes)} delete"
+        f"[CHANGELOG] {table_name}: {len(changes)} changements -> {distinct} ID(s) "
+        f"(compaction x{len(changes) / max(distinct, 1):.1f}) : "
+        f"{len(upsert_ids)} upsert, {len(deletes)} delete"
     )
 
-    total = 0
-
-    # Fetch et upsert pour insert + update
-    upsert_ids = list(set(inserts + updates))
+    # Fetch pour insert + update
+    records = []
     if upsert_ids:
         extra_headers = config.get("extra_headers")
-        records = client.get_by_ids(
-            config["endpoint"], upsert_ids, extra_headers=extra_headers
-        )
-        total += upsert_records(conn, table_name, records)
-
-    # Delete
-    if deletes:
-        total += delete_records(conn, table_name, deletes)
+        with phase("fetch"):
+            records = client.get_by_ids(
+                config["endpoint"], upsert_ids, extra_headers=extra_headers
+            )
+        if client.last_missing_ids:
+            logger.warning(
+                f"[CHANGELOG] {table_name}: {len(client.last_missing_ids)} ID(s) "
+                f"absents de l'API (supprimes depuis ?)"
+            )
 
-    update_sync_state(conn, table_name, total, "incremental")
+    # Upsert, delete et sync_state dans une seule transaction
+    apply_changes(conn, table_name, records, deletes, sync_type="incremental")
 
 
 def sync_full_replace_table(
-    client: PennylaneClient, conn, table_name: str, config: dict
+    client: PennylaneClient,
+    conn,
+    table_name: str,
+    config: dict,
+    data=None,
 ):
-    """Full replace d'une table via API v2 (pas de changelog disponible)"""
+    """Full replace d'une table via API v2 (pas de changelog disponible)
+
+    `data` permet de fournir des pages Arrow deja extraites (en parallele).
+    """
     logger.info(f"{'='*60}")
     logger.info(f"[SYNC] {table_name} (full replace API)")
 
-    extra_headers = config.get("extra_headers")
-    data = client.fetch_all_raw(config["endpoint"], extra_headers=extra_headers)
-    df = pd.DataFrame(data) if data else pd.DataFrame()
-    count = full_replace_table(conn, table_name, df)
+    if data is None:
+        data, _ = extract_with_checkpoint(client, conn, table_name, config)
+    with phase("serialize"):
+        df = data.to_pandas()
+    count = load_extraction(conn, table_name, df)
     update_sync_state(conn, table_name, count, "full")
+    clear_checkpoint(conn, table_name)
+
 
+def sync_export_table(
+    client: PennylaneClient, conn, table_name: str, config: dict, df=None
+):
+    """Sync d'une table via export POST (FEC, Grand Livre Analytique)
 
-def sync_export_table(client: PennylaneClient, conn, table_name: str, config: dict):
-    """Sync d'une table via export POST (FEC, Grand Livre Analytique)"""
+    `df` permet de fournir un export deja telecharge (ExportManager).
+    """
     logger.info(f"{'='*60}")
     logger.info(f"[SYNC] {table_name} (export)")
 
     try:
-        export_method = getattr(client, config["export_method"])
-        result = export_method()
-
-        download_url = result.get("download_url") or result.get("url")
-        if not download_url:
-            logger.warning(
-                f"[SKIP] {table_name}: pas d'URL de telechargement dans la reponse"
-            )
-            logger.warning(f"  Reponse: {result}")
-            return
-
-        df = client.download_export(download_url)
+        if df is None:
+            export_method = getattr(client, config["export_method"])
+            result = export_method(**config.get("export_params", {}))
+
+            download_url = result.get("download_url") or result.get("url")
+            if not download_url:
+                logger.warning(
+                    f"[SKIP] {table_name}: pas d'URL de telechargement dans la reponse"
+                )
+                logger.warning(f"  Reponse: {result}")
+                return
+
+            df = client.download_export(download_url)
         count = full_replace_table(conn, table_name, df)
         update_sync_state(conn, table_name, count, "export")
 
@@ -517,8 +1465,16 @@ def sync_export_table(client: PennylaneClient, conn, table_name: str, config: di
 # ============================================================================
 
 
-def run_sync(force_full: bool = False, table_filter: str = None):
-    """Execute la synchronisation"""
+def run_sync(
+    force_full: bool = False,
+    table_filter: str = None,
+    profiler: SyncProfiler | None = None,
+):
+    """Execute la synchronisation
+
+    Avec `profiler`, chaque table est synchronisee sous cProfile + tracemalloc
+    et les extractions full replace ne sont plus concurrentes.
+    """
     start_time = time.time()
 
     logger.info("=" * 80)
@@ -542,6 +1498,24 @@ def run_sync(force_full: bool = False, table_filter: str = None):
     success_count = 0
     error_count = 0
 
+    if profiler:
+        profiler.start()
+        logger.info(f"[PROFILE] Profils ecrits dans {profiler.output_dir}")
+
+    def profiled(name):
+        return profiler.table(name) if profiler else nullcontext()
+
+    # Historique par table et par phase (pennylane.sync_runs)
+    run_id = uuid.uuid4().hex
+    sync_mode = "full" if force_full else "incremental"
+    # Runs profiles (plus lents) exclus des medianes du rapport
+    run_mode = f"{sync_mode}-profile" if profiler else sync_mode
+    table_runs = {}
+
+    def new_table_run(name, sync_type):
+        table_runs[name] = TableRun(run_id, name, run_mode, sync_type)
+        return table_runs[name]
+
     def should_sync(name):
         return table_filter is None or table_filter == name
 
@@ -549,45 +1523,159 @@ def run_sync(force_full: bool = False, table_filter: str = None):
     for table_name, config in CHANGELOG_TABLES.items():
         if not should_sync(table_name):
             continue
+        table_run = new_table_run(table_name, sync_mode)
         try:
-            sync_changelog_table(client, conn, table_name, config, force_full)
+            with track_table(table_run), profiled(table_name):
+                sync_changelog_table(client, conn, table_name, config, force_full)
             success_count += 1
+            table_run.finish(True)
         except Exception as e:
             logger.error(f"[ERREUR] {table_name}: {e}")
             error_count += 1
-
-    # 2. Tables full replace
-    for table_name, config in FULL_REPLACE_TABLES.items():
-        if not should_sync(table_name):
-            continue
+            table_run.finish(False, error=str(e))
+        METRICS.observe_table_sync(table_name, table_run.duration, table_run.success)
+
+    # 2. Tables full replace : extractions concurrentes (une connexion
+    # PostgreSQL par worker pour les checkpoints), puis chargement table par table
+    full_replace = {
+        name: config
+        for name, config in FULL_REPLACE_TABLES.items()
+        if should_sync(name)
+    }
+
+    extract_seconds = {}
+    for table_name in full_replace:
+        new_table_run(table_name, "full")
+
+    def extract_in_worker(table_name, config):
+        worker_start = time.time()
+        worker_conn = get_pg_connection()
         try:
-            sync_full_replace_table(client, conn, table_name, config)
+            with track_table(table_runs[table_name]):
+                pages, _ = extract_with_checkpoint(
+                    client, worker_conn, table_name, config
+                )
+            return pages
+        finally:
+            worker_conn.close()
+            extract_seconds[table_name] = time.time() - worker_start
+
+    # En profilage, l'extraction est faite par sync_full_replace_table dans
+    # le thread profile
+    with ThreadPoolExecutor(max_workers=client.max_concurrency) as executor:
+        extractions = {
+            name: executor.submit(extract_in_worker, name, config)
+            for name, config in full_replace.items()
+            if not profiler
+        }
+
+    for table_name, config in full_replace.items():
+        table_run = table_runs[table_name]
+        load_start = time.time()
+        error = None
+        try:
+            data = extractions[table_name].result() if not profiler else None
+            with track_table(table_run), profiled(table_name):
+                sync_full_replace_table(client, conn, table_name, config, data)
             success_count += 1
         except Exception as e:
             logger.error(f"[ERREUR] {table_name}: {e}")
             error_count += 1
-
-    # 3. Tables d'export
+            error = str(e)
+        table_seconds = extract_seconds.get(table_name, 0) + time.time() - load_start
+        table_run.finish(error is None, duration=table_seconds, error=error)
+        METRICS.observe_table_sync(table_name, table_seconds, error is None)
+
+    # 3. Tables d'export : lancees ensemble, telechargees des qu'elles sont
+    # pretes, puis chargees table par table
+    manager = ExportManager(client)
     for table_name, config in EXPORT_TABLES.items():
         if not should_sync(table_name):
             continue
+        table_run = new_table_run(table_name, "export")
         try:
-            sync_export_table(client, conn, table_name, config)
-            success_count += 1
+            with track_table(table_run):
+                manager.start(
+                    table_name,
+                    getattr(client, "start_" + config["export_method"]),
+                    **config.get("export_params", {}),
+                )
         except Exception as e:
             logger.error(f"[ERREUR] {table_name}: {e}")
             error_count += 1
+            table_run.finish(False, error=str(e))
+
+    def download_export(job):
+        with track_table(table_runs[job.name]), phase("fetch"):
+            return client.download_export(job.download_url)
+
+    for table_name, df in manager.run(on_ready=download_export).items():
+        job = manager.jobs[table_name]
+        table_run = table_runs[table_name]
+        if isinstance(df, Exception):
+            logger.error(f"[ERREUR] {table_name}: {df}")
+            error_count += 1
+            table_run.finish(False, duration=job.elapsed, error=str(df))
+            METRICS.observe_table_sync(table_name, job.elapsed, False)
+            continue
+        with track_table(table_run), profiled(table_name):
+            sync_export_table(client, conn, table_name, EXPORT_TABLES[table_name], df)
+        success_count += 1
+        # Duree murale : lancement, polling, telechargement et chargement
+        table_run.finish(True, duration=job.elapsed)
+        METRICS.observe_table_sync(table_name, job.elapsed, True)
+
+    try:
+        # Une table en erreur peut laisser la transaction avortee ; les
+        # chargements reussis sont deja valides
+        conn.rollback()
+        recorded = record_table_runs(conn, list(table_runs.values()))
+        logger.info(f"[HISTORY] {recorded} table(s) enregistree(s) (run {run_id})")
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"[HISTORY] Historique sync_runs non enregistre: {e}")
 
     conn.close()
+    http_stats = client.get_connection_stats()
+    rate_stats = client.get_rate_limit_stats()
+    cache_stats = client.get_cache_stats()
+    client.close()
 
     duration = time.time() - start_time
     total = success_count + error_count
 
     logger.info("=" * 80)
     logger.info(f"[END] Sync terminee en {duration:.1f}s")
+    logger.info(
+        f"[END] HTTP: {http_stats['requests']} requetes | "
+        f"{http_stats['connections_opened']} connexions ouvertes | "
+        f"{http_stats['connections_reused']} reutilisees"
+    )
+    logger.info(
+        f"[END] Rate limit: {rate_stats['sleep_seconds']:.1f}s d'attente "
+        f"(cumul des threads, {rate_stats['sleep_seconds'] / duration * 100 if duration else 0:.0f}% du run) | "
+        f"{rate_stats['throttled']} reponse(s) 429 | "
+        f"{rate_stats['retries']} retry | "
+        f"debit final {rate_stats['current_rate']} req/s"
+    )
+    if cache_stats:
+        logger.info(
+            f"[END] Cache HTTP: {cache_stats['hits']} hits | "
+            f"{cache_stats['revalidated']} revalidations 304 | "
+            f"{cache_stats['misses']} misses | {cache_stats['evicted']} evictions"
+        )
+    unchanged = sum(r.rows_unchanged for r in table_runs.values())
+    if unchanged:
+        logger.info(f"[END] Lignes inchangees non reecrites (changelog): {unchanged}")
     logger.info(f"[END] Succes: {success_count}/{total} | Erreurs: {error_count}")
     logger.info("=" * 80)
 
+    METRICS.observe_run(sync_mode, duration, error_count == 0)
+
+    if profiler:
+        summary = profiler.finish()
+        logger.info(f"[PROFILE] Resume des fonctions couteuses: {summary}")
+
     return error_count == 0
 
 
@@ -601,8 +1689,50 @@ def main():
     parser.add_argument(
         "--table", type=str, help="Sync une seule table (ex: customers)"
     )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Rapport des durees par table (pennylane.sync_runs), sans sync",
+    )
+    parser.add_argument(
+        "--report-window",
+        type=int,
+        default=10,
+        help="Nombre de runs precedents pour la mediane (defaut: 10)",
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=1.5,
+        help="Ratio duree / mediane signale comme regression (defaut: 1.5)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile chaque table (cProfile + tracemalloc) dans logs/profiles",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="logs/profiles",
+        help="Repertoire des profils (defaut: logs/profiles)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Nombre de fonctions / allocations par section (defaut: 20)",
+    )
     args = parser.parse_args()
 
+    if args.report:
+        load_dotenv()
+        conn = get_pg_connection()
+        ensure_schema_and_sync_state(conn)
+        report = regression_report(conn, args.report_window, args.regression_threshold)
+        conn.close()
+        print_regression_report(report, args.report_window, args.regression_threshold)
+        sys.exit(1 if any(e["regression"] for e in report) else 0)
+
     # Verifier que la table demandee existe
     if args.table:
         all_tables = (
@@ -614,7 +1744,10 @@ def main():
                 print(f"  - {t}")
             sys.exit(1)
 
-    success = run_sync(force_full=args.full, table_filter=args.table)
+    profiler = (
+        SyncProfiler(args.profile_dir, args.profile_top) if args.profile else None
+    )
+    success = run_sync(force_full=args.full, table_filter=args.table, profiler=profiler)
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,150 @@
+"""
+Memoisation en memoire des donnees de reference Pennylane
+
+Plan comptable, exercices fiscaux, comptes bancaires... changent rarement mais
+sont relus sans cesse dans une meme session (notebooks, sync). Le resultat
+d'un endpoint complet est garde en memoire pendant le TTL de l'endpoint ; la
+memoire est bornee (eviction LRU) et les appels simultanes sur le meme
+endpoint ne declenchent qu'un seul telechargement (single-flight).
+
+Complementaire du cache HTTP sur disque (src.http_cache) : ici aucune
+requete, meme conditionnelle, n'est envoyee tant que l'entree est fraiche.
+
+Usage:
+    client = PennylaneClient()
+    client.get_ledger_accounts()            # appels API
+    client.get_ledger_accounts()            # memoire, 0 appel
+    client.invalidate_memo("/ledger_accounts")
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+
+def estimate_size(value) -> int:
+    """Taille approximative en octets d'une valeur memoisee"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class MemoCache:
+    """Cache memoire TTL + LRU, thread-safe, avec single-flight"""
+
+    def __init__(
+        self,
+        ttl_by_endpoint: Optional[Dict[str, float]] = None,
+        max_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.ttl_by_endpoint = ttl_by_endpoint or {}
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "shared": 0, "evicted": 0}
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._size = 0
+        # Incremente a chaque invalidation : un chargement lance avant
+        # n'ecrit pas sa valeur perimee dans le cache
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """TTL de l'endpoint, None si l'endpoint n'est pas memoise"""
+        path = endpoint.split("?", 1)[0]
+        for prefix, ttl in self.ttl_by_endpoint.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return ttl
+        return None
+
+    def get_or_load(self, key: str, endpoint: str, loader: Callable[[], object]):
+        """
+        Retourne la valeur memoisee pour `key`, ou l'obtient via `loader`.
+
+        Si un autre thread charge deja `key`, attend son resultat au lieu de
+        relancer le telechargement. Les DataFrames sont copies a la sortie :
+        un appelant qui modifie le sien n'altere pas le cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["expires_at"] > time.time():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._copy(entry["value"])
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                generation = self._generation
+                self.stats["misses"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not owner:
+            return self._copy(future.result())
+
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                self._in_flight.pop(key, None)
+            raise
+
+        self._store(key, endpoint, value, generation)
+        future.set_result(value)
+        with self._lock:
+            self._in_flight.pop(key, None)
+        return self._copy(value)
+
+    def _store(self, key: str, endpoint: str, value, generation: int):
+        size = estimate_size(value)
+        ttl = self.ttl_for(endpoint) or 0
+        with self._lock:
+            if generation != self._generation:
+                return
+            old = self._entries.pop(key, None)
+            if old:
+                self._size -= old["size"]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = {
+                "value": value,
+                "endpoint": endpoint,
+                "expires_at": time.time() + ttl,
+                "size": size,
+            }
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted["size"]
+                self.stats["evicted"] += 1
+
+    @staticmethod
+    def _copy(value):
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Oublie les entrees (toutes, ou celles d'un endpoint)"""
+        if endpoint is not None:
+            endpoint = "/" + endpoint.lstrip("/")
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                if endpoint is None or self._entries[key]["endpoint"] == endpoint:
+                    self._size -= self._entries.pop(key)["size"]
+
+    def get_stats(self) -> Dict:
+        """Hits, misses, appels dedupliques (shared), evictions, taille"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+            }
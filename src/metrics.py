@@ -0,0 +1,311 @@
+"""
+Metriques de la sync au format Prometheus (exposition texte)
+
+Le client API et les fonctions de chargement alimentent un registre global
+(METRICS) ; le scheduler l'expose sur un endpoint HTTP local :
+
+    curl http://127.0.0.1:9108/metrics
+
+Pas de dependance externe : compteurs, jauges et histogrammes minimaux,
+thread-safe, rendus au format texte 0.0.4 lu par Prometheus.
+
+Usage:
+    from src.metrics import METRICS, start_metrics_server
+
+    start_metrics_server(9108)
+    METRICS.observe_rows("customers", upserted=120, deleted=3)
+"""
+
+import re
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+# Latences HTTP (s) : de 10 ms a 1 min
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Durees de sync par table (s)
+DURATION_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return "\n".join(lines)
+
+    def _render_sample(self, key, value):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            # Serie exposee a 0 des le demarrage
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def get(self, **labels) -> Optional[float]:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def _render_sample(self, key, state):
+        lines = []
+        for bound, count in zip(self.buckets, state["counts"]):
+            labels = _format_labels(
+                self.labelnames + ("le",), key + (_format_value(bound),)
+            )
+            lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+def endpoint_label(url: str, base_url: str) -> str:
+    """Libelle d'endpoint a faible cardinalite (/exports/123 -> /exports/:id)"""
+    if not url.startswith(base_url):
+        return "download"
+    path = urlparse(url[len(base_url) :]).path or "/"
+    return re.sub(r"/\d+(?=/|$)", "/:id", path)
+
+
+class SyncMetrics:
+    """Registre des metriques de la sync Pennylane"""
+
+    def __init__(self):
+        self.api_request_seconds = Histogram(
+            "pennylane_api_request_duration_seconds",
+            "Latence des requetes API (hors attente rate limit)",
+            ("endpoint", "method", "status"),
+        )
+        self.api_response_bytes = Counter(
+            "pennylane_api_response_bytes_total",
+            "Octets recus de l'API",
+            ("endpoint",),
+        )
+        self.api_pages = Counter(
+            "pennylane_api_pages_total", "Pages paginees recues", ("endpoint",)
+        )
+        self.api_rows = Counter(
+            "pennylane_api_rows_total", "Enregistrements recus", ("endpoint",)
+        )
+        self.api_throttled = Counter(
+            "pennylane_api_throttled_total", "Reponses 429 recues"
+        )
+        self.api_retries = Counter(
+            "pennylane_api_retries_total", "Requetes rejouees (retry)"
+        )
+        self.rate_limit_sleep = Counter(
+            "pennylane_rate_limit_sleep_seconds_total",
+            "Temps passe a attendre le rate limit client",
+        )
+        self.rows_upserted = Counter(
+            "pennylane_rows_upserted_total", "Lignes upsertees", ("table",)
+        )
+        self.rows_deleted = Counter(
+            "pennylane_rows_deleted_total", "Lignes supprimees", ("table",)
+        )
+        self.rows_unchanged = Counter(
+            "pennylane_rows_unchanged_total",
+            "Lignes recues identiques a la version stockee (non reecrites)",
+            ("table",),
+        )
+        self.rows_loaded = Counter(
+            "pennylane_rows_loaded_total",
+            "Lignes chargees en full replace",
+            ("table",),
+        )
+        self.table_sync_seconds = Histogram(
+            "pennylane_table_sync_duration_seconds",
+            "Duree de sync par table",
+            ("table",),
+            DURATION_BUCKETS,
+        )
+        self.table_errors = Counter(
+            "pennylane_table_sync_errors_total", "Syncs de table en erreur", ("table",)
+        )
+        self.table_last_success = Gauge(
+            "pennylane_table_last_success_timestamp_seconds",
+            "Horodatage (epoch) de la derniere sync reussie par table",
+            ("table",),
+        )
+        self.runs = Counter(
+            "pennylane_sync_runs_total", "Runs de sync", ("mode", "result")
+        )
+        self.run_seconds = Gauge(
+            "pennylane_sync_last_run_duration_seconds",
+            "Duree du dernier run de sync",
+            ("mode",),
+        )
+        self.last_success = Gauge(
+            "pennylane_sync_last_success_timestamp_seconds",
+            "Horodatage (epoch) du dernier run de sync reussi",
+            ("mode",),
+        )
+
+    # Hooks appeles par le client API et les fonctions de chargement
+
+    def observe_request(
+        self, endpoint: str, method: str, status, seconds: float, nbytes: int = 0
+    ):
+        self.api_request_seconds.observe(
+            seconds, endpoint=endpoint, method=method, status=status
+        )
+        if nbytes:
+            self.api_response_bytes.inc(nbytes, endpoint=endpoint)
+
+    def observe_bytes(self, endpoint: str, nbytes: int):
+        self.api_response_bytes.inc(nbytes, endpoint=endpoint)
+
+    def observe_page(self, endpoint: str, rows: int):
+        self.api_pages.inc(endpoint=endpoint)
+        self.api_rows.inc(rows, endpoint=endpoint)
+
+    def observe_rows(
+        self,
+        table: str,
+        upserted: int = 0,
+        deleted: int = 0,
+        loaded: int = 0,
+        unchanged: int = 0,
+    ):
+        if upserted:
+            self.rows_upserted.inc(upserted, table=table)
+        if deleted:
+            self.rows_deleted.inc(deleted, table=table)
+        if loaded:
+            self.rows_loaded.inc(loaded, table=table)
+        if unchanged:
+            self.rows_unchanged.inc(unchanged, table=table)
+
+    def observe_table_sync(self, table: str, seconds: float, success: bool):
+        self.table_sync_seconds.observe(seconds, table=table)
+        if success:
+            self.table_last_success.set(time.time(), table=table)
+        else:
+            self.table_errors.inc(table=table)
+
+    def observe_run(self, mode: str, seconds: float, success: bool):
+        self.runs.inc(mode=mode, result="success" if success else "error")
+        self.run_seconds.set(seconds, mode=mode)
+        if success:
+            self.last_success.set(time.time(), mode=mode)
+
+    def render(self) -> str:
+        metrics = [m for m in vars(self).values() if isinstance(m, _Metric)]
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+# Registre du process (client, sync et scheduler)
+METRICS = SyncMetrics()
+
+
+def start_metrics_server(
+    port: int, host: str = "127.0.0.1", registry: SyncMetrics = METRICS
+) -> ThreadingHTTPServer:
+    """Sert /metrics dans un thread d'arriere-plan"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if urlparse(self.path).path not in ("/metrics", "/"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
@@ -0,0 +1,574 @@
+"""
+Serveur local imitant l'API Pennylane v2 (benchmarks, tests de charge)
+
+Implemente les endpoints utilises par PennylaneClient, sur des donnees
+synthetiques generees a la volee :
+    - listes paginees par cursor (items / has_more / next_cursor,
+      parametres limit ou per_page)
+    - filtre par IDs : filter=[{"field": "id", "operator": "in", "value": [...]}]
+    - /changelogs/<ressource>?start_date=... (insert / update / delete)
+    - POST /exports/fec et /exports/analytical_general_ledger, polling
+      GET /exports/<id>, telechargement du fichier
+    - /me (test de connexion)
+    - quota par fenetre (headers ratelimit-*) et 429 avec Retry-After
+
+Injection de fautes : latence (+ jitter), erreurs 5xx et 429 aleatoires.
+
+Usage:
+    python src/mock_pennylane_server.py --port 8800 --scale 1 --latency-ms 30
+    # puis PENNYLANE_API_BASE_URL=http://127.0.0.1:8800 python src/incremental_sync.py
+
+Endpoints d'administration :
+    POST /_mock/mutate?fraction=0.05   genere des changements (changelogs)
+    GET  /_mock/stats                  compteurs de requetes
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Volumes pour scale=1 (un petit dossier comptable)
+BASE_COUNTS = {
+    "customers": 500,
+    "suppliers": 200,
+    "customer_invoices": 2000,
+    "supplier_invoices": 1500,
+    "products": 100,
+    "transactions": 2000,
+    "ledger_entry_lines": 5000,
+    "ledger_entries": 2000,
+    "ledger_accounts": 300,
+    "bank_accounts": 5,
+    "fiscal_years": 3,
+}
+
+# Ressources exposees par /changelogs
+CHANGELOG_RESOURCES = (
+    "customers",
+    "suppliers",
+    "customer_invoices",
+    "supplier_invoices",
+    "products",
+    "transactions",
+    "ledger_entry_lines",
+)
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _amount(rng: random.Random, high: float = 5000.0) -> str:
+    return f"{rng.uniform(1, high):.2f}"
+
+
+def _ref(resource: str, ref_id: int) -> Dict:
+    return {"id": ref_id, "url": f"/api/external/v2/{resource}/{ref_id}"}
+
+
+def _build_record(resource: str, record_id: int, version: int, scale: float) -> Dict:
+    """Enregistrement deterministe pour (ressource, id, version)"""
+    rng = random.Random(f"{resource}:{record_id}:{version}")
+    created = EPOCH + timedelta(minutes=record_id * 7)
+    record = {
+        "id": record_id,
+        "created_at": _iso(created),
+        "updated_at": _iso(created + timedelta(hours=version)),
+    }
+
+    def count(name):
+        return max(1, int(BASE_COUNTS[name] * scale))
+
+    if resource in ("customers", "suppliers"):
+        record.update(
+            {
+                "name": f"{resource[:-1].title()} {record_id}",
+                "reg_no": f"{rng.randint(100000000, 999999999)}",
+                "emails": [f"contact{record_id}@example.com"],
+                "billing_address": {
+                    "address": f"{rng.randint(1, 200)} rue de la Paix",
+                    "postal_code": f"{rng.randint(10000, 95999)}",
+                    "city": rng.choice(["Paris", "Lyon", "Nantes", "Lille"]),
+                    "country_alpha2": "FR",
+                },
+                "ledger_account": _ref(
+                    "ledger_accounts", rng.randint(1, count("ledger_accounts"))
+                ),
+            }
+        )
+    elif resource in ("customer_invoices", "supplier_invoices"):
+        party = "customer" if resource == "customer_invoices" else "supplier"
+        amount = float(_amount(rng))
+        record.update(
+            {
+                "invoice_number": f"F-{record_id:06d}",
+                "label": f"Facture {record_id}",
+                "date": (created.date()).isoformat(),
+                "deadline": (created.date() + timedelta(days=30)).isoformat(),
+                "currency": "EUR",
+                "amount": f"{amount * 1.2:.2f}",
+                "currency_amount_before_tax": f"{amount:.2f}",
+                "tax": f"{amount * 0.2:.2f}",
+                "status": rng.choice(["upcoming", "late", "paid"]),
+                "paid": rng.random() < 0.6,
+                party: _ref(party + "s", rng.randint(1, count(party + "s"))),
+            }
+        )
+    elif resource == "products":
+        record.update(
+            {
+                "label": f"Produit {record_id}",
+                "unit": rng.choice(["piece", "hour", "day"]),
+                "price_before_tax": _amount(rng, 500),
+                "vat_rate": "FR_200",
+                "currency": "EUR",
+            }
+        )
+    elif resource == "transactions":
+        record.update(
+            {
+                "label": f"VIR SEPA {record_id}",
+                "date": created.date().isoformat(),
+                "amount": f"{rng.uniform(-3000, 3000):.2f}",
+                "currency": "EUR",
+                "bank_account": _ref(
+                    "bank_accounts", rng.randint(1, count("bank_accounts"))
+                ),
+            }
+        )
+    elif resource == "ledger_entry_lines":
+        debit = rng.random() < 0.5
+        amount = _amount(rng)
+        record.update(
+            {
+                "label": f"Ecriture {record_id}",
+                "debit": amount if debit else "0.00",
+                "credit": "0.00" if debit else amount,
+                "ledger_account": _ref(
+                    "ledger_accounts", rng.randint(1, count("ledger_accounts"))
+                ),
+                "ledger_entry": _ref(
+                    "ledger_entries", rng.randint(1, count("ledger_entries"))
+                ),
+            }
+        )
+    elif resource == "ledger_entries":
+        record.update(
+            {
+                "label": f"Piece {record_id}",
+                "date": created.date().isoformat(),
+                "journal": {"id": rng.randint(1, 5), "code": rng.choice(["VT", "HA"])},
+            }
+        )
+    elif resource == "ledger_accounts":
+        record.update(
+            {
+                "number": f"{rng.choice([401, 411, 512, 601, 706])}{record_id:04d}",
+                "label": f"Compte {record_id}",
+                "vat_rate": rng.choice(["FR_200", "FR_100", None]),
+            }
+        )
+    elif resource == "bank_accounts":
+        record.update({"name": f"Banque {record_id}", "currency": "EUR"})
+    elif resource == "fiscal_years":
+        year = 2023 + record_id
+        record.update(
+            {"start": f"{year}-01-01", "finish": f"{year}-12-31", "status": "open"}
+        )
+    return record
+
+
+class MockDataset:
+    """Donnees synthetiques : IDs vivants, versions et journal de changements"""
+
+    def __init__(self, scale: float = 1.0, seed: int = 42):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.ids: Dict[str, List[int]] = {}
+        self.alive: Dict[str, set] = {}
+        self.versions: Dict[str, Dict[int, int]] = {}
+        self.changes: Dict[str, List[Dict]] = {name: [] for name in CHANGELOG_RESOURCES}
+        for resource, base in BASE_COUNTS.items():
+            n = max(1, int(base * scale))
+            self.ids[resource] = list(range(1, n + 1))
+            self.alive[resource] = set(self.ids[resource])
+            self.versions[resource] = {}
+
+    def record(self, resource: str, record_id: int) -> Dict:
+        version = self.versions[resource].get(record_id, 0)
+        return _build_record(resource, record_id, version, self.scale)
+
+    def list_ids(self, resource: str) -> List[int]:
+        with self.lock:
+            return [i for i in self.ids[resource] if i in self.alive[resource]]
+
+    def mutate(self, fraction: float = 0.05) -> Dict[str, int]:
+        """
+        Simule l'activite depuis la derniere sync : sur `fraction` des IDs de
+        chaque ressource, mises a jour (parfois repetees), suppressions et
+        creations, journalisees pour /changelogs.
+        """
+        summary = {}
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            for resource in BASE_COUNTS:
+                alive = sorted(self.alive[resource])
+                n = max(1, int(len(alive) * fraction))
+                touched = self.rng.sample(alive, min(n, len(alive)))
+                events = []
+                for record_id in touched:
+                    roll = self.rng.random()
+                    if roll < 0.15 and resource in CHANGELOG_RESOURCES:
+                        events.append((record_id, "update"))
+                        events.append((record_id, "delete"))
+                        self.alive[resource].discard(record_id)
+                    else:
+                        repeats = self.rng.randint(1, 3)
+                        events.extend([(record_id, "update")] * repeats)
+                        self.versions[resource][record_id] = (
+                            self.versions[resource].get(record_id, 0) + 1
+                        )
+                if resource in CHANGELOG_RESOURCES:
+                    for _ in range(max(1, n // 6)):
+                        new_id = self.ids[resource][-1] + 1
+                        self.ids[resource].append(new_id)
+                        self.alive[resource].add(new_id)
+                        events.append((new_id, "insert"))
+                    for offset, (record_id, operation) in enumerate(events):
+                        self.changes[resource].append(
+                            {
+                                "id": record_id,
+                                "operation": operation,
+                                "timestamp": _iso(
+                                    now + timedelta(seconds=offset // 50)
+                                ),
+                            }
+                        )
+                summary[resource] = len(events)
+        return summary
+
+    def changelog(self, resource: str, start_date: Optional[str]) -> List[Dict]:
+        with self.lock:
+            changes = list(self.changes.get(resource, []))
+        if start_date:
+            changes = [c for c in changes if c["timestamp"] >= start_date]
+        return changes
+
+    def fec_file(self) -> bytes:
+        """Fichier FEC (separateur |, virgule decimale) des lignes d'ecritures"""
+        header = (
+            "JournalCode|JournalLib|EcritureNum|EcritureDate|CompteNum|CompteLib|"
+            "CompAuxNum|CompAuxLib|PieceRef|PieceDate|EcritureLib|Debit|Credit|"
+            "EcritureLet|DateLet|ValidDate|Montantdevise|Idevise"
+        )
+        lines = [header]
+        for record_id in self.list_ids("ledger_entry_lines"):
+            line = self.record("ledger_entry_lines", record_id)
+            date = line["created_at"][:10].replace("-", "")
+            account = line["ledger_account"]["id"]
+            lines.append(
+                f"VT|Ventes|{line['ledger_entry']['id']}|{date}|{account:06d}|"
+                f"Compte {account}|||P{record_id}|{date}|{line['label']}|"
+                f"{line['debit'].replace('.', ',')}|{line['credit'].replace('.', ',')}"
+                f"|||{date}||"
+            )
+        return ("\n".join(lines) + "\n").encode()
+
+
+class FaultInjector:
+    """Latence, erreurs 5xx / 429 aleatoires et quota par fenetre"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        quota: int = 0,
+        quota_window: float = 5.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.quota = quota
+        self.quota_window = quota_window
+        self._window_start = time.time()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def sleep(self):
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def check_quota(self):
+        """(autorise, headers de quota, Retry-After)"""
+        if not self.quota:
+            return True, {}, None
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.quota_window:
+                self._window_start = now
+                self._window_count = 0
+            reset = self.quota_window - (now - self._window_start)
+            allowed = self._window_count < self.quota
+            if allowed:
+                self._window_count += 1
+            remaining = max(self.quota - self._window_count, 0)
+        headers = {
+            "ratelimit-limit": str(self.quota),
+            "ratelimit-remaining": str(remaining),
+            "ratelimit-reset": str(max(int(reset + 0.999), 1)),
+        }
+        return allowed, headers, f"{reset:.2f}"
+
+
+class MockPennylaneServer:
+    """Serveur HTTP (thread) servant un MockDataset avec injection de fautes"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8800,
+        dataset: Optional[MockDataset] = None,
+        faults: Optional[FaultInjector] = None,
+        export_delay: float = 3.0,
+    ):
+        self.dataset = dataset or MockDataset()
+        self.faults = faults or FaultInjector()
+        self.export_delay = export_delay
+        self.exports: Dict[int, Dict] = {}
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def start(self):
+        """Demarre le serveur dans un thread d'arriere-plan"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ========================================================================
+    # ROUTAGE
+    # ========================================================================
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=None, content_type=None):
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode()
+                    content_type = content_type or "application/json"
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, method):
+                url = urlparse(self.path)
+                path = url.path.rstrip("/")
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                if method == "POST":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    self.rfile.read(length)
+
+                if path.startswith("/_mock/"):
+                    return self._admin(path, query)
+
+                server.count("requests")
+                server.faults.sleep()
+
+                allowed, quota_headers, retry_after = server.faults.check_quota()
+                if not allowed or random.random() < server.faults.throttle_rate:
+                    server.count("throttled")
+                    return self._send(
+                        429,
+                        {"error": "Too Many Requests"},
+                        {**quota_headers, "Retry-After": retry_after or "1"},
+                    )
+                if random.random() < server.faults.error_rate:
+                    server.count("errors")
+                    return self._send(503, {"error": "Service Unavailable"})
+
+                try:
+                    status, body, content_type = server.route(method, path, query)
+                except KeyError:
+                    status, body, content_type = 404, {"error": "Not found"}, None
+                server.count(f"{method} {path.split('/')[1] if '/' in path else path}")
+                self._send(status, body, quota_headers, content_type)
+
+            def _admin(self, path, query):
+                if path == "/_mock/mutate":
+                    fraction = float(query.get("fraction", "0.05"))
+                    return self._send(200, server.dataset.mutate(fraction))
+                if path == "/_mock/stats":
+                    return self._send(200, server.get_stats())
+                if path.startswith("/_mock/files/"):
+                    body = server.dataset.fec_file()
+                    return self._send(200, body, content_type="text/csv")
+                return self._send(404, {"error": "Not found"})
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        return Handler
+
+    def route(self, method: str, path: str, query: Dict):
+        """(status, corps, content-type) d'une requete API"""
+        parts = path.strip("/").split("/")
+
+        if path == "/me":
+            return (
+                200,
+                {
+                    "user": {"first_name": "Mock", "last_name": "User", "email": "m@x"},
+                    "company": {"name": "Mock SAS", "reg_no": "000000000"},
+                },
+                None,
+            )
+
+        if parts[0] == "exports":
+            return self._route_export(method, parts)
+
+        if parts[0] == "changelogs" and len(parts) == 2:
+            items = self.dataset.changelog(parts[1], query.get("start_date"))
+            return (200, self._paginate(items, query), None)
+
+        resource = parts[0]
+        if resource not in BASE_COUNTS:
+            raise KeyError(resource)
+
+        ids = self.dataset.list_ids(resource)
+        if "filter" in query:
+            wanted = set()
+            for condition in json.loads(query["filter"]):
+                if condition.get("field") == "id":
+                    wanted.update(int(v) for v in condition.get("value", []))
+            ids = [i for i in ids if i in wanted]
+        return (200, self._paginate(ids, query, resource), None)
+
+    def _paginate(self, items: List, query: Dict, resource: Optional[str] = None):
+        limit = int(query.get("limit") or query.get("per_page") or 20)
+        offset = int(query.get("cursor") or 0)
+        page = items[offset : offset + limit]
+        if resource:
+            page = [self.dataset.record(resource, i) for i in page]
+        has_more = offset + limit < len(items)
+        return {
+            "items": page,
+            "has_more": has_more,
+            "next_cursor": str(offset + limit) if has_more else None,
+        }
+
+    def _route_export(self, method: str, parts: List[str]):
+        if method == "POST":
+            export_id = len(self.exports) + 1
+            self.exports[export_id] = {"kind": parts[-1], "started": time.time()}
+            return (201, {"id": export_id, "status": "pending"}, None)
+
+        export_id = int(parts[1])
+        export = self.exports[export_id]
+        if time.time() - export["started"] < self.export_delay:
+            return (200, {"id": export_id, "status": "processing"}, None)
+        return (
+            200,
+            {
+                "id": export_id,
+                "status": "completed",
+                "download_url": f"{self.base_url}/_mock/files/{export_id}.csv",
+            },
+            None,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur mock de l'API Pennylane")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Facteur de volume des donnees"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Proportion de reponses 503"
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Proportion de 429 aleatoires (en plus du quota)",
+    )
+    parser.add_argument(
+        "--quota", type=int, default=25, help="Requetes par fenetre (0 = illimite)"
+    )
+    parser.add_argument("--quota-window", type=float, default=5.0)
+    parser.add_argument("--export-delay", type=float, default=3.0)
+    args = parser.parse_args()
+
+    server = MockPennylaneServer(
+        args.host,
+        args.port,
+        dataset=MockDataset(args.scale, args.seed),
+        faults=FaultInjector(
+            args.latency_ms,
+            args.jitter_ms,
+            args.error_rate,
+            args.throttle_rate,
+            args.quota,
+            args.quota_window,
+        ),
+        export_delay=args.export_delay,
+    )
+    print(f"[MOCK] API Pennylane simulee sur {server.base_url} (scale {args.scale})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
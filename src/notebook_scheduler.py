@@ -41,6 +41,11 @@ class NotebookScheduler:
         self.output_dir = self.base_dir / "data" / "outputs"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Endpoint de metriques Prometheus (METRICS_PORT=0 pour desactiver)
+        self.metrics_host = os.getenv("METRICS_HOST", "127.0.0.1")
+        self.metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+        self.metrics_server = None
+
         logger.info("[INIT] Scheduler Pennylane initialise")
         logger.info(f"[INIT] Mode: sync incrementale API v2 + full reload quotidien")
 
@@ -90,8 +95,27 @@ class NotebookScheduler:
     # SCHEDULER
     # ========================================================================
 
+    def start_metrics_endpoint(self):
+        """Expose les metriques de sync sur http://<host>:<port>/metrics"""
+        if not self.metrics_port:
+            return
+        from src.metrics import start_metrics_server
+
+        try:
+            self.metrics_server = start_metrics_server(
+                self.metrics_port, self.metrics_host
+            )
+            logger.info(
+                f"[METRICS] Endpoint Prometheus sur "
+                f"http://{self.metrics_host}:{self.metrics_port}/metrics"
+            )
+        except OSError as e:
+            logger.error(f"[METRICS] Endpoint non demarre: {e}")
+
     def start(self):
         """Demarre le scheduler"""
+        self.start_metrics_endpoint()
+
         logger.info("=" * 80)
         logger.info("[DEMARRAGE] Scheduler Pennylane v2")
         logger.info("[DEMARRAGE] Sync incrementale toutes les 5 min")
@@ -8,6 +8,10 @@ Usage dans notebook:
     df_customers = client.get_customers()
     df_invoices = client.get_customer_invoices()
 
+Usage en streaming (memoire constante):
+    for df_chunk in client.iter_dataframes('/ledger_entry_lines', chunk_rows=5000):
+        traiter(df_chunk)
+
 Usage pour sync incrementale:
     client = PennylaneClient(env_path='.env')
     changes = client.get_changelog('customer_invoices', '2026-02-01T00:00:00Z')
@@ -15,18 +19,166 @@ Usage pour sync incrementale:
 """
 
 import os
+import json
 import time
+import base64
+import hashlib
+import tempfile
+import threading
+import contextvars
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import Optional, Dict, List
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from typing import Optional, Dict, Iterator, List, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+
+    def json_loads(raw):
+        """Parse JSON rapide (orjson)"""
+        return orjson.loads(raw)
+
+except ImportError:
+
+    def json_loads(raw):
+        """Parse JSON (module standard, orjson non installe)"""
+        return json.loads(raw)
+
+
+from src.export_parsing import (
+    export_file_summary,
+    export_table_to_pandas,
+    parse_export_file,
+)
+from src.export_manager import PollBackoff, export_state
+from src.http_cache import HttpResponseCache, parse_ttl_config
+from src.memo_cache import MemoCache
+from src.metrics import METRICS, SyncMetrics, endpoint_label
+from src.rate_limiter import TokenBucketRateLimiter, get_shared_rate_limiter
+from src.retry_policy import CircuitBreaker, RetryPolicy
+from src.run_history import note_api_call, note_rate_limit_sleep
+
+
+class ApiError(Exception):
+    """Reponse d'erreur de l'API (code HTTP dans status_code)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ConnectionStats:
+    """Compteurs de connexions TCP ouvertes vs reutilisees (keep-alive)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+
+def _counting_pool_class(base_cls, stats: ConnectionStats):
+    """Sous-classe de pool urllib3 qui compte chaque nouvelle connexion"""
+
+    class CountingPool(base_cls):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter requests avec pool keep-alive instrumente"""
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+def build_id_filter_params(batch_ids: List[int], batch_size: int = 100) -> Dict:
+    """Parametres de requete pour filtrer un endpoint sur une liste d'IDs"""
+    filter_param = [{"field": "id", "operator": "in", "value": batch_ids}]
+    return {
+        "filter": str(filter_param).replace("'", '"'),
+        "per_page": batch_size,
+    }
+
+
+def order_by_ids(records: List[Dict], ids: List[int]):
+    """
+    Trie les enregistrements selon l'ordre des IDs demandes (dedoublonnes).
+
+    Returns:
+        (enregistrements ordonnes, IDs demandes mais non retournes)
+    """
+    by_id = {}
+    for record in records:
+        by_id.setdefault(str(record.get("id")), record)
+
+    ordered = []
+    missing = []
+    seen = set()
+    for record_id in ids:
+        key = str(record_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in by_id:
+            ordered.append(by_id[key])
+        else:
+            missing.append(record_id)
+    return ordered, missing
+
 
 class PennylaneClient:
     """Client API REST Pennylane v2"""
 
-    def __init__(self, env_path: str = None):
+    def __init__(
+        self,
+        env_path: str = None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        http_cache: Optional[HttpResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[SyncMetrics] = None,
+    ):
         if env_path:
             load_dotenv(dotenv_path=env_path)
         else:
@@ -41,8 +193,36 @@ class PennylaneClient:
         if not self.api_token:
             raise ValueError("PENNYLANE_API_TOKEN non trouve dans .env")
 
-        self.min_interval = 1.0 / self.rate_limit
-        self.last_request_time = 0
+        # Limiter injectable ; par defaut partage par tous les clients du
+        # process utilisant le meme token (et entre process si un fichier
+        # d'etat est configure)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter(
+            "pennylane:" + hashlib.sha256(self.api_token.encode()).hexdigest()[:16],
+            rate=self.rate_limit,
+            burst=float(os.getenv("PENNYLANE_RATE_BURST", "1")),
+            path=os.getenv("PENNYLANE_RATE_LIMIT_FILE") or None,
+            adaptive=os.getenv("PENNYLANE_ADAPTIVE_RATE_LIMIT", "true").lower()
+            == "true",
+            max_burst=float(os.getenv("PENNYLANE_RATE_BURST_MAX", "5")),
+        )
+        # Temps passe a attendre le rate limit (par instance = par run)
+        self.rate_limit_sleep = 0.0
+        self.rate_limit_waits = 0
+        self.throttled_count = 0
+
+        # Retry par requete (backoff + jitter) et coupe-circuit
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=int(os.getenv("PENNYLANE_RETRY_MAX_ATTEMPTS", "5")),
+            max_delay=float(os.getenv("PENNYLANE_RETRY_MAX_DELAY", "60")),
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=int(os.getenv("PENNYLANE_CIRCUIT_FAILURES", "5")),
+            reset_timeout=float(os.getenv("PENNYLANE_CIRCUIT_RESET_TIMEOUT", "30")),
+        )
+        self.retry_count = 0
+
+        # Metriques Prometheus (registre du process par defaut)
+        self.metrics = metrics or METRICS
 
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
@@ -50,116 +230,345 @@ class PennylaneClient:
             "Accept": "application/json",
         }
 
+        # Session HTTP keep-alive partagee par toutes les requetes du client
+        self.pool_size = pool_size or int(os.getenv("PENNYLANE_POOL_SIZE", "10"))
+        self.connect_timeout = connect_timeout or float(
+            os.getenv("PENNYLANE_CONNECT_TIMEOUT", "10")
+        )
+        self.read_timeout = read_timeout or float(
+            os.getenv("PENNYLANE_READ_TIMEOUT", "30")
+        )
+        self.export_timeout = float(os.getenv("PENNYLANE_EXPORT_TIMEOUT", "120"))
+        self.max_concurrency = int(os.getenv("PENNYLANE_MAX_CONCURRENCY", "4"))
+        self.last_missing_ids = []
+        self.connection_stats = ConnectionStats()
+        self.session = self._build_session()
+
+        # Cache HTTP persistant optionnel (endpoints de reference)
+        self.http_cache = http_cache
+        cache_dir = os.getenv("PENNYLANE_HTTP_CACHE_DIR")
+        if self.http_cache is None and cache_dir:
+            self.http_cache = HttpResponseCache(
+                cache_dir,
+                ttl_by_endpoint=parse_ttl_config(
+                    os.getenv(
+                        "PENNYLANE_HTTP_CACHE_TTL",
+                        "ledger_accounts=3600,fiscal_years=3600,bank_accounts=3600",
+                    )
+                ),
+                max_bytes=int(float(os.getenv("PENNYLANE_HTTP_CACHE_MAX_MB", "200")))
+                * 1024
+                * 1024,
+            )
+
+        # Memoisation en memoire des endpoints de reference (TTL + LRU)
+        memo_ttl = parse_ttl_config(
+            os.getenv(
+                "PENNYLANE_MEMO_TTL",
+                "ledger_accounts=900,fiscal_years=900,bank_accounts=900",
+            )
+        )
+        self.memo_cache = (
+            MemoCache(
+                memo_ttl,
+                max_bytes=int(float(os.getenv("PENNYLANE_MEMO_MAX_MB", "100")))
+                * 1024
+                * 1024,
+            )
+            if memo_ttl
+            else None
+        )
+
         print(f"[OK] Client API initialise")
         print(f"  Base URL: {self.api_base_url}")
         print(f"  Rate limit: {self.rate_limit} req/sec")
+        print(f"  Pool HTTP: {self.pool_size} connexions keep-alive")
+
+    def _build_session(self) -> requests.Session:
+        """Cree la session requests avec un pool de connexions keep-alive"""
+        session = requests.Session()
+        adapter = CountingHTTPAdapter(
+            self.connection_stats,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Ferme la session HTTP et libere les connexions du pool"""
+        self.session.close()
+        if self.http_cache:
+            self.http_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_connection_stats(self) -> Dict:
+        """Connexions ouvertes vs reutilisees depuis la creation du client"""
+        return self.connection_stats.as_dict()
+
+    def get_memo_stats(self) -> Optional[Dict]:
+        """Statistiques de la memoisation (None si desactivee)"""
+        return self.memo_cache.get_stats() if self.memo_cache else None
+
+    def invalidate_memo(self, endpoint: Optional[str] = None):
+        """Force le rechargement des donnees de reference memoisees"""
+        if self.memo_cache:
+            self.memo_cache.invalidate(endpoint)
+
+    def get_cache_stats(self) -> Optional[Dict]:
+        """Statistiques du cache HTTP (None si le cache est desactive)"""
+        return self.http_cache.get_stats() if self.http_cache else None
 
     # ========================================================================
     # METHODES HTTP DE BASE
     # ========================================================================
 
     def _wait_for_rate_limit(self):
-        """Respecte le rate limit entre requetes"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Respecte le rate limit entre requetes (limiter partage)"""
+        waited = self.rate_limiter.acquire()
+        if waited > 0:
+            self.rate_limit_sleep += waited
+            self.rate_limit_waits += 1
+            self.metrics.rate_limit_sleep.inc(waited)
+            note_rate_limit_sleep(waited)
+
+    def _observe_response(self, response: requests.Response):
+        """Transmet les headers de quota au limiter (adaptatif)"""
+        if response.status_code == 429:
+            self.throttled_count += 1
+            self.metrics.api_throttled.inc()
+        self.rate_limiter.update_from_headers(response.headers, response.status_code)
+
+    def get_rate_limit_stats(self) -> Dict:
+        """Temps d'attente rate limit et nombre de 429 depuis la creation du client"""
+        return {
+            "sleep_seconds": round(self.rate_limit_sleep, 3),
+            "waits": self.rate_limit_waits,
+            "throttled": self.throttled_count,
+            "retries": self.retry_count,
+            "current_rate": round(self.rate_limiter.rate, 3),
+        }
+
+    def _send(self, method: str, url: str, timeout, **kwargs) -> requests.Response:
+        """
+        Envoie une requete avec rate limiting, retry et circuit breaker.
+
+        Boucle (pas de recursion) : seule cette requete est rejouee, avec
+        backoff exponentiel + jitter selon la politique de retry. Retourne la
+        derniere reponse obtenue ; les erreurs reseau non rejouables sont levees.
+        """
+        endpoint = endpoint_label(url, self.api_base_url)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.circuit_breaker.before_request()
+            self._wait_for_rate_limit()
+            note_api_call()
 
-        if time_since_last < self.min_interval:
-            sleep_time = self.min_interval - time_since_last
-            time.sleep(sleep_time)
+            started = time.time()
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.metrics.observe_request(
+                    endpoint, method, type(e).__name__, time.time() - started
+                )
+                self.circuit_breaker.record_failure()
+                if not self.retry_policy.should_retry_exception(e, attempt, method):
+                    raise
+                delay = self.retry_policy.compute_delay(attempt)
+                self.retry_count += 1
+                self.metrics.api_retries.inc()
+                print(
+                    f"[WARNING] {type(e).__name__} sur {method} (tentative {attempt}), "
+                    f"nouvel essai dans {delay:.1f}s..."
+                )
+                time.sleep(delay)
+                continue
+
+            self.metrics.observe_request(
+                endpoint,
+                method,
+                response.status_code,
+                time.time() - started,
+                0 if kwargs.get("stream") else len(response.content),
+            )
+            self._observe_response(response)
+            status = response.status_code
+
+            if status >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
 
-        self.last_request_time = time.time()
+            if not self.retry_policy.should_retry_status(status, attempt, method):
+                return response
+
+            delay = self.retry_policy.compute_delay(
+                attempt, status, response.headers.get("Retry-After")
+            )
+            self.retry_count += 1
+            self.metrics.api_retries.inc()
+            # Reponse abandonnee : rend la connexion au pool (stream=True la
+            # garderait jusqu'au GC)
+            response.close()
+            if status == 429:
+                print(f"[WARNING] Rate limit atteint, attente {delay:.1f}s...")
+                # Bloque tous les utilisateurs du limiter, pas seulement ce thread
+                self.rate_limiter.block_for(delay)
+            else:
+                print(
+                    f"[WARNING] Erreur API {status} (tentative {attempt}), "
+                    f"nouvel essai dans {delay:.1f}s..."
+                )
+                time.sleep(delay)
 
     def _make_request(
         self,
         endpoint: str,
         params: Optional[Dict] = None,
         extra_headers: Optional[Dict] = None,
+        decode=None,
     ) -> Dict:
-        """Requete GET avec rate limiting et retry 429"""
+        """Requete GET avec rate limiting, cache HTTP et retry
+
+        `decode` (defaut json_loads) convertit le corps de la reponse.
+        """
+        decode = decode or json_loads
         url = f"{self.api_base_url}{endpoint}"
         headers = {**self.headers, **(extra_headers or {})}
 
-        self._wait_for_rate_limit()
+        cache_key = None
+        cached = None
+        if self.http_cache and self.http_cache.ttl_for(endpoint) is not None:
+            cache_key = self.http_cache.make_key(url, params, headers)
+            cached, fresh = self.http_cache.lookup(cache_key, endpoint)
+            if fresh:
+                return decode(cached["body"])
+            headers.update(self.http_cache.conditional_headers(cached))
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                print(f"[WARNING] Rate limit atteint, attente {retry_after}s...")
-                time.sleep(retry_after)
-                return self._make_request(endpoint, params, extra_headers)
-            elif response.status_code == 401:
-                raise Exception(
-                    "Token API invalide - Verifiez PENNYLANE_API_TOKEN dans .env"
-                )
-            else:
-                raise Exception(f"Erreur API {response.status_code}: {response.text}")
-
+            response = self._send(
+                "GET",
+                url,
+                (self.connect_timeout, self.read_timeout),
+                headers=headers,
+                params=params,
+            )
         except requests.exceptions.Timeout:
             raise Exception("Timeout API - Verifiez votre connexion internet")
 
+        if response.status_code == 304 and cached:
+            self.http_cache.mark_revalidated(cache_key)
+            return decode(cached["body"])
+        elif response.status_code == 200:
+            if cache_key:
+                self.http_cache.store(
+                    cache_key, url, response.content, response.headers
+                )
+            return decode(response.content)
+        elif response.status_code == 401:
+            raise Exception(
+                "Token API invalide - Verifiez PENNYLANE_API_TOKEN dans .env"
+            )
+        else:
+            raise ApiError(
+                response.status_code,
+                f"Erreur API {response.status_code}: {response.text}",
+            )
+
     def _make_post_request(
         self,
         endpoint: str,
         json_body: Optional[Dict] = None,
         extra_headers: Optional[Dict] = None,
     ) -> Dict:
-        """Requete POST avec rate limiting et retry 429"""
+        """Requete POST avec rate limiting et retry"""
         url = f"{self.api_base_url}{endpoint}"
         headers = {**self.headers, **(extra_headers or {})}
 
-        self._wait_for_rate_limit()
-
         try:
-            response = requests.post(url, headers=headers, json=json_body, timeout=120)
-
-            if response.status_code in (200, 201, 202):
-                return response.json()
-            elif response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                print(f"[WARNING] Rate limit atteint, attente {retry_after}s...")
-                time.sleep(retry_after)
-                return self._make_post_request(endpoint, json_body, extra_headers)
-            elif response.status_code == 401:
-                raise Exception(
-                    "Token API invalide - Verifiez PENNYLANE_API_TOKEN dans .env"
-                )
-            else:
-                raise Exception(
-                    f"Erreur API POST {response.status_code}: {response.text}"
-                )
-
+            response = self._send(
+                "POST",
+                url,
+                (self.connect_timeout, self.export_timeout),
+                headers=headers,
+                json=json_body,
+            )
         except requests.exceptions.Timeout:
             raise Exception("Timeout API POST - Verifiez votre connexion internet")
 
-    def _fetch_all_pages(
+        if response.status_code in (200, 201, 202):
+            return json_loads(response.content)
+        elif response.status_code == 401:
+            raise Exception(
+                "Token API invalide - Verifiez PENNYLANE_API_TOKEN dans .env"
+            )
+        else:
+            raise Exception(f"Erreur API POST {response.status_code}: {response.text}")
+
+    def iter_pages(
         self,
         endpoint: str,
         params: Optional[Dict] = None,
         extra_headers: Optional[Dict] = None,
-    ) -> List[Dict]:
-        """Recupere toutes les pages d'un endpoint (pagination cursor-based API v2)"""
-        all_data = []
-        params = params or {}
+    ) -> Iterator[List[Dict]]:
+        """
+        Itere sur les pages d'un endpoint (pagination cursor-based API v2).
+
+        Chaque page est produite des sa reception : l'appelant peut la traiter
+        puis la liberer, la memoire reste constante quel que soit le volume.
+        """
+        for data, _ in self.iter_cursor_pages(endpoint, params, extra_headers):
+            yield data
+
+    def iter_cursor_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+        cursor: Optional[str] = None,
+        as_arrow: bool = False,
+    ) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """
+        Comme iter_pages, mais produit (page, cursor de la page suivante).
+
+        Le cursor suivant vaut None sur la derniere page. Passer un cursor
+        sauvegarde permet de reprendre une extraction interrompue.
+
+        `as_arrow` : chaque page est un RecordBatch decode directement depuis
+        le corps de la reponse (ArrowPageDecoder), sans dicts Python.
+        """
+        decode = None
+        if as_arrow:
+            from src.arrow_decoding import ArrowPageDecoder
+
+            decode = ArrowPageDecoder(json_loads).decode
+        params = dict(params or {})
         # API 2026 changes: utiliser 'limit' au lieu de 'per_page'
         use_2026 = (extra_headers or {}).get("X-Use-2026-API-Changes") == "true"
         if use_2026:
             params["limit"] = 100
         else:
             params["per_page"] = 100
-        cursor = None
         page = 1
+        total = 0
 
-        print(f"[EXTRACT] Extraction {endpoint}...")
+        if cursor:
+            print(f"[EXTRACT] Reprise {endpoint} depuis le cursor {cursor}...")
+        else:
+            print(f"[EXTRACT] Extraction {endpoint}...")
 
         while True:
             if cursor:
                 params["cursor"] = cursor
 
-            response = self._make_request(endpoint, params, extra_headers)
+            response = self._make_request(endpoint, params, extra_headers, decode)
 
             if isinstance(response, dict) and "items" in response:
                 data = response["items"]
@@ -170,26 +579,106 @@ class PennylaneClient:
                 has_more = False
                 cursor = None
 
-            if not data:
+            if len(data) == 0:
                 break
 
-            all_data.extend(data)
-            print(
-                f"  Page {page}: {len(data)} enregistrements (total: {len(all_data)})"
+            last_page = not has_more and not cursor
+            total += len(data)
+            self.metrics.observe_page(
+                endpoint_label(self.api_base_url + endpoint, self.api_base_url),
+                len(data),
             )
+            print(f"  Page {page}: {len(data)} enregistrements (total: {total})")
+            yield data, None if last_page else cursor
 
-            if not has_more and not cursor:
+            if last_page:
                 break
 
             page += 1
 
-        print(f"[OK] {len(all_data)} enregistrements recuperes\n")
-        return all_data
+        print(f"[OK] {total} enregistrements recuperes\n")
+
+    def iter_records(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> Iterator[Dict]:
+        """Itere enregistrement par enregistrement sur un endpoint pagine"""
+        for page in self.iter_pages(endpoint, params, extra_headers):
+            yield from page
+
+    def iter_dataframes(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+        chunk_rows: int = 10000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Itere sur un endpoint par DataFrames d'au plus `chunk_rows` lignes.
+
+        Seul le chunk courant est garde en memoire sous forme de dicts.
+        """
+        chunk = []
+        for page in self.iter_pages(endpoint, params, extra_headers):
+            chunk.extend(page)
+            while len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk[:chunk_rows])
+                chunk = chunk[chunk_rows:]
+
+        if chunk:
+            yield pd.DataFrame(chunk)
+
+    def iter_arrow_batches(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ):
+        """Itere sur un endpoint page par page, chaque page en RecordBatch Arrow"""
+        for batch, _ in self.iter_cursor_pages(
+            endpoint, params, extra_headers, as_arrow=True
+        ):
+            yield batch
+
+    def fetch_arrow(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ):
+        """
+        Recupere un endpoint complet en colonnes Arrow (gros endpoints ledger).
+
+        Returns:
+            ArrowPages, avec to_arrow() -> pyarrow.Table et to_pandas()
+        """
+        from src.arrow_decoding import ArrowPages
+
+        pages = ArrowPages()
+        for batch in self.iter_arrow_batches(endpoint, params, extra_headers):
+            pages.append(batch)
+        return pages
+
+    def _fetch_all_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """Recupere toutes les pages d'un endpoint (pagination cursor-based API v2)"""
+        return list(self.iter_records(endpoint, params, extra_headers))
 
     # ========================================================================
     # CHANGELOG & BATCH FETCH (sync incrementale)
     # ========================================================================
 
+    def iter_changelog(self, resource: str, start_date: str) -> Iterator[List[Dict]]:
+        """Itere sur les pages du changelog d'une ressource depuis une date"""
+        params = {"start_date": start_date}
+        yield from self.iter_pages(f"/changelogs/{resource}", params)
+
     def get_changelog(self, resource: str, start_date: str) -> List[Dict]:
         """
         Recupere le changelog d'une ressource depuis une date donnee.
@@ -201,36 +690,13 @@ class PennylaneClient:
         Returns:
             Liste des changements [{id, operation, timestamp}, ...]
         """
-        all_changes = []
-        params = {"start_date": start_date, "per_page": 100}
-        cursor = None
-        page = 1
-
         print(f"[CHANGELOG] Lecture changelog {resource} depuis {start_date}...")
 
-        while True:
-            if cursor:
-                params["cursor"] = cursor
-
-            response = self._make_request(f"/changelogs/{resource}", params)
-
-            if isinstance(response, dict) and "items" in response:
-                changes = response["items"]
-                has_more = response.get("has_more", False)
-                cursor = response.get("next_cursor")
-            else:
-                changes = response if isinstance(response, list) else []
-                has_more = False
-                cursor = None
-
-            if not changes:
-                break
-
-            all_changes.extend(changes)
-            page += 1
-
-            if not has_more and not cursor:
-                break
+        all_changes = [
+            change
+            for page in self.iter_changelog(resource, start_date)
+            for change in page
+        ]
 
         print(f"[CHANGELOG] {len(all_changes)} changements trouves pour {resource}")
         return all_changes
@@ -241,159 +707,163 @@ class PennylaneClient:
         ids: List[int],
         batch_size: int = 100,
         extra_headers: Optional[Dict] = None,
+        max_workers: Optional[int] = None,
     ) -> List[Dict]:
         """
         Recupere des enregistrements par batch via filtre ID.
 
+        Les batchs partent en parallele (threads) dans la limite du rate
+        limiter partage. Les IDs demandes mais absents de la reponse
+        (supprimes entre-temps, hors scope du token...) sont exposes dans
+        `self.last_missing_ids`.
+
         Args:
             endpoint: Endpoint API (ex: '/customers')
             ids: Liste d'IDs a recuperer
             batch_size: Taille des batchs (max 100)
             extra_headers: Headers supplementaires
+            max_workers: Batchs en vol simultanes (defaut: max_concurrency)
 
         Returns:
-            Liste des enregistrements complets
+            Liste des enregistrements complets, dans l'ordre des IDs demandes
         """
+        self.last_missing_ids = []
         if not ids:
             return []
 
-        all_records = []
         batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        workers = min(max_workers or self.max_concurrency, len(batches))
 
         print(
-            f"[BATCH] Recuperation {len(ids)} enregistrements en {len(batches)} batch(s)..."
+            f"[BATCH] Recuperation {len(ids)} enregistrements en {len(batches)} batch(s) "
+            f"({workers} en parallele)..."
         )
 
-        for i, batch_ids in enumerate(batches, 1):
-            filter_param = [{"field": "id", "operator": "in", "value": batch_ids}]
-            params = {
-                "filter": str(filter_param).replace("'", '"'),
-                "per_page": batch_size,
-            }
-            records = self._fetch_all_pages(endpoint, params, extra_headers)
-            all_records.extend(records)
+        def fetch_batch(batch_ids):
+            params = build_id_filter_params(batch_ids, batch_size)
+            return self._fetch_all_pages(endpoint, params, extra_headers)
+
+        if workers <= 1:
+            results = [fetch_batch(batch_ids) for batch_ids in batches]
+        else:
+            # Contexte copie : les appels des workers restent attribues a la
+            # table en cours de sync (src.run_history)
+            contexts = [contextvars.copy_context() for _ in batches]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda ctx, batch: ctx.run(fetch_batch, batch),
+                        contexts,
+                        batches,
+                    )
+                )
+
+        for i, records in enumerate(results, 1):
             print(f"  Batch {i}/{len(batches)}: {len(records)} enregistrements")
 
+        all_records, missing = order_by_ids(
+            [record for records in results for record in records], ids
+        )
+        self.last_missing_ids = missing
+
         print(f"[BATCH] Total: {len(all_records)} enregistrements recuperes")
+        if missing:
+            print(f"[WARNING] {len(missing)} ID(s) demandes mais non retournes")
         return all_records
 
     # ========================================================================
     # ENDPOINTS EXISTANTS (API REST)
     # ========================================================================
 
-    def get_customers(self, updated_since: Optional[datetime] = None) -> pd.DataFrame:
-        """Recupere la liste des clients"""
+    def _get_dataframe(
+        self,
+        endpoint: str,
+        empty_message: str,
+        updated_since: Optional[datetime] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> pd.DataFrame:
+        """Recupere un endpoint complet en DataFrame, construit chunk par chunk
+
+        Les endpoints de reference (PENNYLANE_MEMO_TTL) sont memoises : un
+        second appel dans le TTL ne coute aucune requete.
+        """
+        if (
+            updated_since is None
+            and self.memo_cache
+            and self.memo_cache.ttl_for(endpoint)
+        ):
+            key = json.dumps([endpoint, sorted((extra_headers or {}).items())])
+            return self.memo_cache.get_or_load(
+                key,
+                endpoint,
+                lambda: self._load_dataframe(
+                    endpoint, empty_message, None, extra_headers
+                ),
+            )
+        return self._load_dataframe(
+            endpoint, empty_message, updated_since, extra_headers
+        )
+
+    def _load_dataframe(
+        self,
+        endpoint: str,
+        empty_message: str,
+        updated_since: Optional[datetime] = None,
+        extra_headers: Optional[Dict] = None,
+    ) -> pd.DataFrame:
         params = {}
         if updated_since:
             params["filter[updated_at]"] = (
                 f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
             )
 
-        data = self._fetch_all_pages("/customers", params)
+        chunks = list(self.iter_dataframes(endpoint, params, extra_headers))
 
-        if not data:
-            print("[INFO] Aucun client trouve")
+        if not chunks:
+            print(f"[INFO] {empty_message}")
             return pd.DataFrame()
 
-        df = pd.DataFrame(data)
+        df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
         print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
         return df
 
+    def get_customers(self, updated_since: Optional[datetime] = None) -> pd.DataFrame:
+        """Recupere la liste des clients"""
+        return self._get_dataframe("/customers", "Aucun client trouve", updated_since)
+
     def get_customer_invoices(
         self, updated_since: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Recupere la liste des factures clients"""
-        params = {}
-        if updated_since:
-            params["filter[updated_at]"] = (
-                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
-            )
-
-        data = self._fetch_all_pages("/customer_invoices", params)
-
-        if not data:
-            print("[INFO] Aucune facture client trouvee")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe(
+            "/customer_invoices", "Aucune facture client trouvee", updated_since
+        )
 
     def get_suppliers(self, updated_since: Optional[datetime] = None) -> pd.DataFrame:
         """Recupere la liste des fournisseurs"""
-        params = {}
-        if updated_since:
-            params["filter[updated_at]"] = (
-                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
-            )
-
-        data = self._fetch_all_pages("/suppliers", params)
-
-        if not data:
-            print("[INFO] Aucun fournisseur trouve")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe(
+            "/suppliers", "Aucun fournisseur trouve", updated_since
+        )
 
     def get_supplier_invoices(
         self, updated_since: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Recupere la liste des factures fournisseurs"""
-        params = {}
-        if updated_since:
-            params["filter[updated_at]"] = (
-                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
-            )
-
-        data = self._fetch_all_pages("/supplier_invoices", params)
-
-        if not data:
-            print("[INFO] Aucune facture fournisseur trouvee")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe(
+            "/supplier_invoices", "Aucune facture fournisseur trouvee", updated_since
+        )
 
     def get_transactions(
         self, updated_since: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Recupere la liste des transactions bancaires"""
-        params = {}
-        if updated_since:
-            params["filter[updated_at]"] = (
-                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
-            )
-
-        data = self._fetch_all_pages("/transactions", params)
-
-        if not data:
-            print("[INFO] Aucune transaction trouvee")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe(
+            "/transactions", "Aucune transaction trouvee", updated_since
+        )
 
     def get_products(self, updated_since: Optional[datetime] = None) -> pd.DataFrame:
         """Recupere la liste des produits/services"""
-        params = {}
-        if updated_since:
-            params["filter[updated_at]"] = (
-                f"gte:{updated_since.strftime('%Y-%m-%dT%H:%M:%S')}"
-            )
-
-        data = self._fetch_all_pages("/products", params)
-
-        if not data:
-            print("[INFO] Aucun produit trouve")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe("/products", "Aucun produit trouve", updated_since)
 
     # ========================================================================
     # NOUVEAUX ENDPOINTS (anciennement Redshift)
@@ -401,84 +871,49 @@ class PennylaneClient:
 
     def get_ledger_entries(self) -> pd.DataFrame:
         """Recupere les ecritures comptables (grand livre general) via API v2"""
-        data = self._fetch_all_pages(
-            "/ledger_entries", extra_headers={"X-Use-2026-API-Changes": "true"}
+        return self._get_dataframe(
+            "/ledger_entries",
+            "Aucune ecriture comptable trouvee",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
         )
 
-        if not data:
-            print("[INFO] Aucune ecriture comptable trouvee")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
-
     def get_ledger_accounts(self) -> pd.DataFrame:
         """Recupere le plan comptable via API v2"""
-        data = self._fetch_all_pages(
-            "/ledger_accounts", extra_headers={"X-Use-2026-API-Changes": "true"}
+        return self._get_dataframe(
+            "/ledger_accounts",
+            "Aucun compte comptable trouve",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
         )
 
-        if not data:
-            print("[INFO] Aucun compte comptable trouve")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
-
     def get_bank_accounts(self) -> pd.DataFrame:
         """Recupere les comptes bancaires via API v2"""
-        data = self._fetch_all_pages("/bank_accounts")
-
-        if not data:
-            print("[INFO] Aucun compte bancaire trouve")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
+        return self._get_dataframe("/bank_accounts", "Aucun compte bancaire trouve")
 
     def get_fiscal_years(self) -> pd.DataFrame:
         """Recupere les exercices fiscaux via API v2"""
-        data = self._fetch_all_pages(
-            "/fiscal_years", extra_headers={"X-Use-2026-API-Changes": "true"}
+        return self._get_dataframe(
+            "/fiscal_years",
+            "Aucun exercice fiscal trouve",
+            extra_headers={"X-Use-2026-API-Changes": "true"},
         )
 
-        if not data:
-            print("[INFO] Aucun exercice fiscal trouve")
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        print(f"[INFO] DataFrame cree: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
-
     # ========================================================================
     # EXPORTS (FEC, Grand Livre Analytique)
     # ========================================================================
 
-    def export_fec(self, fiscal_year_id: Optional[int] = None) -> Dict:
-        """
-        Lance un export FEC. Retourne l'URL de telechargement.
-
-        Workflow : POST pour lancer → polling statut → URL de telechargement
-        """
+    def start_export_fec(self, fiscal_year_id: Optional[int] = None) -> Dict:
+        """Lance un export FEC (POST seul, sans attendre). Voir ExportManager"""
         body = {}
         if fiscal_year_id:
             body["fiscal_year_id"] = fiscal_year_id
 
         print("[EXPORT] Lancement export FEC...")
-        response = self._make_post_request("/exports/fec", body)
-        return self._poll_export(response)
+        return self._make_post_request("/exports/fec", body)
 
-    def export_analytical_ledger(
+    def start_export_analytical_ledger(
         self, start_date: Optional[str] = None, end_date: Optional[str] = None
     ) -> Dict:
-        """
-        Lance un export Grand Livre Analytique. Retourne l'URL de telechargement.
-
-        Workflow : POST pour lancer → polling statut → URL de telechargement
-        """
+        """Lance un export Grand Livre Analytique (POST seul, sans attendre)"""
         body = {}
         if start_date:
             body["start_date"] = start_date
@@ -486,13 +921,35 @@ class PennylaneClient:
             body["end_date"] = end_date
 
         print("[EXPORT] Lancement export Grand Livre Analytique...")
-        response = self._make_post_request("/exports/analytical_general_ledger", body)
-        return self._poll_export(response)
+        return self._make_post_request("/exports/analytical_general_ledger", body)
+
+    def export_fec(self, fiscal_year_id: Optional[int] = None) -> Dict:
+        """
+        Lance un export FEC. Retourne l'URL de telechargement.
+
+        Workflow : POST pour lancer → polling statut → URL de telechargement
+        """
+        return self._poll_export(self.start_export_fec(fiscal_year_id))
+
+    def export_analytical_ledger(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Dict:
+        """
+        Lance un export Grand Livre Analytique. Retourne l'URL de telechargement.
+
+        Workflow : POST pour lancer → polling statut → URL de telechargement
+        """
+        return self._poll_export(
+            self.start_export_analytical_ledger(start_date, end_date)
+        )
 
     def _poll_export(self, initial_response: Dict, max_wait: int = 300) -> Dict:
         """
         Polling sur un export asynchrone jusqu'a completion.
 
+        L'intervalle entre deux controles part de ~1s et croit jusqu'a un
+        plafond (PollBackoff). Pour plusieurs exports, voir ExportManager.
+
         Args:
             initial_response: Reponse du POST initial (contient id/status/url)
             max_wait: Temps max d'attente en secondes
@@ -501,12 +958,9 @@ class PennylaneClient:
             Reponse finale avec URL de telechargement
         """
         export_id = initial_response.get("id")
-        status = initial_response.get("status", "")
-        download_url = initial_response.get("download_url") or initial_response.get(
-            "url"
-        )
+        state, _ = export_state(initial_response)
 
-        if download_url and status in ("completed", "done", ""):
+        if state == "ready":
             print(f"[EXPORT] Export pret immediatement")
             return initial_response
 
@@ -516,46 +970,228 @@ class PennylaneClient:
 
         print(f"[EXPORT] Export {export_id} en cours, polling...")
         start = time.time()
+        backoff = PollBackoff()
 
         while time.time() - start < max_wait:
-            time.sleep(5)
+            time.sleep(
+                min(backoff.next_delay(), max(max_wait - (time.time() - start), 0))
+            )
             try:
                 response = self._make_request(f"/exports/{export_id}")
-                status = response.get("status", "")
-                download_url = response.get("download_url") or response.get("url")
-
-                if status in ("completed", "done") or download_url:
-                    print(f"[EXPORT] Export {export_id} termine")
-                    return response
-                elif status in ("failed", "error"):
-                    raise Exception(f"Export {export_id} echoue: {response}")
-
-                print(f"  Status: {status}...")
             except Exception as e:
-                if "echoue" in str(e):
-                    raise
                 print(f"  Polling erreur (retry): {e}")
+                continue
+
+            state, _ = export_state(response)
+            if state == "ready":
+                print(
+                    f"[EXPORT] Export {export_id} termine en {time.time() - start:.1f}s"
+                )
+                return response
+            if state == "failed":
+                raise Exception(f"Export {export_id} echoue: {response}")
+            print(f"  Status: {response.get('status', '')}...")
 
         raise Exception(f"Export {export_id} timeout apres {max_wait}s")
 
-    def download_export(self, url: str) -> pd.DataFrame:
-        """Telecharge un fichier d'export et le charge en DataFrame"""
-        print(f"[DOWNLOAD] Telechargement export...")
-        self._wait_for_rate_limit()
+    def download_export_to_file(
+        self,
+        url: str,
+        dest_path: Optional[str] = None,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        max_resumes: int = 5,
+        chunk_size: int = 1024 * 1024,
+    ) -> Dict:
+        """
+        Telecharge un export sur disque en streaming, avec reprise.
+
+        Le fichier est ecrit par blocs de `chunk_size` (memoire constante). Si
+        le transfert est coupe, il reprend la ou il s'est arrete via une
+        requete HTTP Range. Taille (Content-Length / Content-Range) et
+        checksums (sha256 attendu, Content-MD5, Digest) sont verifies a la fin.
+        En cas d'echec, le fichier temporaire cree ici (sans `dest_path`) est
+        supprime.
+
+        Returns:
+            {path, size, sha256, content_type}
+        """
+        created = dest_path is None
+        if created:
+            fd, dest_path = tempfile.mkstemp(
+                prefix="pennylane_export_", dir=os.getenv("PENNYLANE_EXPORT_DIR")
+            )
+            os.close(fd)
+
+        try:
+            return self._stream_download(
+                url, dest_path, expected_size, expected_sha256, max_resumes, chunk_size
+            )
+        except BaseException:
+            # Fichier partiel (parfois des centaines de Mo) : pas de residu
+            # dans PENNYLANE_EXPORT_DIR a chaque export en echec
+            if created and os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+
+    def _stream_download(
+        self,
+        url: str,
+        dest_path: str,
+        expected_size: Optional[int],
+        expected_sha256: Optional[str],
+        max_resumes: int,
+        chunk_size: int,
+    ) -> Dict:
+        """Boucle de telechargement / reprise de download_export_to_file"""
+        downloaded = 0
+        total_size = expected_size
+        content_type = ""
+        validators = {}
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        resumes = 0
+
+        with open(dest_path, "wb") as f:
+            while True:
+                # Pas de compression : les offsets Range portent sur les octets du fichier
+                headers = {**self.headers, "Accept-Encoding": "identity"}
+                if downloaded:
+                    headers["Range"] = f"bytes={downloaded}-"
+                    if validators.get("ETag"):
+                        headers["If-Range"] = validators["ETag"]
+
+                response = self._send(
+                    "GET",
+                    url,
+                    (self.connect_timeout, self.export_timeout),
+                    headers=headers,
+                    stream=True,
+                )
 
-        response = requests.get(url, headers=self.headers, timeout=120)
-        if response.status_code != 200:
-            raise Exception(f"Erreur telechargement: {response.status_code}")
+                if response.status_code == 416 and total_size == downloaded:
+                    response.close()
+                    break
+                if response.status_code not in (200, 206):
+                    response.close()
+                    raise Exception(f"Erreur telechargement: {response.status_code}")
+
+                if response.status_code == 200:
+                    # Premiere requete, ou Range ignore par le serveur : on repart de 0
+                    if downloaded:
+                        print("[DOWNLOAD] Reprise refusee par le serveur, redemarrage")
+                    f.seek(0)
+                    f.truncate()
+                    downloaded = 0
+                    sha256 = hashlib.sha256()
+                    md5 = hashlib.md5()
+                    content_type = response.headers.get("Content-Type", "")
+                    validators = {
+                        name: response.headers[name]
+                        for name in ("ETag", "Content-MD5", "Digest")
+                        if name in response.headers
+                    }
+                    length = response.headers.get("Content-Length")
+                    if length is not None:
+                        total_size = int(length)
+                else:
+                    content_range = response.headers.get("Content-Range", "")
+                    if "/" in content_range and not content_range.endswith("/*"):
+                        total_size = int(content_range.rsplit("/", 1)[1])
+
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        md5.update(chunk)
+                        downloaded += len(chunk)
+                        self.metrics.observe_bytes("download", len(chunk))
+                except (
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                ) as e:
+                    resumes += 1
+                    if resumes > max_resumes:
+                        raise Exception(
+                            f"Telechargement interrompu {resumes} fois: {e}"
+                        ) from e
+                    print(
+                        f"[DOWNLOAD] Transfert interrompu a {downloaded} octets, "
+                        f"reprise ({resumes}/{max_resumes})..."
+                    )
+                    continue
+                finally:
+                    response.close()
+
+                if total_size is None or downloaded >= total_size:
+                    break
+
+                # Connexion fermee proprement mais fichier incomplet
+                resumes += 1
+                if resumes > max_resumes:
+                    raise Exception(
+                        f"Telechargement incomplet: {downloaded}/{total_size} octets"
+                    )
+
+        self._verify_download(
+            downloaded, total_size, sha256, md5, validators, expected_sha256
+        )
 
-        content_type = response.headers.get("Content-Type", "")
+        print(f"[DOWNLOAD] {downloaded} octets ecrits dans {dest_path}")
+        return {
+            "path": dest_path,
+            "size": downloaded,
+            "sha256": sha256.hexdigest(),
+            "content_type": content_type,
+        }
 
-        if "csv" in content_type or url.endswith(".csv"):
-            import io
+    @staticmethod
+    def _verify_download(
+        downloaded: int,
+        total_size: Optional[int],
+        sha256,
+        md5,
+        validators: Dict,
+        expected_sha256: Optional[str] = None,
+    ):
+        """Verifie taille et checksums d'un export telecharge"""
+        if total_size is not None and downloaded != total_size:
+            raise Exception(
+                f"Taille export invalide: {downloaded} octets recus, {total_size} attendus"
+            )
+        if expected_sha256 and sha256.hexdigest() != expected_sha256.lower():
+            raise Exception("Checksum sha256 de l'export invalide")
 
-            df = pd.read_csv(io.StringIO(response.text), sep=";")
-        else:
-            df = pd.read_csv(pd.io.common.StringIO(response.text), sep="\t")
+        content_md5 = validators.get("Content-MD5")
+        if content_md5 and base64.b64encode(md5.digest()).decode() != content_md5:
+            raise Exception("Checksum Content-MD5 de l'export invalide")
 
+        for digest in validators.get("Digest", "").split(","):
+            algo, _, value = digest.strip().partition("=")
+            if algo.lower() == "sha-256" and value:
+                if base64.b64encode(sha256.digest()).decode() != value:
+                    raise Exception("Checksum Digest sha-256 de l'export invalide")
+
+    def download_export(self, url: str) -> pd.DataFrame:
+        """
+        Telecharge un fichier d'export (streaming disque) et le charge en DataFrame.
+
+        Le parsing est multithread et type (schema FEC : montants decimaux,
+        dates) via src.export_parsing.
+        """
+        print(f"[DOWNLOAD] Telechargement export...")
+
+        download = self.download_export_to_file(url)
+        try:
+            table = parse_export_file(download["path"])
+            print(f"[DOWNLOAD] {export_file_summary(download['path'], table)}")
+        finally:
+            os.remove(download["path"])
+
+        df = export_table_to_pandas(table)
         print(f"[DOWNLOAD] {len(df)} lignes chargees")
         return df
 
@@ -588,6 +1224,62 @@ class PennylaneClient:
         """Acces direct a _fetch_all_pages pour usage dans incremental_sync"""
         return self._fetch_all_pages(endpoint, extra_headers=extra_headers)
 
+    def fetch_many(
+        self,
+        endpoints: Dict[str, Optional[Dict]],
+        as_dataframe: bool = False,
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+        as_arrow: bool = False,
+    ) -> Dict:
+        """
+        Recupere plusieurs endpoints en parallele sous le meme rate limit.
+
+        La pagination de chaque endpoint reste sequentielle (cursor) mais les
+        endpoints avancent en meme temps : la duree totale est bornee par le
+        plus gros endpoint plutot que par la somme.
+
+        Args:
+            endpoints: {endpoint: extra_headers ou None}
+                ex: {'/customers': None, '/fiscal_years': {'X-Use-2026-API-Changes': 'true'}}
+            as_dataframe: Retourne des DataFrames plutot que des listes de dicts
+            max_workers: Endpoints en vol simultanes (defaut: max_concurrency)
+            return_exceptions: Place l'exception dans le resultat au lieu de
+                la lever (les autres endpoints sont conserves)
+            as_arrow: Decode les pages en Arrow (resultats ArrowPages)
+
+        Returns:
+            {endpoint: liste d'enregistrements, DataFrame ou ArrowPages}
+        """
+        if not endpoints:
+            return {}
+
+        workers = min(max_workers or self.max_concurrency, len(endpoints))
+        print(f"[MULTI] {len(endpoints)} endpoints ({workers} en parallele)...")
+
+        fetch = self.fetch_arrow if as_arrow else self._fetch_all_pages
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                endpoint: executor.submit(fetch, endpoint, None, extra_headers)
+                for endpoint, extra_headers in endpoints.items()
+            }
+            for endpoint, future in futures.items():
+                try:
+                    data = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[endpoint] = e
+                    continue
+                if as_arrow:
+                    results[endpoint] = data.to_pandas() if as_dataframe else data
+                else:
+                    results[endpoint] = pd.DataFrame(data) if as_dataframe else data
+
+        return results
+
 
 if __name__ == "__main__":
     print("=" * 70)
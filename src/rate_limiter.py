@@ -0,0 +1,346 @@
+"""
+Rate limiters partages pour l'API Pennylane
+
+Token bucket thread-safe (un process) ou adosse a un fichier verrouille
+(plusieurs process sur la meme machine : scheduler + notebooks).
+
+Usage:
+    from src.rate_limiter import TokenBucketRateLimiter, FileTokenBucketRateLimiter
+
+    limiter = FileTokenBucketRateLimiter(rate=4.5, path="logs/.pennylane_rate")
+    client = PennylaneClient(rate_limiter=limiter)
+
+AdaptiveRateLimiter ajuste en plus son debit a partir des headers de quota
+renvoyes par le serveur (AIMD : hausse additive tant que la fenetre a de la
+marge, baisse multiplicative quand le quota s'epuise ou sur 429).
+
+Chaque appel a acquire() reserve un jeton. Si le seau est vide, le jeton est
+pris "a credit" et l'appelant dort jusqu'a son creneau, hors verrou : les
+autres appelants reservent les creneaux suivants sans attendre.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TokenBucketRateLimiter:
+    """Token bucket thread-safe partage par les threads d'un process"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError("Le rate limit doit etre > 0")
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated_at = time.time()
+
+    def _reserve(self, tokens: float, updated_at: float, now: float, cost: float):
+        """Reserve `cost` jetons, retourne (jetons restants, attente en s)"""
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        tokens -= cost
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, wait
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Bloque jusqu'a disposer d'un jeton. Retourne le temps dormi (s)"""
+        with self._lock:
+            now = time.time()
+            self._tokens, wait = self._reserve(
+                self._tokens, self._updated_at, now, cost
+            )
+            self._updated_at = now
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def block_for(self, seconds: float):
+        """Suspend tous les appelants (ex: Retry-After recu sur un 429)"""
+        with self._lock:
+            now = time.time()
+            tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._tokens = min(tokens, 0.0) - seconds * self.rate
+            self._updated_at = now
+
+    def update_from_headers(self, headers, status_code: Optional[int] = None):
+        """Retour du serveur apres chaque reponse (ignore par le limiter fixe)"""
+
+
+class FileTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """Token bucket dont l'etat vit dans un fichier verrouille (multi-process)"""
+
+    def __init__(self, rate: float, path: str, burst: float = 1.0):
+        super().__init__(rate, burst)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def _locked_state(self):
+        """Verrou exclusif sur le fichier d'etat, lecture puis ecriture"""
+        with self._lock, open(self.path, "a+") as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                state.setdefault("tokens", self.burst)
+                state.setdefault("updated_at", time.time())
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Bloque jusqu'a disposer d'un jeton. Retourne le temps dormi (s)"""
+        with self._locked_state() as state:
+            now = time.time()
+            state["tokens"], wait = self._reserve(
+                state["tokens"], state["updated_at"], now, cost
+            )
+            state["updated_at"] = now
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def block_for(self, seconds: float):
+        """Suspend tous les appelants, tous process confondus"""
+        with self._locked_state() as state:
+            now = time.time()
+            tokens = min(
+                self.burst,
+                state["tokens"] + (now - state["updated_at"]) * self.rate,
+            )
+            state["tokens"] = min(tokens, 0.0) - seconds * self.rate
+            state["updated_at"] = now
+
+
+def parse_rate_limit_headers(headers) -> Dict[str, Optional[float]]:
+    """
+    Extrait limit/remaining/reset des headers de quota.
+
+    Gere les variantes `ratelimit-*` (draft IETF) et `x-ratelimit-*`. Un reset
+    exprime en timestamp epoch est converti en secondes restantes.
+    """
+    values = {}
+    for name in ("limit", "remaining", "reset"):
+        raw = None
+        for prefix in ("ratelimit-", "x-ratelimit-"):
+            raw = headers.get(prefix + name)
+            if raw is not None:
+                break
+        try:
+            values[name] = float(raw) if raw is not None else None
+        except ValueError:
+            values[name] = None
+
+    reset = values["reset"]
+    if reset is not None and reset > 1e9:
+        values["reset"] = max(reset - time.time(), 0.0)
+    return values
+
+
+class AdaptiveRateLimitMixin:
+    """
+    Ajustement AIMD du debit et de la rafale a partir des headers serveur.
+
+    - marge >= high_watermark : debit += increase_step (plafonne a max_rate),
+      rafale autorisee jusqu'a max_burst
+    - marge <= low_watermark ou 429 : debit *= decrease_factor, rafale = 1
+    - le debit ne depasse jamais remaining / reset (quota etale sur la fenetre)
+    """
+
+    def _init_adaptive(
+        self,
+        max_burst: float,
+        min_rate: float,
+        increase_step: float,
+        decrease_factor: float,
+        low_watermark: float,
+        high_watermark: float,
+    ):
+        self.max_rate = self.rate
+        self.min_rate = min(min_rate, self.rate)
+        self.max_burst = max(max_burst, 1.0)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+
+    def update_from_headers(self, headers, status_code: Optional[int] = None):
+        """Adapte debit et rafale selon le quota restant annonce par le serveur"""
+        quota = parse_rate_limit_headers(headers)
+        limit, remaining, reset = quota["limit"], quota["remaining"], quota["reset"]
+
+        with self._lock:
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.burst = 1.0
+                return
+
+            if remaining is None:
+                return
+
+            ratio = remaining / limit if limit else 1.0
+
+            if ratio <= self.low_watermark:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.burst = 1.0
+            elif ratio >= self.high_watermark:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                self.burst = min(self.max_burst, max(remaining, 1.0))
+
+            if reset and reset > 0:
+                self.rate = max(self.min_rate, min(self.rate, remaining / reset))
+
+
+class AdaptiveRateLimiter(AdaptiveRateLimitMixin, TokenBucketRateLimiter):
+    """Token bucket thread-safe pilote par les headers de quota"""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        max_burst: float = 5.0,
+        min_rate: float = 0.2,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        low_watermark: float = 0.1,
+        high_watermark: float = 0.5,
+    ):
+        super().__init__(rate, burst)
+        self._init_adaptive(
+            max_burst,
+            min_rate,
+            increase_step,
+            decrease_factor,
+            low_watermark,
+            high_watermark,
+        )
+
+
+class AdaptiveFileRateLimiter(AdaptiveRateLimitMixin, FileTokenBucketRateLimiter):
+    """Token bucket multi-process pilote par les headers de quota
+
+    Les jetons sont partages via le fichier ; chaque process adapte son
+    propre debit a partir des headers, qui refletent le quota global du token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        path: str,
+        burst: float = 1.0,
+        max_burst: float = 5.0,
+        min_rate: float = 0.2,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        low_watermark: float = 0.1,
+        high_watermark: float = 0.5,
+    ):
+        super().__init__(rate, path, burst)
+        self._init_adaptive(
+            max_burst,
+            min_rate,
+            increase_step,
+            decrease_factor,
+            low_watermark,
+            high_watermark,
+        )
+
+
+# Limiters partages par cle (ex: un par token API) dans le process courant,
+# avec les parametres de creation de chacun
+_SHARED_LIMITERS: Dict[str, TokenBucketRateLimiter] = {}
+_SHARED_CONFIGS: Dict[str, Dict] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    key: str,
+    rate: float,
+    burst: float = 1.0,
+    path: Optional[str] = None,
+    adaptive: bool = False,
+    max_burst: float = 5.0,
+) -> TokenBucketRateLimiter:
+    """
+    Retourne le limiter partage associe a `key`, cree au premier appel.
+
+    Le quota est celui de la cle (token API) : un appel ulterieur avec
+    d'autres parametres recoit le meme limiter, configure par le premier
+    appel, et un avertissement indique les parametres ignores.
+
+    Args:
+        key: Cle de partage (ex: empreinte du token API)
+        rate: Requetes/seconde autorisees
+        burst: Taille du seau (rafale max)
+        path: Fichier d'etat pour un partage entre process (optionnel)
+        adaptive: Ajuste le debit selon les headers de quota du serveur
+        max_burst: Rafale max autorisee quand la fenetre a de la marge
+    """
+    config = {
+        "rate": rate,
+        "burst": burst,
+        "path": path,
+        "adaptive": adaptive,
+        "max_burst": max_burst,
+    }
+    with _SHARED_LOCK:
+        limiter = _SHARED_LIMITERS.get(key)
+        if limiter is not None:
+            existing = _SHARED_CONFIGS[key]
+            ignored = {
+                name: value for name, value in config.items() if existing[name] != value
+            }
+            if ignored:
+                kept = ", ".join(f"{name}={existing[name]}" for name in ignored)
+                asked = ", ".join(f"{name}={value}" for name, value in ignored.items())
+                print(
+                    f"[WARNING] Rate limiter partage deja cree ({kept}) : "
+                    f"parametres ignores ({asked})"
+                )
+        else:
+            if path and adaptive:
+                limiter = AdaptiveFileRateLimiter(
+                    rate, path, burst, max_burst=max_burst
+                )
+            elif path:
+                limiter = FileTokenBucketRateLimiter(rate, path, burst)
+            elif adaptive:
+                limiter = AdaptiveRateLimiter(rate, burst, max_burst=max_burst)
+            else:
+                limiter = TokenBucketRateLimiter(rate, burst)
+            _SHARED_LIMITERS[key] = limiter
+            _SHARED_CONFIGS[key] = config
+        return limiter
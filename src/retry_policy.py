@@ -0,0 +1,211 @@
+"""
+Politique de retry et circuit breaker pour l'API Pennylane
+
+Seule la requete en echec est rejouee (boucle, pas de recursion) : une page
+en timeout ne fait pas perdre les pages deja recuperees.
+
+Les requetes non idempotentes (POST /exports/...) ne sont rejouees que si le
+serveur ne les a pas traitees : 429, ou connexion impossible avant l'envoi.
+Un timeout de lecture ou une 5xx peut signifier que l'export a ete cree ;
+le rejouer en lancerait un second.
+
+Usage:
+    from src.retry_policy import RetryPolicy, CircuitBreaker
+
+    client = PennylaneClient(
+        retry_policy=RetryPolicy(max_attempts=6, max_delay=30),
+        circuit_breaker=CircuitBreaker(failure_threshold=5, reset_timeout=60),
+    )
+"""
+
+import time
+import random
+import threading
+import requests
+from typing import Dict, Optional
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# Regles par defaut par code HTTP : nombre max de tentatives, et pour 429
+# respect du header Retry-After
+DEFAULT_STATUS_RULES = {
+    429: {"max_attempts": 8, "respect_retry_after": True},
+    500: {"max_attempts": 4},
+    502: {"max_attempts": 5},
+    503: {"max_attempts": 5, "respect_retry_after": True},
+    504: {"max_attempts": 5},
+}
+
+# Methodes rejouables sans risque de double effet cote serveur
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def request_not_sent(exc: Exception) -> bool:
+    """True si l'erreur reseau est survenue avant l'envoi de la requete"""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.exceptions.ConnectionError):
+        return False
+    # requests enveloppe l'erreur urllib3 (MaxRetryError.reason)
+    reason = exc.args[0] if exc.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class CircuitOpenError(Exception):
+    """Le circuit breaker est ouvert : l'API est consideree indisponible"""
+
+
+class RetryPolicy:
+    """Backoff exponentiel plafonne avec jitter, regles par code HTTP"""
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        status_rules: Optional[Dict[int, Dict]] = None,
+        retry_on_timeout: bool = True,
+        retry_on_connection_error: bool = True,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.status_rules = (
+            DEFAULT_STATUS_RULES if status_rules is None else status_rules
+        )
+        self.retry_on_timeout = retry_on_timeout
+        self.retry_on_connection_error = retry_on_connection_error
+
+    def should_retry_status(
+        self, status_code: int, attempt: int, method: str = "GET"
+    ) -> bool:
+        """True si une reponse `status_code` a la tentative `attempt` est rejouee
+
+        Une requete non idempotente n'est rejouee que sur 429 (non traitee).
+        """
+        if method.upper() not in IDEMPOTENT_METHODS and status_code != 429:
+            return False
+        rule = self.status_rules.get(status_code)
+        if rule is None:
+            return False
+        return attempt < rule.get("max_attempts", self.max_attempts)
+
+    def should_retry_exception(
+        self, exc: Exception, attempt: int, method: str = "GET"
+    ) -> bool:
+        """True si l'erreur reseau `exc` a la tentative `attempt` est rejouee
+
+        Une requete non idempotente n'est rejouee que si elle n'a pas ete
+        envoyee (connexion impossible).
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return self.retry_on_connection_error and request_not_sent(exc)
+        if isinstance(exc, requests.exceptions.Timeout):
+            return self.retry_on_timeout
+        if isinstance(exc, requests.exceptions.ConnectionError):
+            return self.retry_on_connection_error
+        return False
+
+    def compute_delay(
+        self,
+        attempt: int,
+        status_code: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ) -> float:
+        """
+        Delai avant la tentative suivante.
+
+        Full jitter sur min(max_delay, base_delay * 2^(attempt-1)). Si la regle
+        du code HTTP le demande, un Retry-After du serveur est respecte
+        (plafonne a max_delay, avec un leger jitter pour desynchroniser les
+        clients).
+        """
+        rule = self.status_rules.get(status_code, {}) if status_code else {}
+        if retry_after and rule.get("respect_retry_after"):
+            try:
+                wait = min(float(retry_after), self.max_delay)
+                return wait + random.uniform(0, min(1.0, wait * 0.1))
+            except ValueError:
+                pass
+
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker thread-safe.
+
+    - closed : requetes normales, les echecs consecutifs sont comptes
+    - open : apres `failure_threshold` echecs, echec immediat pendant
+      `reset_timeout` secondes
+    - half-open : une requete d'essai ; succes -> closed, echec -> open.
+      Les autres requetes attendent son resultat (au plus `reset_timeout`)
+      au lieu d'echouer
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+        self._trial_done = threading.Condition(self._lock)
+
+    def _open_error(self) -> CircuitOpenError:
+        remaining = self.reset_timeout - (time.time() - self.opened_at)
+        return CircuitOpenError(
+            f"API indisponible ({self.failures} echecs consecutifs), "
+            f"nouvel essai dans {max(remaining, 0):.0f}s"
+        )
+
+    def before_request(self):
+        """Leve CircuitOpenError si le circuit est ouvert
+
+        Pendant la requete d'essai, attend son resultat : succes -> la
+        requete part, echec -> CircuitOpenError. Si l'essai ne rend pas de
+        resultat en `reset_timeout` secondes, cette requete le remplace.
+        """
+        with self._lock:
+            while True:
+                if self.state == "closed":
+                    return
+                if self.state == "open":
+                    if time.time() - self.opened_at < self.reset_timeout:
+                        raise self._open_error()
+                    self.state = "half-open"
+                    self._trial_in_flight = False
+                if not self._trial_in_flight:
+                    break
+                remaining = self._trial_started + self.reset_timeout - time.time()
+                if remaining <= 0:
+                    break
+                self._trial_done.wait(remaining)
+            self._trial_in_flight = True
+            self._trial_started = time.time()
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+            self._trial_done.notify_all()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(
+                        f"[WARNING] Circuit ouvert apres {self.failures} echecs, "
+                        f"pause {self.reset_timeout:.0f}s"
+                    )
+                self.state = "open"
+                self.opened_at = time.time()
+            self._trial_done.notify_all()
@@ -0,0 +1,414 @@
+"""
+Historique des runs de sync par table et par phase (pennylane.sync_runs)
+
+sync_state ne garde que le dernier run ; sync_runs conserve une ligne par
+table et par run avec le temps passe dans chaque phase :
+
+    fetch             appels API (attente rate limit comprise)
+    rate_limit_sleep  attente du rate limit client (cumul des threads)
+    flatten           flatten_dataframe
+    serialize         conversions JSON / Arrow / pandas -> lignes SQL
+    load              ecritures PostgreSQL (staging, insert, upsert, delete)
+
+ainsi que le nombre d'appels API, de lignes, de lignes recues mais non
+reecrites (contenu inchange) et la memoire residente (RSS) : pic pendant la
+table et hausse depuis son debut. Le rapport compare le dernier run de
+chaque table a la mediane de ses runs precedents pour reperer les
+ralentissements.
+
+Les phases sont comptees pour la table "courante" (contextvar) : le client API
+et les fonctions de chargement appellent phase() / note_api_call() sans
+connaitre la table.
+
+Usage:
+    python src/incremental_sync.py --report
+    python src/incremental_sync.py --report --report-window 20 --regression-threshold 2
+"""
+
+import os
+import time
+import threading
+import statistics
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import psutil
+except ImportError:  # optionnel : /proc suffit sous Linux
+    psutil = None
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Windows
+    _PAGE_SIZE = 4096
+
+PHASES = ("fetch", "rate_limit_sleep", "flatten", "serialize", "load")
+
+
+class TableRun:
+    """Mesures d'une table pendant un run de sync"""
+
+    def __init__(self, run_id: str, table_name: str, run_mode: str, sync_type: str):
+        self.run_id = run_id
+        self.table_name = table_name
+        self.run_mode = run_mode
+        self.sync_type = sync_type
+        self.started_at = time.time()
+        self.start_rss_mb = current_rss_mb()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.api_calls = 0
+        self.rows = 0
+        self.rows_unchanged = 0
+        self.duration = None
+        self.success = None
+        self.error = None
+        self.peak_rss_mb = self.start_rss_mb
+        self._lock = threading.Lock()
+
+    @property
+    def rss_growth_mb(self) -> Optional[float]:
+        """Hausse du RSS entre le debut de la table et son pic"""
+        if self.peak_rss_mb is None or self.start_rss_mb is None:
+            return None
+        return round(self.peak_rss_mb - self.start_rss_mb, 1)
+
+    def sample_rss(self):
+        """Releve le RSS courant et garde le pic de la table"""
+        rss = current_rss_mb()
+        if rss is None:
+            return
+        with self._lock:
+            if self.peak_rss_mb is None or rss > self.peak_rss_mb:
+                self.peak_rss_mb = rss
+
+    def add(self, phase_name: str, seconds: float):
+        with self._lock:
+            self.phases[phase_name] += seconds
+
+    def add_api_call(self):
+        with self._lock:
+            self.api_calls += 1
+
+    def finish(
+        self,
+        success: bool,
+        duration: Optional[float] = None,
+        error: Optional[str] = None,
+    ):
+        """Cloture la mesure (duree murale par defaut depuis la creation)"""
+        self.success = success
+        self.duration = (
+            duration if duration is not None else time.time() - self.started_at
+        )
+        self.error = error
+        self.sample_rss()
+
+
+_current_run: ContextVar[Optional[TableRun]] = ContextVar(
+    "pennylane_table_run", default=None
+)
+
+
+def current_table_run() -> Optional[TableRun]:
+    return _current_run.get()
+
+
+@contextmanager
+def track_table(table_run: Optional[TableRun]):
+    """Attribue les phases mesurees dans ce bloc a `table_run`"""
+    token = _current_run.set(table_run)
+    try:
+        yield table_run
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Ajoute la duree du bloc a la phase `name` de la table courante
+
+    Le RSS est releve en fin de phase, quand les donnees de la phase
+    (pages, DataFrame, buffer) sont encore en memoire.
+    """
+    table_run = _current_run.get()
+    if table_run is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        table_run.add(name, time.perf_counter() - started)
+        table_run.sample_rss()
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """Itere en comptant dans la phase `name` le temps pris par chaque next()"""
+    iterator = iter(iterable)
+    while True:
+        with phase(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def note_api_call():
+    table_run = _current_run.get()
+    if table_run is not None:
+        table_run.add_api_call()
+
+
+def note_rate_limit_sleep(seconds: float):
+    table_run = _current_run.get()
+    if table_run is not None:
+        table_run.add("rate_limit_sleep", seconds)
+
+
+def note_rows_unchanged(count: int):
+    """Lignes recues identiques a la version stockee (ecriture evitee)"""
+    table_run = _current_run.get()
+    if table_run is not None and count:
+        with table_run._lock:
+            table_run.rows_unchanged += count
+
+
+def note_sync_state(records_synced: int, sync_type: str):
+    """Lignes et type de sync retenus dans sync_state pour la table courante"""
+    table_run = _current_run.get()
+    if table_run is not None:
+        table_run.rows = records_synced
+        table_run.sync_type = sync_type
+
+
+def current_rss_mb() -> Optional[float]:
+    """Memoire residente actuelle du process en Mo (None si indisponible)
+
+    ru_maxrss n'est pas utilise : c'est le pic depuis le lancement du
+    process, qui ne redescend pas d'une table a l'autre. Le process est
+    partage par les tables synchronisees en parallele : leurs pics se
+    recouvrent.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * _PAGE_SIZE / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    return None
+
+
+# ============================================================================
+# STOCKAGE POSTGRESQL
+# ============================================================================
+
+
+def ensure_sync_runs_table(conn):
+    """Cree pennylane.sync_runs si necessaire (sans valider la transaction)"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS pennylane.sync_runs (
+                id BIGSERIAL PRIMARY KEY,
+                run_id VARCHAR(32) NOT NULL,
+                run_mode VARCHAR(20) NOT NULL,
+                table_name VARCHAR(100) NOT NULL,
+                sync_type VARCHAR(20),
+                started_at TIMESTAMP NOT NULL,
+                duration_seconds DOUBLE PRECISION NOT NULL,
+                fetch_seconds DOUBLE PRECISION DEFAULT 0,
+                rate_limit_sleep_seconds DOUBLE PRECISION DEFAULT 0,
+                flatten_seconds DOUBLE PRECISION DEFAULT 0,
+                serialize_seconds DOUBLE PRECISION DEFAULT 0,
+                load_seconds DOUBLE PRECISION DEFAULT 0,
+                api_calls INTEGER DEFAULT 0,
+                rows_synced INTEGER DEFAULT 0,
+                rows_unchanged INTEGER DEFAULT 0,
+                peak_rss_mb DOUBLE PRECISION,
+                rss_growth_mb DOUBLE PRECISION,
+                success BOOLEAN NOT NULL,
+                error TEXT
+            )
+        """)
+        # Historique cree avant le suivi des lignes inchangees
+        cur.execute("""
+            ALTER TABLE pennylane.sync_runs
+            ADD COLUMN IF NOT EXISTS rows_unchanged INTEGER DEFAULT 0
+        """)
+        # Historique cree avant la mesure du RSS par table
+        cur.execute("""
+            ALTER TABLE pennylane.sync_runs
+            ADD COLUMN IF NOT EXISTS rss_growth_mb DOUBLE PRECISION
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS sync_runs_table_started_idx
+            ON pennylane.sync_runs (table_name, started_at DESC)
+        """)
+
+
+def record_table_runs(conn, table_runs: List[TableRun]) -> int:
+    """Ecrit les mesures terminees du run dans pennylane.sync_runs"""
+    rows = [
+        (
+            r.run_id,
+            r.run_mode,
+            r.table_name,
+            r.sync_type,
+            r.started_at,
+            round(r.duration, 3),
+            *(round(r.phases[name], 3) for name in PHASES),
+            r.api_calls,
+            r.rows,
+            r.rows_unchanged,
+            r.peak_rss_mb,
+            r.rss_growth_mb,
+            r.success,
+            r.error,
+        )
+        for r in table_runs
+        if r.success is not None
+    ]
+    if not rows:
+        return 0
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO pennylane.sync_runs (
+                run_id, run_mode, table_name, sync_type, started_at,
+                duration_seconds, fetch_seconds, rate_limit_sleep_seconds,
+                flatten_seconds, serialize_seconds, load_seconds,
+                api_calls, rows_synced, rows_unchanged, peak_rss_mb,
+                rss_growth_mb, success, error
+            )
+            VALUES (%s, %s, %s, %s, to_timestamp(%s)::timestamp,
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+            rows,
+        )
+    conn.commit()
+    return len(rows)
+
+
+# ============================================================================
+# RAPPORT DE REGRESSION
+# ============================================================================
+
+
+def regression_report(
+    conn, window: int = 10, threshold: float = 1.5, min_seconds: float = 1.0
+) -> List[Dict]:
+    """
+    Compare le dernier run reussi de chaque table (par type de sync) a la
+    mediane de ses `window` runs reussis precedents.
+
+    Une table est en regression si sa duree depasse `threshold` x la mediane
+    et la mediane d'au moins `min_seconds` (evite le bruit des tables
+    rapides). Il faut au moins 3 runs precedents pour conclure.
+
+    Returns:
+        Une ligne par table : duree, mediane, ratio, phase la plus en hausse
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT table_name, sync_type, started_at, duration_seconds,
+                   fetch_seconds, rate_limit_sleep_seconds, flatten_seconds,
+                   serialize_seconds, load_seconds, api_calls, rows_synced,
+                   peak_rss_mb, rss_growth_mb
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY table_name, sync_type ORDER BY started_at DESC
+                ) AS rn
+                FROM pennylane.sync_runs
+                WHERE success AND run_mode NOT LIKE '%%-profile'
+            ) ranked
+            WHERE rn <= %s
+            ORDER BY table_name, sync_type, started_at DESC
+        """,
+            (window + 1,),
+        )
+        rows = cur.fetchall()
+
+    history: Dict[tuple, List[tuple]] = {}
+    for row in rows:
+        history.setdefault((row[0], row[1]), []).append(row)
+
+    report = []
+    for (table_name, sync_type), runs in history.items():
+        latest, previous = runs[0], runs[1:]
+        phases = dict(zip(PHASES, latest[4:9]))
+        entry = {
+            "table_name": table_name,
+            "sync_type": sync_type,
+            "started_at": latest[2],
+            "duration": latest[3],
+            "phases": phases,
+            "api_calls": latest[9],
+            "rows": latest[10],
+            "peak_rss_mb": latest[11],
+            "rss_growth_mb": latest[12],
+            "history": len(previous),
+            "median": None,
+            "ratio": None,
+            "worst_phase": None,
+            "regression": False,
+        }
+        if len(previous) >= 3:
+            median = statistics.median(r[3] for r in previous)
+            entry["median"] = median
+            entry["ratio"] = latest[3] / median if median else None
+            entry["regression"] = (
+                latest[3] > threshold * median and latest[3] - median >= min_seconds
+            )
+            # Phase dont la duree a le plus augmente par rapport a sa mediane
+            deltas = {
+                name: phases[name] - statistics.median(r[4 + i] for r in previous)
+                for i, name in enumerate(PHASES)
+            }
+            worst = max(deltas, key=deltas.get)
+            if deltas[worst] > 0:
+                entry["worst_phase"] = worst
+        report.append(entry)
+    return report
+
+
+def print_regression_report(report: List[Dict], window: int, threshold: float):
+    print()
+    print("=" * 117)
+    print(
+        f"Dernier run par table vs mediane des {window} runs precedents "
+        f"(regression si > x{threshold})"
+    )
+    print("-" * 117)
+    print(
+        f"{'Table':<22}{'Type':<13}{'Duree':>8}{'Mediane':>9}{'Ratio':>7}"
+        f"{'Fetch':>8}{'Sleep':>7}{'Flat.':>7}{'Ser.':>7}{'Load':>7}"
+        f"{'Appels':>8}{'Lignes':>9}{'RSS Mo':>8}{'+Mo':>7}"
+    )
+    print("-" * 117)
+    for e in report:
+        p = e["phases"]
+        median = f"{e['median']:.1f}" if e["median"] is not None else "-"
+        ratio = f"x{e['ratio']:.1f}" if e["ratio"] is not None else "-"
+        rss = f"{e['peak_rss_mb']:.0f}" if e["peak_rss_mb"] is not None else "-"
+        growth = f"{e['rss_growth_mb']:.0f}" if e["rss_growth_mb"] is not None else "-"
+        print(
+            f"{e['table_name']:<22}{e['sync_type'] or '-':<13}{e['duration']:>8.1f}"
+            f"{median:>9}{ratio:>7}{p['fetch']:>8.1f}{p['rate_limit_sleep']:>7.1f}"
+            f"{p['flatten']:>7.1f}{p['serialize']:>7.1f}{p['load']:>7.1f}"
+            f"{e['api_calls']:>8}{e['rows']:>9}{rss:>8}{growth:>7}"
+        )
+    print("=" * 117)
+
+    regressions = [e for e in report if e["regression"]]
+    for e in regressions:
+        cause = f", phase en hausse : {e['worst_phase']}" if e["worst_phase"] else ""
+        print(
+            f"[REGRESSION] {e['table_name']} ({e['sync_type']}): "
+            f"{e['duration']:.1f}s vs mediane {e['median']:.1f}s{cause}"
+        )
+    if not regressions:
+        print("Aucune regression detectee")
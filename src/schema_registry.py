@@ -0,0 +1,134 @@
+"""
+Registre des colonnes des tables PostgreSQL synchronisees
+
+La sync incrementale construit ses colonnes a partir des champs renvoyes par
+l'API. Quand Pennylane ajoute un champ, la colonne est ajoutee a la table live
+(ALTER TABLE ... ADD COLUMN, sans reecriture de la table) au lieu de faire
+echouer l'upsert et d'imposer un rechargement complet.
+
+Les colonnes de chaque table sont lues une fois dans le catalogue puis gardees
+en memoire pour le process ; une table rechargee par full replace (nouveau
+schema) est oubliee et relue au prochain appel.
+
+Usage:
+    registry = SchemaRegistry("pennylane")
+    registry.columns(conn, "customers")          # catalogue, puis memoire
+    registry.add_columns(conn, "customers", {"iban": "TEXT"})
+    registry.forget("customers")
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional
+
+import psycopg2
+
+
+class SchemaRegistry:
+    """Colonnes {nom: type} par table, en cache, et ajout de colonnes"""
+
+    def __init__(
+        self, schema: str = "pennylane", lock_timeout: str = "5s", attempts: int = 5
+    ):
+        """
+        Args:
+            schema: Schema PostgreSQL des tables
+            lock_timeout: Attente max du verrou de la table pour ALTER TABLE
+            attempts: Nombre d'essais si la table est occupee
+        """
+        self.schema = schema
+        self.lock_timeout = lock_timeout
+        self.attempts = attempts
+        self.stats = {"lookups": 0, "hits": 0, "columns_added": 0}
+        self._columns: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def columns(self, conn, table_name: str) -> Optional[Dict[str, str]]:
+        """{colonne: type PostgreSQL} de la table, None si elle n'existe pas
+
+        Une table absente n'est pas mise en cache : elle peut etre creee par
+        un full replace.
+        """
+        with self._lock:
+            self.stats["lookups"] += 1
+            cached = self._columns.get(table_name)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return dict(cached)
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = to_regclass(%s) AND attnum > 0
+                  AND NOT attisdropped
+                ORDER BY attnum
+                """,
+                (f"{self.schema}.{table_name}",),
+            )
+            rows = cur.fetchall()
+        if not rows:
+            return None
+
+        columns = dict(rows)
+        with self._lock:
+            self._columns[table_name] = columns
+        return dict(columns)
+
+    def add_columns(
+        self, conn, table_name: str, column_types: Dict[str, str]
+    ) -> List[str]:
+        """
+        Ajoute a la table les colonnes de `column_types` qu'elle n'a pas.
+
+        Un seul ALTER TABLE, dans une transaction courte validee ici : la
+        table n'est verrouillee que le temps de modifier le catalogue. Si une
+        requete longue occupe la table, l'ajout est retente.
+
+        Returns:
+            Les colonnes ajoutees
+        """
+        known = self.columns(conn, table_name)
+        if known is None:
+            raise Exception(f"Table {self.schema}.{table_name} introuvable")
+        missing = {c: t for c, t in column_types.items() if c not in known}
+        if not missing:
+            return []
+
+        additions = ", ".join(
+            f'ADD COLUMN IF NOT EXISTS "{c}" {t}' for c, t in missing.items()
+        )
+        for attempt in range(1, self.attempts + 1):
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+                    cur.execute(f"ALTER TABLE {self.schema}.{table_name} {additions}")
+                conn.commit()
+                break
+            except (psycopg2.errors.LockNotAvailable, psycopg2.errors.DeadlockDetected):
+                conn.rollback()
+                if attempt == self.attempts:
+                    raise Exception(
+                        f"Ajout de colonnes a {self.schema}.{table_name} "
+                        f"impossible : verrou non obtenu apres {self.attempts} "
+                        f"tentatives"
+                    )
+                time.sleep(min(2**attempt, 30))
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+
+        # Relu au prochain appel (type reel si un autre process l'a ajoutee)
+        self.forget(table_name)
+        with self._lock:
+            self.stats["columns_added"] += len(missing)
+        return list(missing)
+
+    def forget(self, table_name: Optional[str] = None):
+        """Oublie les colonnes d'une table (ou de toutes)"""
+        with self._lock:
+            if table_name is None:
+                self._columns.clear()
+            else:
+                self._columns.pop(table_name, None)
@@ -0,0 +1,169 @@
+"""
+Profilage CPU et memoire de la sync, table par table
+
+Active par `python src/incremental_sync.py --profile` : chaque table est
+synchronisee sous cProfile, avec un snapshot tracemalloc avant et apres.
+Ecrit dans logs/profiles/<horodatage>/ :
+
+    <table>.prof    stats cProfile (pstats, snakeviz, gprof2dot...)
+    <table>.txt     fonctions les plus couteuses (temps propre, cumule),
+                    detail du code de sync (flatten_dataframe, json.dumps...)
+                    et sites d'allocation memoire
+    summary.txt     top N de chaque table
+
+Le profilage ralentit la sync (surtout tracemalloc) : a utiliser pour
+diagnostiquer un run lent, pas en production. cProfile ne suit que le thread
+qui synchronise la table : les extractions full replace sont donc faites
+sequentiellement dans ce mode.
+
+Usage:
+    python src/incremental_sync.py --profile --table customers
+    python -m pstats logs/profiles/<horodatage>/customers.prof
+"""
+
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Code de sync et encodage JSON : detail des lambdas de flatten_dataframe et
+# de la boucle json.dumps par cellule
+FOCUS_PATTERN = r"incremental_sync\.py|json[/\\]"
+
+# Allocations du profileur lui-meme exclues
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _function_label(key) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name
+    return f"{pstats.func_strip_path(key)[0]}:{line}({name})"
+
+
+class SyncProfiler:
+    """cProfile + tracemalloc par table, fichiers de profil et resume"""
+
+    def __init__(
+        self, output_dir: str = "logs/profiles", top_n: int = 20, frames: int = 10
+    ):
+        """
+        Args:
+            output_dir: Repertoire parent des profils (un sous-repertoire par run)
+            top_n: Nombre de fonctions / sites d'allocation par section
+            frames: Profondeur des tracebacks tracemalloc
+        """
+        self.output_dir = Path(output_dir) / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.top_n = top_n
+        self.frames = frames
+        self.results: List[Dict] = []
+        self._started_tracemalloc = False
+
+    def start(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+
+    @contextmanager
+    def table(self, table_name: str):
+        """Profile le bloc et ecrit <table>.prof / <table>.txt"""
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot()
+            self._write_table(table_name, profile, before, after, elapsed, peak)
+
+    def _write_table(self, table_name, profile, before, after, elapsed, peak):
+        profile.dump_stats(str(self.output_dir / f"{table_name}.prof"))
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(profile, stream=buffer)
+        buffer.write(f"Table {table_name} : {elapsed:.2f}s, ")
+        buffer.write(f"pic memoire trace {peak / 1024 / 1024:.1f} Mo\n\n")
+
+        buffer.write(f"=== Top {self.top_n} : temps propre (tottime) ===\n")
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        buffer.write(f"=== Top {self.top_n} : temps cumule (cumtime) ===\n")
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        buffer.write("=== Code de sync et json (flatten_dataframe, json.dumps) ===\n")
+        stats.sort_stats("tottime").print_stats(FOCUS_PATTERN, self.top_n)
+
+        allocations = after.filter_traces(_SNAPSHOT_FILTERS).compare_to(
+            before.filter_traces(_SNAPSHOT_FILTERS), "lineno"
+        )[: self.top_n]
+        buffer.write(f"=== Top {self.top_n} : sites d'allocation (delta) ===\n")
+        for diff in allocations:
+            buffer.write(f"{diff}\n")
+
+        (self.output_dir / f"{table_name}.txt").write_text(
+            buffer.getvalue(), encoding="utf-8"
+        )
+
+        hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        self.results.append(
+            {
+                "table_name": table_name,
+                "seconds": elapsed,
+                "peak_mb": peak / 1024 / 1024,
+                "hot_functions": [
+                    (_function_label(key), values[2], values[3], values[1])
+                    for key, values in hot[: self.top_n]
+                ],
+                "allocations": [
+                    (str(diff.traceback[0]), diff.size_diff, diff.count_diff)
+                    for diff in allocations
+                ],
+            }
+        )
+
+    def finish(self) -> Path:
+        """Ecrit summary.txt, arrete tracemalloc et retourne son chemin"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        lines = []
+        for result in sorted(self.results, key=lambda r: r["seconds"], reverse=True):
+            lines.append("=" * 100)
+            lines.append(
+                f"{result['table_name']} : {result['seconds']:.2f}s, "
+                f"pic memoire trace {result['peak_mb']:.1f} Mo"
+            )
+            lines.append(
+                f"  {'Fonction':<64}{'tottime':>10}{'cumtime':>10}{'appels':>12}"
+            )
+            for label, tottime, cumtime, calls in result["hot_functions"]:
+                lines.append(
+                    f"  {label[:64]:<64}{tottime:>10.3f}{cumtime:>10.3f}{calls:>12}"
+                )
+            lines.append(f"  {'Site d allocation':<76}{'Delta Mo':>10}{'Blocs':>12}")
+            for site, size_diff, count_diff in result["allocations"]:
+                lines.append(
+                    f"  {site[-76:]:<76}{size_diff / 1024 / 1024:>10.2f}{count_diff:>12}"
+                )
+
+        summary = self.output_dir / "summary.txt"
+        summary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return summary
@@ -0,0 +1,6 @@
+"""Configuration pytest : les modules sont importes comme `src.<module>`"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,143 @@
+"""Tests du decodage des pages API en Arrow (chemins de repli compris)"""
+
+import json
+
+import pyarrow as pa
+
+from src.arrow_decoding import (
+    ArrowPageDecoder,
+    ArrowPages,
+    batch_to_ipc,
+    batches_from_ipc,
+    page_to_record_batch,
+)
+
+
+def body(items, has_more=False, next_cursor=None) -> bytes:
+    return json.dumps(
+        {"items": items, "has_more": has_more, "next_cursor": next_cursor}
+    ).encode()
+
+
+# ============================================================================
+# page_to_record_batch
+# ============================================================================
+
+
+def test_page_to_record_batch_infers_types():
+    batch = page_to_record_batch([{"id": 1, "label": "a"}, {"id": 2, "label": None}])
+    assert batch.schema.field("id").type == pa.int64()
+    assert batch.schema.field("label").type == pa.string()
+    assert batch.to_pylist() == [{"id": 1, "label": "a"}, {"id": 2, "label": None}]
+
+
+def test_page_to_record_batch_mixed_types_column_becomes_text():
+    batch = page_to_record_batch(
+        [{"id": 1, "amount": 10}, {"id": 2, "amount": "12,5"}, {"id": 3}]
+    )
+    # Seule la colonne en conflit passe en texte
+    assert batch.schema.field("id").type == pa.int64()
+    assert batch.schema.field("amount").type == pa.string()
+    assert batch.column("amount").to_pylist() == ["10", "12,5", None]
+
+
+def test_page_to_record_batch_object_conflict_becomes_json():
+    batch = page_to_record_batch([{"ref": {"id": 1}}, {"ref": "inconnu"}])
+    assert batch.column("ref").to_pylist() == ['{"id": 1}', "inconnu"]
+
+
+def test_page_to_record_batch_int64_overflow_becomes_text():
+    batch = page_to_record_batch([{"id": 1, "big": 2**70}, {"id": 2, "big": 3}])
+    assert batch.schema.field("id").type == pa.int64()
+    assert batch.column("big").to_pylist() == [str(2**70), "3"]
+
+
+def test_page_to_record_batch_keeps_keys_of_all_records():
+    batch = page_to_record_batch([{"id": 1}, {"id": 2, "label": "b"}])
+    assert batch.schema.names == ["id", "label"]
+    assert batch.column("label").to_pylist() == [None, "b"]
+
+
+# ============================================================================
+# ArrowPageDecoder
+# ============================================================================
+
+
+def test_decoder_reads_page_without_fallback():
+    decoder = ArrowPageDecoder()
+    page = decoder.decode(
+        body([{"id": 1, "ref": {"id": 5}}], has_more=True, next_cursor="abc")
+    )
+    assert page["has_more"] is True
+    assert page["next_cursor"] == "abc"
+    assert page["items"].to_pylist() == [{"id": 1, "ref": {"id": 5}}]
+    assert decoder.fallbacks == 0
+
+
+def test_decoder_keeps_iso_dates_as_strings():
+    decoder = ArrowPageDecoder()
+    items = decoder.decode(body([{"id": 1, "date": "2026-01-05T10:00:00Z"}]))["items"]
+    assert items.schema.field("date").type == pa.string()
+    assert items.column("date").to_pylist() == ["2026-01-05T10:00:00Z"]
+
+
+def test_decoder_reuses_schema_of_previous_page():
+    decoder = ArrowPageDecoder()
+    decoder.decode(body([{"id": 1, "date": "2026-01-05"}], has_more=True))
+    # Page suivante : meme type de colonnes, avec un champ nouveau
+    items = decoder.decode(body([{"id": 2, "date": "2026-01-06", "new": True}]))[
+        "items"
+    ]
+    assert items.schema.field("date").type == pa.string()
+    assert items.to_pylist() == [{"id": 2, "date": "2026-01-06", "new": True}]
+    assert decoder.fallbacks == 0
+
+
+def test_decoder_falls_back_on_mixed_types():
+    decoder = ArrowPageDecoder()
+    items = decoder.decode(body([{"id": 1, "v": 10}, {"id": 2, "v": "x"}]))["items"]
+    assert decoder.fallbacks == 1
+    assert items.column("v").to_pylist() == ["10", "x"]
+
+
+def test_decoder_falls_back_on_int64_overflow():
+    decoder = ArrowPageDecoder()
+    items = decoder.decode(body([{"id": 1, "ref": {"big": 2**64}}]))["items"]
+    assert decoder.fallbacks == 1
+    # Valeur exacte (pyarrow.json l'aurait lue en double)
+    assert items.column("ref").to_pylist() == [json.dumps({"big": 2**64})]
+
+
+def test_decoder_handles_empty_page_and_list_body():
+    decoder = ArrowPageDecoder()
+    empty = decoder.decode(body([]))
+    assert empty["items"].num_rows == 0
+    assert empty["has_more"] is False
+
+    listed = decoder.decode(json.dumps([{"id": 1}, {"id": 2}]).encode())
+    assert listed["has_more"] is False
+    assert listed["items"].column("id").to_pylist() == [1, 2]
+
+
+def test_decoder_returns_other_bodies_unchanged():
+    decoder = ArrowPageDecoder()
+    assert decoder.decode(b'{"status": "ok"}') == {"status": "ok"}
+
+
+# ============================================================================
+# Pages et staging IPC
+# ============================================================================
+
+
+def test_pages_unify_conflicting_columns_across_pages():
+    pages = ArrowPages()
+    pages.append(page_to_record_batch([{"id": 1, "v": 10}]))
+    pages.append(page_to_record_batch([{"id": 2, "v": "x"}]))
+    table = pages.to_arrow()
+    assert table.column("id").to_pylist() == [1, 2]
+    assert table.column("v").to_pylist() == ["10", "x"]
+
+
+def test_ipc_round_trip():
+    batch = page_to_record_batch([{"id": 1, "ref": {"id": 5}, "tags": ["a"]}])
+    assert batches_from_ipc(batch_to_ipc(batch)) == [batch]
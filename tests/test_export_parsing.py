@@ -0,0 +1,91 @@
+"""Tests du parsing des exports FEC (valeurs non conformes au schema)"""
+
+import datetime
+from decimal import Decimal
+
+import pyarrow as pa
+
+from src.export_parsing import AMOUNT_TYPE, FEC_COLUMNS, parse_export_file
+
+# Ligne FEC valide, completee ou modifiee par chaque test
+BASE_ROW = {
+    "JournalCode": "VE",
+    "JournalLib": "Ventes",
+    "EcritureNum": "1",
+    "EcritureDate": "20260105",
+    "CompteNum": "411000",
+    "CompteLib": "Clients",
+    "PieceRef": "F1",
+    "PieceDate": "20260105",
+    "EcritureLib": "Facture",
+    "Debit": "100,00",
+    "Credit": "0,00",
+    "ValidDate": "20260105",
+}
+
+
+def write_fec(tmp_path, rows, delimiter="|", encoding="utf-8"):
+    lines = [delimiter.join(FEC_COLUMNS)]
+    for row in rows:
+        values = {name: "" for name in FEC_COLUMNS}
+        values.update(BASE_ROW)
+        values.update(row)
+        lines.append(delimiter.join(values[name] for name in FEC_COLUMNS))
+    path = tmp_path / "fec.txt"
+    path.write_bytes(("\n".join(lines) + "\n").encode(encoding))
+    return str(path)
+
+
+def test_conform_file_is_typed(tmp_path):
+    table = parse_export_file(write_fec(tmp_path, [{}, {"Debit": "12,5"}]))
+    assert table.schema.field("Debit").type == AMOUNT_TYPE
+    assert table.schema.field("EcritureDate").type == pa.date32()
+    assert table.column("Debit").to_pylist() == [Decimal("100.00"), Decimal("12.50")]
+    assert table.column("EcritureDate")[0].as_py() == datetime.date(2026, 1, 5)
+
+
+def test_thousands_separators_are_normalised(tmp_path, capsys):
+    path = write_fec(tmp_path, [{}, {"Debit": "1 234,56"}, {"Credit": "2 000,5"}])
+    table = parse_export_file(path)
+    assert table.schema.field("Debit").type == AMOUNT_TYPE
+    assert table.column("Debit").to_pylist()[1] == Decimal("1234.56")
+    assert table.column("Credit").to_pylist()[2] == Decimal("2000.50")
+    assert "normalisees" in capsys.readouterr().out
+
+
+def test_padded_dates_are_normalised(tmp_path, capsys):
+    table = parse_export_file(write_fec(tmp_path, [{}, {"PieceDate": " 20260106 "}]))
+    assert "1 valeur(s) non conforme(s)" in capsys.readouterr().out
+    assert table.schema.field("PieceDate").type == pa.date32()
+    assert table.column("PieceDate").to_pylist() == [
+        datetime.date(2026, 1, 5),
+        datetime.date(2026, 1, 6),
+    ]
+
+
+def test_unrecoverable_amount_stays_text(tmp_path, capsys):
+    table = parse_export_file(write_fec(tmp_path, [{}, {"Debit": "abc"}]))
+    assert table.schema.field("Debit").type == pa.string()
+    assert table.column("Debit").to_pylist() == ["100,00", "abc"]
+    # Les autres colonnes gardent leur type
+    assert table.schema.field("Credit").type == AMOUNT_TYPE
+    assert "colonne conservee en texte" in capsys.readouterr().out
+
+
+def test_unrecoverable_date_stays_text(tmp_path):
+    table = parse_export_file(write_fec(tmp_path, [{}, {"PieceDate": "bientot"}]))
+    assert table.schema.field("PieceDate").type == pa.string()
+    assert table.column("PieceDate").to_pylist() == ["20260105", "bientot"]
+    assert table.schema.field("EcritureDate").type == pa.date32()
+
+
+def test_latin1_semicolon_file_is_recovered(tmp_path):
+    path = write_fec(
+        tmp_path,
+        [{"EcritureLib": "Facture n° 12 été", "Debit": "1 000,00"}],
+        delimiter=";",
+        encoding="latin-1",
+    )
+    table = parse_export_file(path)
+    assert table.column("EcritureLib")[0].as_py() == "Facture n° 12 été"
+    assert table.column("Debit")[0].as_py() == Decimal("1000.00")
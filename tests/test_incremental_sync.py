@@ -0,0 +1,154 @@
+"""Tests de la logique de sync sans base de donnees"""
+
+import numpy as np
+import pandas as pd
+
+from src.incremental_sync import (
+    HASH_COLUMN,
+    compact_changelog,
+    new_column_type,
+    row_hashes,
+)
+
+
+def change(record_id, operation, timestamp):
+    return {"id": record_id, "operation": operation, "timestamp": timestamp}
+
+
+def test_compact_changelog_keeps_last_operation_per_id():
+    upserts, deletes = compact_changelog(
+        [
+            change(1, "insert", "2026-01-01T10:00:00Z"),
+            change(1, "update", "2026-01-01T11:00:00Z"),
+            change(2, "update", "2026-01-01T10:00:00Z"),
+            change(2, "delete", "2026-01-01T12:00:00Z"),
+        ]
+    )
+    assert upserts == [1]
+    assert deletes == [2]
+
+
+def test_compact_changelog_orders_by_timestamp_not_api_order():
+    upserts, deletes = compact_changelog(
+        [
+            change(1, "delete", "2026-01-01T12:00:00Z"),
+            change(1, "update", "2026-01-01T10:00:00Z"),
+            change(2, "insert", "2026-01-01T12:00:00+00:00"),
+            change(2, "delete", "2026-01-01T11:00:00+00:00"),
+        ]
+    )
+    assert upserts == [2]
+    assert deletes == [1]
+
+
+def test_compact_changelog_keeps_api_order_on_equal_timestamps():
+    upserts, deletes = compact_changelog(
+        [
+            change(1, "update", "2026-01-01T10:00:00Z"),
+            change(1, "delete", "2026-01-01T10:00:00Z"),
+            change(2, "delete", "2026-01-01T10:00:00Z"),
+            change(2, "insert", "2026-01-01T10:00:00Z"),
+        ]
+    )
+    assert upserts == [2]
+    assert deletes == [1]
+
+
+def test_compact_changelog_accepts_processed_at_and_missing_timestamps():
+    upserts, deletes = compact_changelog(
+        [
+            {"id": 1, "operation": "delete", "processed_at": "2026-01-02T00:00:00"},
+            {"id": 1, "operation": "update"},
+            {"id": 2, "operation": "create", "timestamp": "pas une date"},
+        ]
+    )
+    assert upserts == [2]
+    assert deletes == [1]
+
+
+def test_compact_changelog_ignores_unknown_operations():
+    upserts, deletes = compact_changelog([change(1, "archive", "2026-01-01T10:00:00Z")])
+    assert upserts == []
+    assert deletes == []
+
+
+# ============================================================================
+# Empreinte des lignes
+# ============================================================================
+
+
+def test_row_hashes_ignore_column_order_and_hash_column():
+    df = pd.DataFrame({"id": [1, 2], "label": ["a", "b"]})
+    reordered = df[["label", "id"]].assign(**{HASH_COLUMN: ["x", "y"]})
+    assert (
+        row_hashes(df, ["id", "label"]).tolist()
+        == row_hashes(reordered, ["label", "id", HASH_COLUMN]).tolist()
+    )
+
+
+def test_row_hashes_integers_stored_as_float_are_equal():
+    as_int = pd.DataFrame({"id": [1, 2], "qty": [3, 4]})
+    as_float = pd.DataFrame({"id": [1, 2], "qty": [3.0, 4.0]})
+    assert (
+        row_hashes(as_int, ["id", "qty"]) == row_hashes(as_float, ["id", "qty"])
+    ).all()
+
+
+def test_row_hashes_missing_column_counts_as_null():
+    df = pd.DataFrame({"id": [1], "label": [None]})
+    without = pd.DataFrame({"id": [1]})
+    assert (
+        row_hashes(df, ["id", "label"]).tolist()
+        == row_hashes(without, ["id", "label"]).tolist()
+    )
+    assert row_hashes(df, ["id", "label"]).tolist() != row_hashes(df, ["id"]).tolist()
+
+
+def test_row_hashes_objects_ignore_null_keys_and_key_order():
+    df = pd.DataFrame({"id": [1], "ref": [{"id": 5, "url": None, "kind": "a"}]})
+    other = pd.DataFrame({"id": [1], "ref": [{"kind": "a", "id": 5.0}]})
+    assert (
+        row_hashes(df, ["id", "ref"]).tolist()
+        == row_hashes(other, ["id", "ref"]).tolist()
+    )
+
+
+def test_row_hashes_detect_changes_and_nulls():
+    df = pd.DataFrame(
+        {"id": [1, 2, 3], "amount": [1.5, np.nan, 0.0], "label": ["a", "a", ""]}
+    )
+    hashes = row_hashes(df, list(df.columns))
+    assert hashes.index.equals(df.index)
+    assert hashes.nunique() == 3
+    changed = df.assign(amount=[1.25, np.nan, 0.0])
+    assert (row_hashes(changed, list(df.columns)) != hashes).tolist() == [
+        True,
+        False,
+        False,
+    ]
+
+
+# ============================================================================
+# Type des colonnes ajoutees en ligne
+# ============================================================================
+
+
+def test_new_column_type_skips_null_and_object_columns():
+    assert new_column_type(pd.Series([None, None], dtype=object)) is None
+    assert new_column_type(pd.Series([np.nan, np.nan])) is None
+    assert new_column_type(pd.Series([{"id": 1}, None], dtype=object)) is None
+    assert new_column_type(pd.Series([None, [1, 2]], dtype=object)) is None
+
+
+def test_new_column_type_keeps_confident_types():
+    assert new_column_type(pd.Series([1, 2])) == "BIGINT"
+    assert new_column_type(pd.Series([True, False])) == "BOOLEAN"
+    assert new_column_type(pd.Series([1.5, np.nan])) == "DOUBLE PRECISION"
+    assert new_column_type(pd.Series(pd.to_datetime(["2026-01-05"]))) == "TIMESTAMP"
+
+
+def test_new_column_type_defaults_to_text():
+    # Entier avec des nulls (float64) : le type reel est incertain
+    assert new_column_type(pd.Series([3.0, np.nan])) == "TEXT"
+    assert new_column_type(pd.Series(["a", None], dtype=object)) == "TEXT"
+    assert new_column_type(pd.Series([1, "a"], dtype=object)) == "TEXT"
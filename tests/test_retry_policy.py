@@ -0,0 +1,195 @@
+"""Tests de la politique de retry et du circuit breaker"""
+
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from src.mock_pennylane_server import FaultInjector, MockDataset, MockPennylaneServer
+from src.pennylane_api_client import PennylaneClient
+from src.rate_limiter import TokenBucketRateLimiter
+from src.retry_policy import (
+    DEFAULT_STATUS_RULES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+
+def connection_refused() -> requests.exceptions.ConnectionError:
+    """Erreur requests d'une connexion impossible (requete non envoyee)"""
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(None, "/", reason))
+
+
+# ============================================================================
+# RetryPolicy
+# ============================================================================
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_post_is_not_retried_on_5xx(status):
+    policy = RetryPolicy()
+    assert policy.should_retry_status(status, 1, "GET")
+    assert not policy.should_retry_status(status, 1, "POST")
+
+
+def test_post_is_retried_on_429():
+    policy = RetryPolicy()
+    assert policy.should_retry_status(429, 1, "POST")
+    assert not policy.should_retry_status(429, 8, "POST")
+
+
+def test_post_is_not_retried_after_read_timeout():
+    policy = RetryPolicy()
+    timeout = requests.exceptions.ReadTimeout()
+    assert policy.should_retry_exception(timeout, 1, "GET")
+    assert not policy.should_retry_exception(timeout, 1, "POST")
+
+
+def test_post_is_retried_when_not_sent():
+    policy = RetryPolicy()
+    assert policy.should_retry_exception(
+        requests.exceptions.ConnectTimeout(), 1, "POST"
+    )
+    assert policy.should_retry_exception(connection_refused(), 1, "POST")
+    assert not policy.should_retry_exception(
+        requests.exceptions.ConnectionError("Connection reset by peer"), 1, "POST"
+    )
+
+
+def test_retry_after_is_capped():
+    policy = RetryPolicy(max_delay=5)
+    delay = policy.compute_delay(1, 429, "120")
+    assert 5 <= delay <= 5.5
+
+
+# ============================================================================
+# Requetes contre le serveur simule
+# ============================================================================
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def failing_server():
+    """Serveur simule repondant 503 a toutes les requetes"""
+    server = MockPennylaneServer(
+        port=free_port(),
+        dataset=MockDataset(scale=0.01),
+        faults=FaultInjector(error_rate=1.0),
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(failing_server, monkeypatch):
+    monkeypatch.setenv("PENNYLANE_API_TOKEN", "test")
+    monkeypatch.setenv("PENNYLANE_API_BASE_URL", failing_server.base_url)
+    client = PennylaneClient(
+        rate_limiter=TokenBucketRateLimiter(rate=1000),
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01),
+        circuit_breaker=CircuitBreaker(failure_threshold=100),
+    )
+    yield client
+    client.session.close()
+
+
+def test_export_post_is_sent_once_on_503(client, failing_server):
+    response = client._send(
+        "POST", f"{failing_server.base_url}/exports/fec", timeout=5, json={}
+    )
+    assert response.status_code == 503
+    assert failing_server.get_stats()["requests"] == 1
+    assert client.retry_count == 0
+
+
+def test_get_is_retried_on_503(client, failing_server):
+    response = client._send("GET", f"{failing_server.base_url}/customers", timeout=5)
+    attempts = DEFAULT_STATUS_RULES[503]["max_attempts"]
+    assert response.status_code == 503
+    assert failing_server.get_stats()["requests"] == attempts
+    assert client.retry_count == attempts - 1
+
+
+# ============================================================================
+# CircuitBreaker
+# ============================================================================
+
+
+def half_open_breaker(reset_timeout: float) -> CircuitBreaker:
+    """Circuit dont la requete d'essai (half-open) est en cours"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    time.sleep(reset_timeout + 0.01)
+    breaker.before_request()
+    assert breaker.state == "half-open"
+    return breaker
+
+
+def start_waiters(breaker: CircuitBreaker, count: int = 3):
+    outcomes = []
+
+    def wait():
+        try:
+            breaker.before_request()
+            outcomes.append("sent")
+        except CircuitOpenError:
+            outcomes.append("open")
+
+    threads = [threading.Thread(target=wait) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_open_circuit_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_callers_proceed_after_trial_success():
+    breaker = half_open_breaker(reset_timeout=0.2)
+    threads, outcomes = start_waiters(breaker)
+    time.sleep(0.05)
+    assert outcomes == []
+    breaker.record_success()
+    for thread in threads:
+        thread.join(timeout=2)
+    assert outcomes == ["sent"] * 3
+    assert breaker.state == "closed"
+
+
+def test_half_open_callers_fail_after_trial_failure():
+    breaker = half_open_breaker(reset_timeout=0.2)
+    threads, outcomes = start_waiters(breaker)
+    time.sleep(0.05)
+    breaker.record_failure()
+    for thread in threads:
+        thread.join(timeout=2)
+    assert outcomes == ["open"] * 3
+    assert breaker.state == "open"
+
+
+def test_stale_trial_is_replaced_by_a_single_caller():
+    breaker = half_open_breaker(reset_timeout=0.2)
+    threads, outcomes = start_waiters(breaker)
+    # L'essai ne rend jamais de resultat : un seul appelant le remplace
+    time.sleep(0.3)
+    assert outcomes == ["sent"]
+    breaker.record_success()
+    for thread in threads:
+        thread.join(timeout=2)
+    assert outcomes == ["sent"] * 3